@@ -10,7 +10,8 @@ class BytesMmap(Additive, ListlikeGMmap, PhysicallyIndexedGMmap, metaclass=ABCMe
 
     @classmethod
     def _decode(cls, bytestring: bytes):
-        return bytestring
+        # Selections may gather into a bytearray, which would let the caller alter a cached element
+        return bytestring if isinstance(bytestring, bytes) else bytes(bytestring)
 
     @classmethod
     def _encode(cls, element) -> bytes:
@@ -22,9 +23,8 @@ class BytesMmap(Additive, ListlikeGMmap, PhysicallyIndexedGMmap, metaclass=ABCMe
 
     def iterbytes(self):
         """ :return A generator for every byte in every element in the sequence, left to right. """
-        for bs in self:
-            for b in bs:
-                yield b
+        for chunk in self.iterchunks():
+            yield from chunk
 
     def bytecount(self):
         """ :return The total number of bytes in this sequence. """
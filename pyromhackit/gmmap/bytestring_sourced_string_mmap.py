@@ -1,19 +1,41 @@
+import array
 import mmap
 from typing import Optional
 
 from pyromhackit.gmmap.sourced_gmmap import SourcedGMmap
-from pyromhackit.gmmap.string_mmap import StringMmap
+from pyromhackit.gmmap.string_mmap import StringMmap, char_width, offsets_from_lengths
 
 
 class BytestringSourcedStringMmap(SourcedGMmap, StringMmap):
     """ A StringMmap where the source is extracted from a bytestring iterator and a codec mapping those bytestrings to
-    strings. """
+    strings. Every code point is stored in as few bytes as the greatest code point the codec maps to fits in. Unless
+    the codec maps every bytestring to a single code point, the offsets of the elements are recorded while the source is
+    transliterated. """
 
     def __init__(self, bytestring_iterator, codec):
-        source = (codec[atom] for atom in bytestring_iterator)
-        self._content, self._length = self._source2mmap(source)
+        if hasattr(codec, 'values'):
+            self._char_width = char_width(max((ord(c) for string in codec.values() for c in string), default=0))
+            variable_length = any(len(string) != 1 for string in codec.values())
+        else:
+            variable_length = True
+        lengths = array.array('Q')
+        if variable_length:
+            source = (self._recorded(codec[atom], lengths) for atom in bytestring_iterator)
+        else:
+            source = (codec[atom] for atom in bytestring_iterator)
+        # Each atom is usually transliterated into a single character
+        size_hint = self._char_width * len(bytestring_iterator) if hasattr(bytestring_iterator, '__len__') else None
+        self._content, self._length = self._source2mmap(source, size_hint)
+        if variable_length:
+            self._offsets = offsets_from_lengths(lengths)
         self._path = None
 
+    @staticmethod
+    def _recorded(string: str, lengths: array.array) -> str:
+        """ :return @string, after appending its length to @lengths. """
+        lengths.append(len(string))
+        return string
+
     @property
     def _content(self) -> mmap.mmap:
         return self._m_content
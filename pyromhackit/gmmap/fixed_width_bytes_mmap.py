@@ -15,11 +15,19 @@ class FixedWidthBytesMmap(SourcedGMmap, BytesMmap):
         self._content, self._length = self._source2mmap(source)
         if self._length is None:
             self._length = len(self._content) // width
-        if isinstance(source, io.TextIOWrapper):
+        elif isinstance(source, bytes):  # Counted as single bytes, whereas the last element may be shorter than width
+            self._length = -(-len(self._content) // width)
+        if isinstance(source, io.IOBase):
             self._path = source.name
         else:
             self._path = None
 
+    @staticmethod
+    def _file_access():
+        """ :return The memory protection of memory-mapped files. The elements are never written to, so the file is
+        mapped read-only, which lets the mmap share its pages with the page cache. """
+        return mmap.ACCESS_READ
+
     @property
     def _path(self) -> Optional[str]:
         return self._m_path
@@ -46,8 +54,8 @@ class FixedWidthBytesMmap(SourcedGMmap, BytesMmap):
 
     def _args2source(*args):
         width, source = args
-        is_file = isinstance(source, io.TextIOWrapper)  # Quite tight but the price was right
-        if not is_file:
+        is_file = isinstance(source, io.IOBase)
+        if not is_file and not isinstance(source, bytes):
             try:
                 element = next(iter(source))
                 is_bytes_iterable = isinstance(element, bytes)
@@ -62,7 +62,7 @@ class GMmap(metaclass=ABCMeta):
         """ :return The bytestring obtained when accessing the @content mmap using @physicallocation. """
         raise NotImplementedError
 
-    def __getitem__(self, location):  # Final
+    def __getitem__(self, location):
         """ :return A sub-sequence that @location refers to. """
         bytestringlocation = self._logical2physical(location)
         bytestringrepr = self._physical2bytes(bytestringlocation, self._content)
@@ -11,6 +11,14 @@ class ListlikeGMmap(IndexedGMmap, metaclass=ABCMeta):
     * negative integers are interpreted as counting from the end of the list.
     """
 
+    def __iter__(self):
+        """ :return A generator for every element in the sequence, left to right. Unlike the fallback iteration
+        protocol, which calls __getitem__ with 0, 1, ... until it raises an IndexError, the bounds are known in advance,
+        so each element is located without being checked. """
+        content = self._content
+        for location in range(len(self)):
+            yield self._decode(self._physical2bytes(self._logicalint2physical_unsafe(location), content))
+
     def _is_within_bounds(self, location: int):
         """ :return True iff accessing this GMmap by index @location yields an element in the sequence. """
         return -len(self) <= location < len(self)
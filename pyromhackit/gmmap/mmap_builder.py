@@ -0,0 +1,38 @@
+import mmap
+import tempfile
+from typing import Optional
+
+
+class MmapBuilder(object):
+    """ Builds a mmap from bytestrings appended one at a time, for content whose size is not known in advance. The
+    bytestrings are written through a small buffer to an unlinked temporary file, which grows as it is written to and is
+    memory-mapped once complete. Thus growing copies nothing and the content is never held in memory as a whole, so
+    building the mmap takes little memory beyond the final content, which lives in the page cache. """
+
+    def __init__(self, size_hint: Optional[int] = None):
+        """ @size_hint is the expected final size in bytes, if known. The file is extended to that size up front, which
+        lets the file system allocate it in one go. """
+        self._file = tempfile.TemporaryFile()
+        self._size = 0
+        if size_hint:
+            self._file.truncate(size_hint)
+
+    def append(self, bytestring: bytes):
+        self._file.write(bytestring)
+        self._size += len(bytestring)
+
+    def __len__(self):
+        return self._size
+
+    def build(self, access=mmap.ACCESS_WRITE) -> mmap.mmap:
+        """ :return A mmap of the bytestrings appended so far, with the memory protection @access. The mmap keeps the
+        content alive on its own, so the builder cannot be used afterwards.
+        :raise ValueError if nothing was appended, since mmaps cannot have zero length. """
+        if self._size == 0:
+            self._file.close()
+            raise ValueError("Cannot build an empty mmap")
+        self._file.truncate(self._size)  # Cuts off whatever the size hint allocated in excess
+        self._file.flush()
+        m = mmap.mmap(self._file.fileno(), self._size, access=access)
+        self._file.close()
+        return m
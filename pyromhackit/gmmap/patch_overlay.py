@@ -0,0 +1,79 @@
+from typing import Iterator, List, Tuple
+
+from sortedcontainers import SortedDict
+
+
+class PatchOverlay(object):
+    """ The bytes written over a read-only buffer, kept apart from it as extents (offset, bytestring). The extents are
+    kept in a SortedDict keyed by their offsets and are maximal: writes that overlap or touch an extent are merged into
+    it. Thus the extents are exactly the records of a patch turning the buffer into its patched version, and reading
+    the patched version of a range of k extents costs O(log(n) + k) on top of copying the range. """
+
+    def __init__(self):
+        self._extents = SortedDict()  # Maps the offset of each extent to its bytestring
+
+    def write(self, offset: int, bytestring: bytes):
+        """ Overwrites the len(@bytestring) bytes from offset @offset with @bytestring. O(log(n) + k) for the k extents
+        overlapping or touching the written range, plus the cost of copying them. """
+        if not bytestring:
+            return
+        a, b = offset, offset + len(bytestring)
+        merged = list(self.overlapping(a - 1, b + 1))  # The extents that overlap or touch [a, b)
+        if not merged:
+            self._extents[a] = bytes(bytestring)
+            return
+        start = min(a, merged[0][0])
+        stop = max(b, merged[-1][0] + len(merged[-1][1]))
+        content = bytearray(stop - start)
+        for extent_offset, data in merged:
+            content[extent_offset - start:extent_offset - start + len(data)] = data
+            del self._extents[extent_offset]
+        content[a - start:b - start] = bytestring
+        self._extents[start] = bytes(content)
+
+    def overlapping(self, from_index: int, to_index: int) -> Iterator[Tuple[int, bytes]]:
+        """ :return An iterator over the extents (offset, bytestring) overlapping [@from_index, @to_index), whole and in
+        ascending order. O(log(n) + k) for k extents. """
+        i = self._extents.bisect_right(from_index) - 1
+        if i >= 0:
+            start, data = self._extents.peekitem(i)
+            if start + len(data) > from_index:
+                yield start, data
+        for start in self._extents.irange(from_index, to_index, inclusive=(False, False)):
+            yield start, self._extents[start]
+
+    def overlaps(self, from_index: int, to_index: int) -> bool:
+        """ :return True iff any byte in [@from_index, @to_index) was written to. O(log(n)). """
+        return next(self.overlapping(from_index, to_index), None) is not None
+
+    def patch_into(self, target: bytearray, offset: int):
+        """ Overwrites @target, a copy of the len(@target) bytes of the buffer from offset @offset, with the bytes
+        written over them. """
+        stop = offset + len(target)
+        for start, data in self.overlapping(offset, stop):
+            a, b = max(start, offset), min(start + len(data), stop)
+            target[a - offset:b - offset] = data[a - start:b - start]
+
+    def patched(self, buffer, from_index: int, to_index: int) -> bytes:
+        """ :return The bytes [@from_index, @to_index) of the buffer @buffer with the bytes written over them. """
+        if not self.overlaps(from_index, to_index):
+            return buffer[from_index:to_index]
+        target = bytearray(buffer[from_index:to_index])
+        self.patch_into(target, from_index)
+        return bytes(target)
+
+    def extents(self) -> List[Tuple[int, bytes]]:
+        """ :return The list of the extents (offset, bytestring), in ascending order. """
+        return list(self._extents.items())
+
+    def clear(self):
+        self._extents.clear()
+
+    def __iter__(self):
+        return iter(self.extents())
+
+    def __len__(self):
+        return len(self._extents)
+
+    def __repr__(self):
+        return "{}({})".format(self.__class__.__name__, self.extents())
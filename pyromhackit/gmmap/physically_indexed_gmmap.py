@@ -1,18 +1,87 @@
+import itertools
 import mmap
 from abc import ABCMeta
-from typing import Union
+from typing import Iterator, Tuple, Union
 
 from pyromhackit.gmmap.gmmap import GMmap
-from pyromhackit.gslice.selection import Selection
+from pyromhackit.gslice.igslice import IGSlice
+
+DEFAULT_CHUNK_SIZE = 2 ** 16
 
 
 class PhysicallyIndexedGMmap(GMmap, metaclass=ABCMeta):
-    """ GMmap where each physical location that a logical location translates into is either a slice or a Selection. """
+    """ GMmap where each physical location that a logical location translates into is either a slice or an IGSlice,
+    such as a Selection. """
 
-    def _physical2bytes(self, physicallocation: Union[slice, Selection], content: mmap.mmap) -> bytes:
-        """ :return The bytestring obtained when accessing the @content mmap using @physicallocation. """
+    def _physical2bytes(self, physicallocation: Union[slice, IGSlice], content: mmap.mmap) -> bytes:
+        """ :return The bytestring obtained when accessing the @content mmap using @physicallocation, which may be a
+        bytearray if an IGSlice gathers it into one. Either way, each byte is copied out of the mmap exactly once. """
         if isinstance(physicallocation, slice):
             return content[physicallocation]
-        elif isinstance(physicallocation, Selection):
+        elif isinstance(physicallocation, IGSlice):
             return physicallocation.select(content)
         raise TypeError
+
+    def _physical_runs(self) -> Iterator[Tuple[int, int]]:
+        """ :return An iterator over the pairs (a, b) of the maximal ranges [a, b) of the mmap that encode the sequence,
+        in ascending order. """
+        if len(self) == 0:
+            return iter(())
+        physicallocation = self._logical2physical(slice(None))
+        if isinstance(physicallocation, slice):
+            start, stop, _ = physicallocation.indices(len(self._content))
+            return iter([(start, stop)] if start < stop else [])
+        return physicallocation.pairs()
+
+    def iterchunks(self, size: int = DEFAULT_CHUNK_SIZE) -> Iterator[memoryview]:
+        """ :return A generator for read-only memoryviews of the bytestring representation of the sequence, left to
+        right, in chunks of at most @size bytes. A chunk never spans two runs of the mmap, so a sequence stored in k runs
+        is walked in O(k + n/@size) steps and without copying any byte. The chunks are only valid while the mmap is.
+        :raise ValueError if @size is not positive. """
+        if size <= 0:
+            raise ValueError("Chunk size must be positive: {}".format(size))
+        view = memoryview(self._content).toreadonly()
+        for a, b in self._physical_runs():
+            for start in range(a, b, size):
+                yield self._chunk(view, start, min(start + size, b))
+
+    def buffer(self) -> memoryview:
+        """ :return A read-only memoryview of the bytestring representation of the sequence, which re, numpy.frombuffer
+        and the like can scan without copying it. If the sequence is stored in a single run of the mmap, the view is of
+        the mmap itself; otherwise it is of the runs gathered into one buffer. The view is only valid while the mmap is.
+        """
+        runs = list(itertools.islice(self._physical_runs(), 2))
+        if len(runs) > 1:
+            return self._gathered_buffer()
+        a, b = runs[0] if runs else (0, 0)
+        return self._chunk(memoryview(self._content).toreadonly(), a, b)
+
+    def find(self, sub) -> int:
+        """ :return The lowest index at which the bytestring or byte value @sub occurs in the bytestring representation of
+        the sequence, or -1 if it does not, like bytes.find. If the sequence is stored in a single run of the mmap, the
+        mmap is searched in place; otherwise the gathered buffer is. """
+        if isinstance(sub, int):
+            sub = bytes([sub])  # mmap.find only takes bytes-like objects
+        runs = list(itertools.islice(self._physical_runs(), 2))
+        if len(runs) > 1:
+            return self.buffer().obj.find(sub)
+        a, b = runs[0] if runs else (0, 0)
+        chunk = self._chunk(memoryview(self._content), a, b)
+        if chunk.obj is not self._content:  # The chunk is a copy, e.g. with written bytes merged in
+            return chunk.obj.find(sub)
+        index = self._content.find(sub, a, b)
+        return index - a if index >= 0 else -1
+
+    def _chunk(self, view: memoryview, from_index: int, to_index: int) -> memoryview:
+        """ :return A read-only memoryview of the bytes [@from_index, @to_index) of the mmap, of which @view is a
+        read-only memoryview. """
+        return view[from_index:to_index]
+
+    def _gathered_buffer(self) -> memoryview:
+        """ :return A read-only memoryview of the bytestring representation of a sequence stored in several runs. """
+        return memoryview(self._physical2bytes(self._logical2physical(slice(None)), self._content))
+
+    def __buffer__(self, flags: int) -> memoryview:
+        """ Exports buffer() through the buffer protocol of PEP 688, so that on Python 3.12 and later the sequence can
+        be passed wherever a bytes-like object is expected. """
+        return self.buffer()
@@ -1,20 +1,42 @@
 from pyromhackit.gmmap.bytestring_sourced_string_mmap import BytestringSourcedStringMmap
 from pyromhackit.gmmap.selective_gmmap import SelectiveGMmap
-from pyromhackit.gslice.selection import Selection
+from pyromhackit.gslice.edges import EDGE_DTYPE, merge_edges
+from pyromhackit.gslice.factory import make_selection, selection_from_edges
+from pyromhackit.gslice.imutablegslice import IMutableGSlice
 
 
 class SelectiveBytestringSourcedStringMmap(SelectiveGMmap, BytestringSourcedStringMmap):
 
     def __init__(self, bytestring_iterator, codec):
         super(SelectiveBytestringSourcedStringMmap, self).__init__(bytestring_iterator, codec)
-        self._selection = Selection(universe=slice(0, self._length))
+        self._selection = make_selection(universe=slice(0, self._length))
 
     @property
-    def selection(self) -> Selection:
+    def selection(self) -> IMutableGSlice:
         return self._selection
 
+    def visible_chars(self, vindex: int) -> slice:
+        """ :return The slice of the code points of the visible string that the @vindex'th visible element consists of.
+        O(k) for the k visible intervals before it, whose lengths in code points are read off the offsets. """
+        pindex = self.selection.virtual2physical(vindex)
+        if self._offsets is None:
+            return slice(vindex % len(self), vindex % len(self) + 1)
+        runs = self.selection.subslice_view(None, pindex).pairs()
+        start = sum(int(self._offsets[b]) - int(self._offsets[a]) for a, b in runs)
+        return slice(start, start + int(self._offsets[pindex + 1]) - int(self._offsets[pindex]))
+
+    def _decoded_position(self, position: int) -> int:
+        return position // self._char_width
+
     def _nonvirtualint2physical(self, location: int) -> slice:
-        return slice(4 * location, 4 * (location + 1))
+        if self._offsets is not None:
+            return self._element_bytes(location, location + 1)
+        return slice(self._char_width * location, self._char_width * (location + 1))
 
-    def _nonvirtualselection2physical(self, location: Selection) -> Selection:
-        return location * 4
+    def _nonvirtualselection2physical(self, location: IMutableGSlice) -> IMutableGSlice:
+        if self._offsets is None:
+            return location * self._char_width
+        # Maps the edges of the revealed elements to those of their bytes, dropping the empty elements
+        edges = self._offsets[location.to_array().ravel()].astype(EDGE_DTYPE) * self._char_width
+        universe = slice(0, self._char_width * int(self._offsets[-1]))
+        return selection_from_edges(universe, merge_edges(edges[0::2], edges[1::2]))
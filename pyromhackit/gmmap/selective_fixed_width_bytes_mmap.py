@@ -1,19 +1,22 @@
 from pyromhackit.gmmap.fixed_width_bytes_mmap import FixedWidthBytesMmap
 from pyromhackit.gmmap.selective_gmmap import SelectiveGMmap
-from pyromhackit.gslice.selection import Selection
+from pyromhackit.gslice.factory import make_selection
+from pyromhackit.gslice.imutablegslice import IMutableGSlice
 
 
 class SelectiveFixedWidthBytesMmap(SelectiveGMmap, FixedWidthBytesMmap):
+    _decodes_to_gathered = True
+
     def __init__(self, width, source):
         super(SelectiveFixedWidthBytesMmap, self).__init__(width, source)
-        self._selection = Selection(universe=slice(0, self._length))
+        self._selection = make_selection(universe=slice(0, self._length))
 
     @property
-    def selection(self) -> Selection:
+    def selection(self) -> IMutableGSlice:
         return self._selection
 
     def _nonvirtualint2physical(self, location: int):
         return slice(self.width * location, self.width * (location + 1))
 
-    def _nonvirtualselection2physical(self, location: Selection):
+    def _nonvirtualselection2physical(self, location: IMutableGSlice):
         return location * self.width
@@ -1,8 +1,11 @@
 from abc import ABCMeta, abstractmethod
+from typing import Callable, Iterable, List, Tuple
 
 from pyromhackit.gmmap.listlike_gmmap import ListlikeGMmap
 from pyromhackit.gmmap.physically_indexed_gmmap import PhysicallyIndexedGMmap
-from pyromhackit.gslice.selection import Selection
+from pyromhackit.gslice.delta import SelectionDelta
+from pyromhackit.gslice.igslice import IGSlice
+from pyromhackit.gslice.imutablegslice import IMutableGSlice
 
 
 class SelectiveGMmap(ListlikeGMmap, PhysicallyIndexedGMmap, metaclass=ABCMeta):
@@ -10,9 +13,16 @@ class SelectiveGMmap(ListlikeGMmap, PhysicallyIndexedGMmap, metaclass=ABCMeta):
     purview. If the ith element is visible and becomes preceded by n hidden elements, that means that this element will
     henceforth be considered to be the (i-n)th element. """
 
+    # The visible elements are gathered and decoded at most once, as dump scripts read them as a whole over and over.
+    # While a cache is held, _update_caches listens to the selection and splices the elements that became visible or
+    # hidden into it, so the elements that stay visible are never read or decoded again. Writes call _invalidate.
+    _gathered = None  # The bytestring representation of the visible elements, as gathered by _gathered_bytes
+    _revealed = None  # The visible elements decoded, i.e. self[:], unless _gathered is self[:] already
+    _decodes_to_gathered = False  # Whether self[:] is the bytestring representation, so that _gathered serves as both
+
     @property
     @abstractmethod
-    def selection(self) -> Selection:
+    def selection(self) -> IMutableGSlice:
         raise NotImplementedError
 
     def _logicalint2physical(self, vindex: int):  # Final
@@ -23,14 +33,153 @@ class SelectiveGMmap(ListlikeGMmap, PhysicallyIndexedGMmap, metaclass=ABCMeta):
         nonvselection = self.selection.virtual2physicalselection(vslice)
         return self._nonvirtualselection2physical(nonvselection)
 
+    def __iter__(self):  # Final
+        """ :return A generator for every visible element in the sequence, left to right. The revealed intervals of the
+        selection are walked once, so iterating is O(n + k) for n elements in k intervals rather than costing a
+        virtual2physical lookup per element. """
+        content = self._content
+        for a, b in self.selection.pairs():
+            for location in range(a, b):
+                yield self._decode(self._physical2bytes(self._nonvirtualint2physical(location), content))
+
+    def __getitem__(self, location):  # Final
+        """ :return A sub-sequence that @location refers to. The whole sequence is decoded on the first access and kept
+        up to date as the visible elements change. """
+        if isinstance(location, slice) and location.indices(len(self)) == (0, len(self), 1):
+            if self._decodes_to_gathered:
+                return self._gathered_bytes()
+            if self._revealed is None:
+                self._revealed = super(SelectiveGMmap, self).__getitem__(location)
+                self._follow_selection()
+            return self._revealed
+        return super(SelectiveGMmap, self).__getitem__(location)
+
+    def _gathered_bytes(self) -> bytes:
+        """ :return The bytestring representation of the visible elements, which are gathered on the first call and
+        kept up to date as the visible elements change. """
+        if self._gathered is None:
+            gathered = self._physical2bytes(self._logical2physical(slice(None)), self._content)
+            self._gathered = self._decode(gathered) if self._decodes_to_gathered else gathered
+            self._follow_selection()
+        return self._gathered
+
+    def _gathered_buffer(self) -> memoryview:
+        """ :return A read-only memoryview of the visible elements, as gathered by _gathered_bytes. """
+        return memoryview(self._gathered_bytes()).toreadonly()
+
+    def _follow_selection(self):
+        """ Registers _update_caches on the selection, unless it already is, so that the caches follow its changes. """
+        if self._update_caches not in self.selection.listeners:
+            self.selection.add_listener(self._update_caches)
+
+    def _update_caches(self, delta: SelectionDelta):
+        """ Splices the elements that @delta reveals into the cached contents of the visible elements, and cuts those it
+        covers out of them. Only the newly revealed elements are read and decoded, in one call per range. """
+        edits = self._cache_edits(delta)
+        if self._gathered is not None:
+            self._gathered = _spliced(self._gathered, edits)
+        if self._revealed is not None:
+            self._revealed = _spliced(self._revealed, [(self._decoded_position(a), self._decoded_position(b),
+                                                        self._decode(bytestring)) for a, b, bytestring in edits])
+
+    def _cache_edits(self, delta: SelectionDelta) -> List[Tuple[int, int, bytes]]:
+        """ :return The ascending list of edits (a, b, bytestring) that turn the bytestring representation of the
+        visible elements before the change @delta into that after it, each replacing the bytes [a, b) of the former
+        with bytestring. The unchanged elements between the ranges of @delta are counted run by run, so this is
+        O(k + m*log(n)) for k runs of visible elements and m ranges. """
+        changes = sorted([(a, b, True) for a, b in delta.revealed] + [(a, b, False) for a, b in delta.covered])
+        edits = []
+        position = 0  # The position in the former bytestring representation of the element previous
+        previous = 0
+        for a, b, revealed in changes:
+            position += self._visible_bytecount(previous, a)
+            span = self._run_bytes(a, b)
+            if revealed:
+                edits.append((position, position, self._physical2bytes(span, self._content)))
+            else:
+                edits.append((position, position + span.stop - span.start, b''))
+                position += span.stop - span.start
+            previous = b
+        return edits
+
+    def _visible_bytecount(self, from_index: int, to_index: int) -> int:
+        """ :return The number of bytes that the visible elements with index i, where @from_index <= i < @to_index,
+        are stored in. """
+        if from_index >= to_index:
+            return 0
+        runs = (self._run_bytes(a, b) for a, b in self.selection.subslice_view(from_index, to_index).pairs())
+        return sum(span.stop - span.start for span in runs)
+
+    def _run_bytes(self, from_index: int, to_index: int) -> slice:
+        """ :return The slice of the bytes of the mmap that the elements [@from_index, @to_index) are stored in. """
+        start = self._nonvirtualint2physical(from_index).start
+        stop = self._nonvirtualint2physical(to_index - 1).stop
+        return slice(*slice(start, stop).indices(len(self._content))[:2])
+
+    def _decoded_position(self, position: int) -> int:
+        """ :return The position in self[:] of what the byte at position @position in the bytestring representation of
+        the visible elements decodes into. Deriving classes whose elements do not decode byte by byte override this.
+        """
+        return position
+
+    def _invalidate(self):
+        """ Drops the cached contents of the visible elements. """
+        self._gathered = None
+        self._revealed = None
+        if self._update_caches in self.selection.listeners:
+            self.selection.remove_listener(self._update_caches)
+
+    def _invalidate_elements(self, from_index: int, to_index: int):
+        """ Drops the cached contents of the visible elements after the elements with index i, where
+        @from_index <= i < @to_index, were written to. The caches are dropped whole, but are kept if none of those
+        elements is visible. """
+        if self._gathered is not None or self._revealed is not None:
+            if self.selection.count_revealed(from_index, to_index):
+                self._invalidate()
+
     @abstractmethod
     def _nonvirtualint2physical(self, location: int) -> int:
         raise NotImplementedError
 
     @abstractmethod
-    def _nonvirtualselection2physical(self, location: Selection) -> Selection:
+    def _nonvirtualselection2physical(self, location: IMutableGSlice) -> IMutableGSlice:
         raise NotImplementedError
 
+    def reset_selection(self, selection: IMutableGSlice):
+        """ Makes the elements revealed by @selection, and no others, visible. @selection must have the same universe as
+        this GMmap's selection. It is not copied; the GMmap works on a snapshot of it. """
+        if selection.universe != self.selection.universe:
+            raise ValueError("Expected a selection with universe {}, got {}".format(self.selection.universe,
+                                                                                   selection.universe))
+        previous = self.selection
+        listeners = previous.listeners
+        self._selection = selection.snapshot()
+        self._length = len(self._selection)  # The caches, if any, are updated through the listeners below
+        if not listeners:
+            return
+        for listener in listeners:
+            previous.remove_listener(listener)
+            self._selection.add_listener(listener)
+        delta = SelectionDelta.between(list(previous.pairs()), list(self._selection.pairs()))
+        if delta:
+            for listener in listeners:
+                listener(delta)
+
+    def add_listener(self, listener: Callable[[SelectionDelta], None]):
+        """ Registers @listener to be called with a SelectionDelta, holding the ranges of indices of elements that
+        became visible and hidden, whenever the set of visible elements changes. Unlike a listener registered on the
+        selection itself, it survives reset_selection, which notifies it of the difference between the selections. """
+        self.selection.add_listener(listener)
+
+    def remove_listener(self, listener: Callable[[SelectionDelta], None]):
+        self.selection.remove_listener(listener)
+
+    def restrict(self, vselection: IGSlice):
+        """ Let I_0, I_1, ..., I_(M-1) denote the indices of the visible elements in the sequence. This method causes
+        every element with index I_i to become hidden unless i is in @vselection, whose universe must be [0, M), in a
+        single merge. """
+        self.reset_selection(self.selection.compose(vselection))
+
     def coverup(self, from_index, to_index):
         """ Let N denote the total number of elements in the sequence. This method causes every element with index i,
         where @from_index <= i < @to_index, to become hidden (if it is not already). """
@@ -43,6 +192,12 @@ class SelectiveGMmap(ListlikeGMmap, PhysicallyIndexedGMmap, metaclass=ABCMeta):
         covered_count = self.selection.exclude_virtual(from_index, to_index)
         self._length -= covered_count
 
+    def coverup_many(self, intervals: Iterable[Tuple[int, int]]):
+        """ Causes every element with index i, where a <= i < b for some pair (a, b) in @intervals, to become hidden (if
+        it is not already). Equivalent to calling coverup once per pair, but done in a single pass. """
+        covered_count = self.selection.exclude_many(intervals)
+        self._length -= covered_count
+
     def uncover(self, from_index, to_index):
         """ Let N denote the total number of elements in the sequence. This method causes every element with index i,
         where @from_index <= i < @to_index, to become visible (if it is not already). """
@@ -57,3 +212,22 @@ class SelectiveGMmap(ListlikeGMmap, PhysicallyIndexedGMmap, metaclass=ABCMeta):
         """
         revealed_count = self.selection.include(from_index, to_index)
         self._length += revealed_count
+
+    def uncover_many(self, intervals: Iterable[Tuple[int, int]]):
+        """ Causes every element with index i, where a <= i < b for some pair (a, b) in @intervals, to become visible (if
+        it is not already). Equivalent to calling uncover once per pair, but done in a single pass. """
+        revealed_count = self.selection.include_many(intervals)
+        self._length += revealed_count
+
+
+def _spliced(sequence, edits: List[Tuple[int, int, object]]):
+    """ :return @sequence with the slice [a, b) replaced with replacement for each of the ascending, disjoint edits
+    (a, b, replacement) in @edits. """
+    pieces = []
+    position = 0
+    for a, b, replacement in edits:
+        pieces.append(sequence[position:a])
+        pieces.append(replacement)
+        position = b
+    pieces.append(sequence[position:])
+    return sequence[0:0].join(pieces)
@@ -0,0 +1,96 @@
+from typing import List, Tuple, Union
+
+from pyromhackit.gmmap.patch_overlay import PatchOverlay
+from pyromhackit.gmmap.selective_fixed_width_bytes_mmap import SelectiveFixedWidthBytesMmap
+from pyromhackit.gmmap.settable_gmmap import SettableGMmap
+from pyromhackit.gslice.igslice import IGSlice
+from pyromhackit.gslice.imutablegslice import IMutableGSlice
+
+
+class SelectivePatchedBytesMmap(SettableGMmap, SelectiveFixedWidthBytesMmap):
+    """ A SelectiveFixedWidthBytesMmap whose elements can be set without writing to the mmap, which may be a read-only
+    mapping of a file. The written bytes are kept in a PatchOverlay and merged into whatever is read, so altering a few
+    elements of a large file never copies the file. commit writes them through to the mmap or the file. """
+
+    def __init__(self, width, source):
+        super(SelectivePatchedBytesMmap, self).__init__(width, source)
+        self.overlay = PatchOverlay()
+
+    def base(self) -> memoryview:
+        """ :return A read-only memoryview of the mmap without the written bytes, i.e. the source of the patch. """
+        return memoryview(self._content).toreadonly()
+
+    def patch(self, offset: int, bytestring: bytes):
+        """ Overwrites the bytes of the mmap from offset @offset with @bytestring, whether or not their elements are
+        visible.
+        :raise IndexError if the bytes do not all lie within the mmap. """
+        if not 0 <= offset <= offset + len(bytestring) <= len(self._content):
+            raise IndexError("Cannot write {} bytes at offset {}".format(len(bytestring), offset))
+        self.overlay.write(offset, bytestring)
+        self._invalidate_elements(offset // self.width, -(-(offset + len(bytestring)) // self.width))
+
+    def patches(self) -> List[Tuple[int, bytes]]:
+        """ :return The ascending list of extents (offset, bytestring) that was written over the mmap. """
+        return self.overlay.extents()
+
+    def revert(self):
+        """ Discards every write that has not been committed. """
+        if self.overlay:
+            self.overlay.clear()
+            self._invalidate()
+
+    def commit(self):
+        """ Writes the written bytes through to the file the mmap maps, or to the mmap itself if it maps no file, and
+        discards them from the overlay. The file is written to in place, so only the written bytes are copied. """
+        if self.path is not None:
+            with open(self.path, 'r+b') as f:
+                for offset, data in self.overlay:
+                    f.seek(offset)
+                    f.write(data)
+        else:
+            for offset, data in self.overlay:
+                self._content[offset:offset + len(data)] = data
+        self.overlay.clear()  # The merged contents are unchanged, so the caches stay valid
+
+    def _write(self, physicallocation: Union[slice, IGSlice], bytestring: bytes):
+        if isinstance(physicallocation, slice):
+            start, stop, _ = physicallocation.indices(len(self._content))
+            pairs = [(start, stop)]
+        else:
+            pairs = list(physicallocation.pairs())
+        if sum(b - a for a, b in pairs) != len(bytestring):
+            raise ValueError("Cannot change the length of the sequence: expected {} bytes, got {}".format(
+                sum(b - a for a, b in pairs), len(bytestring)))
+        position = 0
+        for a, b in pairs:
+            self.patch(a, bytestring[position:position + b - a])
+            position += b - a
+
+    def _physical2bytes(self, physicallocation: Union[slice, IGSlice], content) -> bytes:
+        """ :return The bytestring obtained when accessing the @content mmap using @physicallocation, with the written
+        bytes merged in. The unwritten bytes are gathered as usual and the written ones then copied over them, so reads
+        stay as fast as without an overlay, plus O(log(n) + k) for the k revealed pieces of written extents. """
+        if not self.overlay:
+            return super(SelectivePatchedBytesMmap, self)._physical2bytes(physicallocation, content)
+        if isinstance(physicallocation, slice):
+            start, stop, _ = physicallocation.indices(len(content))
+            return self.overlay.patched(content, start, stop)
+        target = bytearray(physicallocation.select(content))
+        self._patch_selected(target, physicallocation)
+        return bytes(target)
+
+    def _patch_selected(self, target: bytearray, selection: IMutableGSlice):
+        """ Overwrites @target, the bytes of the mmap revealed by @selection gathered together, with the written bytes.
+        """
+        if len(selection) == 0:
+            return
+        first, last = selection.virtual2physical(0), selection.virtual2physical(len(selection) - 1)
+        for offset, data in self.overlay.overlapping(first, last + 1):
+            for a, b in selection.subslice_view(offset, offset + len(data)).pairs():
+                vindex = selection.count_revealed(None, a)
+                target[vindex:vindex + b - a] = data[a - offset:b - offset]
+
+    def _chunk(self, view: memoryview, from_index: int, to_index: int) -> memoryview:
+        if self.overlay.overlaps(from_index, to_index):
+            return memoryview(self.overlay.patched(view, from_index, to_index))
+        return view[from_index:to_index]
@@ -9,4 +9,8 @@ class SettableGMmap(GMmap, metaclass=ABCMeta):
         slicing the sequence with @location to @val, if @location is a slice. """
         bytestringrepr = self._encode(val)
         bytestringlocation = self._logical2physical(location)
-        self._content[bytestringlocation] = bytestringrepr
+        self._write(bytestringlocation, bytestringrepr)
+
+    def _write(self, physicallocation, bytestring: bytes):
+        """ Stores @bytestring at the physical location @physicallocation. By default, in the mmap itself. """
+        self._content[physicallocation] = bytestring
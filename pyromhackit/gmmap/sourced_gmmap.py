@@ -4,6 +4,7 @@ from abc import ABCMeta, abstractmethod
 from typing import Optional
 
 from pyromhackit.gmmap.gmmap import GMmap
+from pyromhackit.gmmap.mmap_builder import MmapBuilder
 
 
 class SourcedGMmap(GMmap, metaclass=ABCMeta):
@@ -27,7 +28,7 @@ class SourcedGMmap(GMmap, metaclass=ABCMeta):
 
     @classmethod
     def _source2triple(cls, source):
-        if isinstance(source, io.TextIOWrapper):  # Source is file
+        if isinstance(source, io.IOBase):  # Source is file
             content = cls._file2mmap(source)
             path = source.name
             length = cls._initial_length(content)
@@ -37,51 +38,41 @@ class SourcedGMmap(GMmap, metaclass=ABCMeta):
             length = cls._initial_length(content)  # Cannot do len(source) if it is a generator
         return content, length, path
 
-    @classmethod
-    def _source2mmap(cls, source) -> (mmap.mmap, int):
-        if isinstance(source, io.TextIOWrapper):  # Source is file
-            return cls._file2mmap(source), None  # FIXME
+    def _source2mmap(self, source, size_hint: Optional[int] = None) -> (mmap.mmap, int):
+        if isinstance(source, io.IOBase):  # Source is file
+            return self._file2mmap(source), None  # FIXME
         else:
-            return cls._sequence2mmap(source)
-
-    @classmethod
-    def _sequence2mmap(cls, sequence) -> (mmap.mmap, int):  # Final
-        """ :return An anonymous mmap storing the bytestring representation of the sequence @sequence, paired with the
-        number of elements in the sequence. @sequence needs to either be a bytestring or an iterable containing only
-        elements that implement __len__. """
+            return self._sequence2mmap(source, size_hint)
 
-        def double_mmap_capacity(m):
-            new_m = mmap.mmap(-1, capacity)
-            new_m.write(bytes(m))  # FIXME Potentially large bytestring
-            m.close()
-            return new_m
-
-        protection = cls._access()
+    def _sequence2mmap(self, sequence, size_hint: Optional[int] = None) -> (mmap.mmap, int):  # Final
+        """ :return A mmap storing the bytestring representation of the sequence @sequence, paired with the number of
+        elements in the sequence. @sequence needs to either be a bytestring or an iterable containing only elements that
+        implement __len__. @size_hint is the expected length of the bytestring representation, if known. The elements
+        are appended to an MmapBuilder, so the representation is never held in memory as a whole. """
+        protection = self._access()
         if isinstance(sequence, bytes):
             m = mmap.mmap(-1, len(sequence), access=protection)
             m.write(sequence)
             return m, len(m)
-        capacity = mmap.PAGESIZE  # Initial capacity. Cannot do len(sequence) since it is a generator.
-        m = mmap.mmap(-1, capacity)
-        currentsize = 0
+        builder = MmapBuilder(size_hint)
         element_count = 0
-        for element in sequence:
+        for element in sequence:  # Cannot do len(sequence) since it may be a generator
             element_count += 1
-            bs = cls._encode(element)
-            currentsize += len(bs)
-            while currentsize > capacity:
-                capacity *= 2
-                m = double_mmap_capacity(m)  # Because m.resize() is apparently bugged and causes SIGBUS
-            m.write(bs)
-        m.resize(currentsize)
-        return m, element_count
+            builder.append(self._encode(element))
+        return builder.build(protection), element_count
 
     @classmethod
     def _file2mmap(cls, file) -> mmap.mmap:  # Final
-        """ :return A mmap storing the bytestring representation of the sequence originating from the file @file. """
-        protection = cls._access()
-        m = mmap.mmap(file.fileno(), 0, access=protection)
-        return m
+        """ :return A mmap of the whole of the file @file, which stores the bytestring representation of the sequence.
+        Nothing is read until it is accessed, so this takes constant time regardless of the size of the file, and the
+        mmap stays valid after @file is closed. """
+        return mmap.mmap(file.fileno(), 0, access=cls._file_access())
+
+    @staticmethod
+    def _file_access():
+        """ :return The memory protection of memory-mapped files. By default, copy-on-write, so that the sequence can
+        be altered without the file being written to. """
+        return mmap.ACCESS_COPY
 
     @staticmethod
     def _access():
@@ -1,36 +1,111 @@
+import sys
 from abc import ABCMeta
 
+import numpy
+
 from pyromhackit.gmmap.additive import Additive
 from pyromhackit.gmmap.listlike_gmmap import ListlikeGMmap
 from pyromhackit.gmmap.physically_indexed_gmmap import PhysicallyIndexedGMmap
 
 
+NATIVE_UTF32 = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'  # UTF-32 without a byte order mark
+NATIVE_UTF16 = 'utf-16-le' if sys.byteorder == 'little' else 'utf-16-be'
+# Maps the number of bytes per code point to the codec that stores every code point in that many bytes
+FIXED_WIDTH_CODECS = {1: 'latin-1', 2: NATIVE_UTF16, 4: NATIVE_UTF32}
+
+
+def char_width(max_code_point: int) -> int:
+    """ :return The least number of bytes per code point, 1, 2 or 4, in which every code point up to @max_code_point
+    fits, as in the flexible string representation of PEP 393. Code points above 0xFFFF take two UTF-16 code units, so
+    only the Basic Multilingual Plane fits in 2 bytes. """
+    if max_code_point <= 0xFF:
+        return 1
+    if max_code_point <= 0xFFFF:
+        return 2
+    return 4
+
+
+def offsets_from_lengths(lengths) -> numpy.ndarray:
+    """ :return The array of the n+1 offsets [0, l0, l0+l1, ..., l0+...+ln-1] of the n consecutive runs with lengths
+    @lengths, an unsigned 64-bit buffer. The array holds 32-bit integers unless the total length needs 64 bits. """
+    offsets = numpy.zeros(len(lengths) + 1, dtype=numpy.uint64)
+    numpy.cumsum(numpy.frombuffer(lengths, dtype=numpy.uint64), out=offsets[1:])
+    if offsets[-1] < 2 ** 32:
+        offsets = offsets.astype(numpy.uint32)
+    return offsets
+
+
 class StringMmap(Additive, ListlikeGMmap, PhysicallyIndexedGMmap, metaclass=ABCMeta):
-    """ A ListlikeGMmap where each element in the sequence is a Unicode string of any positive length. """
+    """ A ListlikeGMmap where each element in the sequence is a Unicode string of any positive length. Every code point
+    is stored in the same number of bytes, char_width, so that indexing stays O(1). Deriving classes that know which
+    code points can occur may narrow it from the default of 4 bytes, after which the bytestring of any run of elements
+    is decoded in a single call with the matching fixed-width codec.
+
+    Elements are one code point long unless the deriving class sets _offsets, the array of the index of the first code
+    point of every element followed by the total number of code points. Then an element maps to its code points in O(1)
+    and a code point to its element in O(log(n)) by binary search. """
+
+    _char_width = 4
+    _offsets = None
+
+    @property
+    def char_width(self) -> int:
+        """ :return The number of bytes every code point is stored in: 1 (Latin-1), 2 (UCS-2) or 4 (UTF-32). """
+        return self._char_width
+
+    def element2chars(self, index: int) -> slice:
+        """ :return The slice of the code points that the element at physical index @index consists of. O(1). """
+        if self._offsets is None:
+            return slice(index, index + 1)
+        return slice(int(self._offsets[index]), int(self._offsets[index + 1]))
+
+    def char2element(self, char_index: int) -> int:
+        """ :return The physical index of the element that the @char_index'th code point belongs to. O(log(n)).
+        :raise IndexError if there is no such code point. """
+        if self._offsets is None:
+            if not 0 <= char_index < self._length:
+                raise IndexError("Code point index out of range: {}".format(char_index))
+            return char_index
+        if not 0 <= char_index < self._offsets[-1]:
+            raise IndexError("Code point index out of range: {}".format(char_index))
+        # The last element starting at or before the code point, which skips any empty element in front of it
+        return int(numpy.searchsorted(self._offsets, char_index, side='right')) - 1
+
+    def _element_bytes(self, start: int, stop: int) -> slice:
+        """ :return The slice of the bytes that the elements [@start, @stop) are stored in. """
+        width = self._char_width
+        return slice(width * int(self._offsets[start]), width * int(self._offsets[stop]))
 
     def _logicalslice2physical(self, location: slice) -> slice:
+        width = self._char_width
+        if self._offsets is not None:
+            start, stop, step = location.indices(len(self))
+            if step != 1:
+                raise NotImplementedError("Strided slices of variable-length elements")
+            return self._element_bytes(start, max(start, stop))
         return slice(
-            4 * location.start if location.start else None,
-            4 * location.stop if location.stop else None,
-            4 * location.step if location.step else None,
+            width * location.start if location.start else None,
+            width * location.stop if location.stop else None,
+            width * location.step if location.step else None,
         )
 
     def _logicalint2physical_unsafe(self, location: int) -> slice:
+        width = self._char_width
+        if self._offsets is not None:
+            location %= len(self)
+            return self._element_bytes(location, location + 1)
         if 0 <= location < len(self):
-            return slice(4 * location, 4 * (location + 1))
+            return slice(width * location, width * (location + 1))
         elif -len(self) <= location < -1:
-            return slice(4 * location, 4 * (location + 1))
+            return slice(width * location, width * (location + 1))
         elif location == -1:
-            return slice(4 * location, None)
+            return slice(width * location, None)
 
-    @classmethod
-    def _encode(cls, element: str) -> bytes:
-        return element.encode('utf-32')[4:]
+    def _encode(self, element: str) -> bytes:
+        return element.encode(FIXED_WIDTH_CODECS[self._char_width], 'surrogatepass')
 
-    @classmethod
-    def _decode(cls, bytestring: bytes) -> str:
-        prefix = ''.encode('utf-32')
-        return (prefix + bytestring).decode('utf-32')
+    def _decode(self, bytestring: bytes) -> str:
+        return str(bytestring, FIXED_WIDTH_CODECS[self._char_width], 'surrogatepass')
 
     def __add__(self, operand: str) -> str:
         """ :return A string being the concatenation of the sequence's string representation and @operand. """
@@ -0,0 +1,486 @@
+from typing import Optional, Union, List, Tuple, Iterator, Iterable
+
+import numpy
+
+from pyromhackit.gslice.cursor import IntervalCursor
+from pyromhackit.gslice.delta import notifying, notifying_batch
+from pyromhackit.gslice.edges import EDGE_DTYPE, merge_edges
+from pyromhackit.gslice.igslice import IGSlice
+from pyromhackit.gslice.imutablegslice import IMutableGSlice
+
+
+def sorted_union(edges1: numpy.ndarray, edges2: numpy.ndarray) -> numpy.ndarray:
+    """ :return The ascending array of the distinct integers in the ascending arrays @edges1 and @edges2. Unlike
+    numpy.union1d, which hashes, this exploits that both are sorted already. O((n + m)*log(n + m)) worst case but close
+    to linear in practice. """
+    points = numpy.concatenate([edges1, edges2])
+    points.sort(kind='stable')  # Timsort, which merges the two ascending runs
+    if len(points) == 0:
+        return points
+    distinct = numpy.empty(len(points), dtype=bool)
+    distinct[0] = True
+    distinct[1:] = points[1:] != points[:-1]
+    return points[distinct]
+
+
+def normalized_range(universe: slice, from_index: Optional[int], to_index: Optional[int]) -> Tuple[int, int]:
+    """ :return The range [a, b) of @universe that include and exclude act on when passed @from_index and @to_index. """
+    stop = universe.stop
+    if from_index is None:
+        from_index = universe.start
+    elif -stop <= from_index < 0:
+        from_index %= stop
+    if to_index is None or to_index > stop:
+        to_index = stop
+    elif -stop <= to_index < 0:
+        to_index %= stop
+    assert universe.start <= from_index <= stop
+    assert universe.start <= to_index <= stop
+    return from_index, to_index
+
+
+def batch2edges(universe: slice, intervals: Iterable[Tuple[Optional[int], Optional[int]]]) -> numpy.ndarray:
+    """ :return The edge array of the union of the ranges in @intervals, each normalized the way include and exclude
+    normalize their arguments. """
+    pairs = [normalized_range(universe, a, b) for a, b in intervals]
+    if not pairs:
+        return numpy.empty(0, dtype=EDGE_DTYPE)
+    array = numpy.array(pairs, dtype=EDGE_DTYPE)
+    return merge_edges(array[:, 0], array[:, 1])
+
+
+class ArraySelection(IMutableGSlice):
+    """ Selection whose interval edges are stored in a contiguous int64 array [a0, b0, a1, b1, ...] rather than in a
+    SortedSet. Uses about as much memory as the integers themselves and does its bulk work (length, pairs, complement,
+    selecting, scaling) in vectorized NumPy operations, which makes it the better choice for selections with a very
+    large number of intervals. Mutations splice the array, so a single include or exclude is O(n), albeit with a small
+    constant. """
+
+    def __init__(
+            self,
+            universe: slice,
+            revealed: list = None,
+            intervals: Iterator = None,
+            _length: Optional[int] = None  # For performance
+    ):
+        """ @revealed and @intervals mean the same as for Selection: a list of revealed pairs or slices, or a sequence of
+        interval edges where an odd number of edges implies that the first interval starts at 0. If neither is given,
+        everything is revealed. """
+        self.universe = universe
+        if intervals is None and revealed is None:
+            self._edges = numpy.array([universe.start, universe.stop], dtype=EDGE_DTYPE)
+        elif intervals is not None:
+            self._edges = self.intervals2edges(intervals)
+        else:
+            self._edges = self.revealed2edges(revealed)
+        self._revealed_count = _length if isinstance(_length, int) else self._compute_len(self._edges)
+        self._cumulative = None  # Cumulative interval lengths, computed on demand
+
+    @classmethod
+    def _from_edges(cls, universe: slice, edges: numpy.ndarray, length: Optional[int] = None) -> 'ArraySelection':
+        """ :return An ArraySelection using the edge array @edges, which must already be on canonical form. """
+        selection = cls.__new__(cls)
+        selection.universe = universe
+        selection._edges = edges
+        selection._revealed_count = length if isinstance(length, int) else cls._compute_len(edges)
+        selection._cumulative = None
+        return selection
+
+    @staticmethod
+    def intervals2edges(intervals: Iterator) -> numpy.ndarray:
+        """ Converts a sequence of interval edges on the form used by Selection._intervals to an edge array. """
+        edges = numpy.fromiter(intervals, dtype=EDGE_DTYPE)
+        if len(edges) % 2 == 1:
+            edges = numpy.concatenate([numpy.zeros(1, dtype=EDGE_DTYPE), edges])
+        return merge_edges(edges[0::2], edges[1::2])
+
+    @staticmethod
+    def revealed2edges(revealed: List[Union[tuple, slice]]) -> numpy.ndarray:
+        """ Converts a list of included pairs or slices to an edge array. """
+        pairs = [(sl.start, sl.stop) if isinstance(sl, slice) else sl for sl in revealed]
+        if not pairs:
+            return numpy.empty(0, dtype=EDGE_DTYPE)
+        array = numpy.array(pairs, dtype=EDGE_DTYPE).reshape(-1, 2)
+        return merge_edges(array[:, 0], array[:, 1])
+
+    @staticmethod
+    def _compute_len(edges: numpy.ndarray) -> int:
+        """ :return The sum of the lengths of every interval in @edges. """
+        return int((edges[1::2] - edges[0::2]).sum())
+
+    def _mutated(self, edges: numpy.ndarray):
+        self._edges = edges
+        self._cumulative = None
+
+    def _cumulative_lengths(self) -> numpy.ndarray:
+        """ :return An array whose ith element is the total length of the first i + 1 intervals. """
+        if self._cumulative is None:
+            self._cumulative = numpy.cumsum(self._edges[1::2] - self._edges[0::2])
+        return self._cumulative
+
+    def slices(self) -> List[slice]:
+        return [slice(a, b) for a, b in self.pairs()]
+
+    def pairs(self) -> Iterator[Tuple[int, int]]:
+        edges = self._edges.tolist()
+        return zip(edges[0::2], edges[1::2])
+
+    def gap_pairs(self) -> Iterator[Tuple[int, int]]:
+        return self.complement().pairs()
+
+    def intervals(self) -> numpy.ndarray:
+        """ :return A read-only (k, 2) array of the revealed intervals. """
+        view = self._edges.reshape(-1, 2)
+        view.flags.writeable = False
+        return view
+
+    def to_array(self) -> numpy.ndarray:
+        return self._edges.reshape(-1, 2).copy()
+
+    def _normalized_pair(self, from_index: Optional[int], to_index: Optional[int]) -> Tuple[int, int]:
+        return normalized_range(self.universe, from_index, to_index)
+
+    def _revealed_within(self, a: int, i: int, b: int, j: int) -> int:
+        """ :return The number of revealed integers in [@a, @b), given that @i edges are less than @a and @j edges are
+        less than or equal to @b. """
+        clipped = numpy.concatenate([[a] * (i % 2), self._edges[i:j], [b] * (j % 2)])
+        return int((clipped[1::2] - clipped[0::2]).sum())
+
+    @notifying
+    def include(self, from_index: Optional[int], to_index: Optional[int]):
+        a, b = self._normalized_pair(from_index, to_index)
+        if a >= b:
+            return 0
+        i = int(numpy.searchsorted(self._edges, a, side='left'))
+        j = int(numpy.searchsorted(self._edges, b, side='right'))
+        revealed_count = (b - a) - self._revealed_within(a, i, b, j)
+        inserted = [a] * (i % 2 == 0) + [b] * (j % 2 == 0)
+        self._mutated(numpy.concatenate([self._edges[:i], numpy.array(inserted, dtype=EDGE_DTYPE), self._edges[j:]]))
+        self._revealed_count += revealed_count
+        return revealed_count
+
+    @notifying
+    def exclude(self, from_index: Optional[int], to_index: Optional[int]):
+        a, b = self._normalized_pair(from_index, to_index)
+        if a >= b:
+            return 0
+        i = int(numpy.searchsorted(self._edges, a, side='left'))
+        j = int(numpy.searchsorted(self._edges, b, side='right'))
+        covered_count = self._revealed_within(a, i, b, j)
+        inserted = [a] * (i % 2 == 1) + [b] * (j % 2 == 1)
+        self._mutated(numpy.concatenate([self._edges[:i], numpy.array(inserted, dtype=EDGE_DTYPE), self._edges[j:]]))
+        self._revealed_count -= covered_count
+        return covered_count
+
+    def _include_edges(self, edges: numpy.ndarray) -> int:
+        """ Includes every interval in the edge array @edges in a single merge.
+        :return The number of excluded integers that were included. """
+        if len(edges) == 0:
+            return 0
+        starts = numpy.concatenate([self._edges[0::2], edges[0::2]])
+        stops = numpy.concatenate([self._edges[1::2], edges[1::2]])
+        original_length = self._revealed_count
+        self._mutated(merge_edges(starts, stops))
+        self._revealed_count = self._compute_len(self._edges)
+        return self._revealed_count - original_length
+
+    def _batch2edges(self, intervals: Iterable[Tuple[Optional[int], Optional[int]]]) -> numpy.ndarray:
+        return batch2edges(self.universe, intervals)
+
+    @notifying_batch
+    def include_many(self, intervals: Iterable[Tuple[Optional[int], Optional[int]]]):
+        """ Includes every integer in [a, b) for each pair (a, b) in @intervals in a single vectorized merge.
+        O((n + k)*log(n + k)).
+        :return The number of excluded integers that were included. """
+        return self._include_edges(self._batch2edges(intervals))
+
+    @notifying_batch
+    def exclude_many(self, intervals: Iterable[Tuple[Optional[int], Optional[int]]]):
+        """ Excludes every integer in [a, b) for each pair (a, b) in @intervals by including them in the complement in a
+        single vectorized merge. O((n + k)*log(n + k)).
+        :return The number of included integers that were excluded. """
+        batch = self._batch2edges(intervals)
+        if len(batch) == 0:
+            return 0
+        gaps = self.complement()
+        gaps._include_edges(batch)
+        original_length = self._revealed_count
+        self._mutated(gaps.complement()._edges)
+        self._revealed_count = self._compute_len(self._edges)
+        return original_length - self._revealed_count
+
+    def _gap_edges(self, from_index: Optional[int], to_index: Optional[int]) -> numpy.ndarray:
+        """ :return The edge array of the excluded intervals, cut off at [@from_index, @to_index). """
+        return self.complement().subslice(from_index, to_index)._edges
+
+    @notifying
+    def include_partially(self, from_index: Optional[int], to_index: Optional[int], count: Union[int, tuple]):
+        if isinstance(count, int):
+            return self.include_partially(from_index, to_index, (count, count))
+        head_count, tail_count = count
+        head_revealed_count = self._include_partially_from_left(from_index, to_index, head_count)
+        tail_revealed_count = self._include_partially_from_right(from_index, to_index, tail_count)
+        return head_revealed_count + tail_revealed_count
+
+    def _include_partially_from_left(self, from_index: Optional[int], to_index: Optional[int], count: int):
+        if count == 0:
+            return 0
+        gaps = self._gap_edges(from_index, to_index)
+        ends = numpy.cumsum(gaps[1::2] - gaps[0::2])
+        k = int(numpy.searchsorted(ends, count, side='left'))
+        pieces = gaps[:2 * k + 2].copy()
+        if k < len(ends):
+            pieces[2 * k + 1] = pieces[2 * k] + count - (int(ends[k - 1]) if k > 0 else 0)
+        return self._include_edges(pieces)
+
+    def _include_partially_from_right(self, from_index: Optional[int], to_index: Optional[int], count: int):
+        if count == 0:
+            return 0
+        gaps = self._gap_edges(from_index, to_index)
+        ends = numpy.cumsum((gaps[1::2] - gaps[0::2])[::-1])
+        k = int(numpy.searchsorted(ends, count, side='left'))
+        pieces = gaps[max(0, len(gaps) - 2 * k - 2):].copy()
+        if k < len(ends):
+            pieces[0] = pieces[1] - (count - (int(ends[k - 1]) if k > 0 else 0))
+        return self._include_edges(pieces)
+
+    @notifying
+    def include_expand(self, from_index: Optional[int], to_index: Optional[int], count: Union[int, Tuple[int, int]]):
+        if isinstance(count, int):
+            return self.include_expand(from_index, to_index, (count, count))
+        if count == (0, 0):
+            return 0
+        head_count, tail_count = count
+        gaps = self._gap_edges(from_index, to_index)
+        starts, stops = gaps[0::2], gaps[1::2]
+        # Extend every revealed interval leftwards into the gap preceding it and rightwards into the gap following it
+        followed = stops < self.universe.stop
+        preceded = starts > self.universe.start
+        piece_starts = numpy.concatenate([numpy.maximum(starts, stops - head_count)[followed], starts[preceded]])
+        piece_stops = numpy.concatenate([stops[followed], numpy.minimum(stops, starts + tail_count)[preceded]])
+        return self._include_edges(merge_edges(piece_starts, piece_stops))
+
+    def cursor(self, pindex: Optional[int] = None) -> IntervalCursor:
+        edges = self._edges
+        return IntervalCursor(self, len(edges), lambda i, j: edges[i:j].tolist(),
+                              lambda p: int(numpy.searchsorted(edges, p, side='right')), pindex)
+
+    def _virtual_range2physical(self, from_index: Optional[int], to_index: Optional[int]) -> Tuple[Optional[int], ...]:
+        p_from_index = None
+        if from_index is not None and -len(self) <= from_index < len(self):
+            p_from_index = self.virtual2physical(from_index)
+        p_to_index = None
+        if to_index is not None and -len(self) <= to_index < len(self):
+            p_to_index = self.virtual2physical(to_index)
+        return p_from_index, p_to_index
+
+    def include_virtual(self, from_index: Optional[int], to_index: Optional[int]):
+        return self.include(*self._virtual_range2physical(from_index, to_index))
+
+    def include_partially_virtual(self, from_index: Optional[int], to_index: Optional[int], count: Union[int, tuple]):
+        return self.include_partially(*self._virtual_range2physical(from_index, to_index), count)
+
+    def exclude_virtual(self, from_index: Optional[int], to_index: Optional[int]):
+        return self.exclude(*self._virtual_range2physical(from_index, to_index))
+
+    def __iter__(self):
+        return self.pairs()
+
+    def complement(self) -> 'ArraySelection':
+        start, stop = self.universe.start, self.universe.stop
+        edges = self._edges
+        head = edges[1:] if len(edges) and edges[0] == start else numpy.concatenate([[start], edges])
+        if len(head) and head[-1] == stop:
+            body = head[:-1]
+        else:
+            body = numpy.concatenate([head, [stop]])
+        return self._from_edges(self.universe, body.astype(EDGE_DTYPE, copy=False),
+                                (stop - start) - self._revealed_count)
+
+    def subslice(self, from_index: Optional[int], to_index: Optional[int]) -> 'ArraySelection':
+        a, b = slice(from_index, to_index).indices(self.universe.stop)[:2]
+        if a >= b:
+            return self._from_edges(self.universe, numpy.empty(0, dtype=EDGE_DTYPE), 0)
+        i = int(numpy.searchsorted(self._edges, a, side='right'))
+        j = int(numpy.searchsorted(self._edges, b, side='left'))
+        edges = numpy.concatenate([[a] * (i % 2), self._edges[i:j], [b] * (j % 2)]).astype(EDGE_DTYPE, copy=False)
+        return self._from_edges(self.universe, edges)
+
+    def count_revealed(self, from_index: Optional[int], to_index: Optional[int]) -> int:
+        """ :return The number of revealed elements in [@from_index, @to_index). O(log(n)). """
+        a, b = self._normalized_pair(from_index, to_index)
+        if a >= b:
+            return 0
+        return self._revealed_before(b) - self._revealed_before(a)
+
+    def _revealed_before(self, pindex: int) -> int:
+        """ :return The number of revealed integers less than @pindex. """
+        i = int(numpy.searchsorted(self._edges, pindex, side='right'))
+        k = i // 2
+        before = int(self._cumulative_lengths()[k - 1]) if k > 0 else 0
+        if i % 2 == 1:
+            before += pindex - int(self._edges[i - 1])
+        return before
+
+    def select(self, listlike):
+        if len(self._edges) == 0:
+            return listlike[0:0]
+        try:
+            buffer = numpy.frombuffer(listlike, dtype=numpy.uint8)
+        except TypeError:  # Not a bytes-like object
+            return listlike[0:0].join(listlike[a:b] for a, b in self.pairs())
+        if not self._gathers():
+            return b"".join(self.iter_segments(listlike))
+        return buffer[self._revealed_indices()].tobytes()
+
+    def _gathers(self) -> bool:
+        """ :return True iff the intervals are so many and so short that gathering the revealed elements with a single
+        fancy index beats copying one interval at a time. """
+        interval_count = len(self._edges) // 2
+        return interval_count >= 64 and self._revealed_count < 64 * interval_count
+
+    def _revealed_indices(self) -> numpy.ndarray:
+        """ :return An array of every revealed integer, in ascending order. """
+        lengths = self._edges[1::2] - self._edges[0::2]
+        offsets = numpy.repeat(self._edges[0::2] - (numpy.cumsum(lengths) - lengths), lengths)
+        return offsets + numpy.arange(self._revealed_count, dtype=EDGE_DTYPE)
+
+    def select_into(self, buffer, destination) -> int:
+        if not self._gathers():
+            return super(ArraySelection, self).select_into(buffer, destination)
+        source = numpy.frombuffer(buffer, dtype=numpy.uint8)
+        target = numpy.frombuffer(destination, dtype=numpy.uint8)
+        numpy.take(source, self._revealed_indices(), out=target[:self._revealed_count])
+        return self._revealed_count
+
+    def physical2virtual(self, pindex: int):
+        """ :return The number of revealed elements preceding the @pindex'th element, which must be revealed.
+        O(log(n)). """
+        i = int(numpy.searchsorted(self._edges, pindex, side='right'))
+        if i % 2 == 0:
+            raise IndexError("Physical index {} out of bounds for selection {}".format(pindex, self))
+        return self._revealed_before(pindex)
+
+    def virtual2physical(self, vindex: int):
+        """ :return the integer n such that where the @vindex'th revealed element is the nth element. If
+        @vindex < 0, @vindex is interpreted as (number of revealed elements) + @vindex. O(log(n)).
+        """
+        if vindex < 0:
+            vindex += len(self)
+        if not 0 <= vindex < len(self):
+            raise IndexError("Virtual index {} out of bounds for selection {}".format(vindex, self))
+        cumulative = self._cumulative_lengths()
+        k = int(numpy.searchsorted(cumulative, vindex, side='right'))
+        before = int(cumulative[k - 1]) if k > 0 else 0
+        return int(self._edges[2 * k]) + vindex - before
+
+    def virtual2physicalselection(self, vslice: slice) -> 'ArraySelection':
+        """ :return the sub-Selection that is the intersection of this selection and @vslice. """
+        a, b = slice(vslice.start, vslice.stop).indices(len(self))[:2]
+        if a >= b:
+            return self._from_edges(self.universe, numpy.empty(0, dtype=EDGE_DTYPE), 0)
+        return self.subslice(self.virtual2physical(a), self.virtual2physical(b - 1) + 1)
+
+    def virtualselection2physical(self, vselection: IGSlice) -> 'ArraySelection':
+        """ :return the sub-Selection that is the intersection of this selection and @vselection, whose integers are
+        virtual indices. Every interval of @vselection is mapped to the physical range spanning its first and last
+        integer, all at once, and the ranges are intersected with this selection. O((n + k)*log(n)) for k intervals,
+        in vectorized operations. """
+        if isinstance(vselection, ArraySelection):
+            vedges = vselection._edges
+        else:
+            vedges = numpy.array([x for pair in vselection.pairs() for x in pair], dtype=EDGE_DTYPE)
+        vedges = numpy.clip(vedges, 0, len(self)).reshape(-1, 2)
+        vedges = vedges[vedges[:, 0] < vedges[:, 1]]
+        if len(vedges) == 0:
+            return self._from_edges(self.universe, numpy.empty(0, dtype=EDGE_DTYPE), 0)
+        preceding = numpy.concatenate([[0], self._cumulative_lengths()])  # Virtual index of each interval start
+
+        def located(vindices: numpy.ndarray) -> numpy.ndarray:
+            k = numpy.searchsorted(preceding, vindices, side='right') - 1
+            return self._edges[2 * k] + vindices - preceding[k]
+
+        ranges = numpy.empty(2 * len(vedges), dtype=EDGE_DTYPE)
+        ranges[0::2] = located(vedges[:, 0])
+        ranges[1::2] = located(vedges[:, 1] - 1) + 1
+        return self._combined_edges(ranges, numpy.logical_and)
+
+    def __getitem__(self, item):
+        return self.virtual2physical(item)
+
+    def __len__(self):
+        return self._revealed_count
+
+    def __eq__(self, other):
+        if not isinstance(other, IGSlice):
+            return False
+        return self.universe == other.universe and list(self.pairs()) == list(other.pairs())
+
+    def _combined(self, other: IGSlice, predicate) -> 'ArraySelection':
+        """ :return The ArraySelection of every integer in the universe for which @predicate(x, y) is true, where x and y
+        are boolean arrays saying whether the integer is revealed in this selection and in @other respectively. """
+        if not isinstance(other, IGSlice):
+            return NotImplemented
+        if other.universe != self.universe:
+            raise ValueError("Cannot combine selections with universes {} and {}".format(self.universe, other.universe))
+        if isinstance(other, ArraySelection):
+            other_edges = other._edges
+        else:
+            other_edges = numpy.array([x for pair in other.pairs() for x in pair], dtype=EDGE_DTYPE)
+        return self._combined_edges(other_edges, predicate)
+
+    def _combined_edges(self, other_edges: numpy.ndarray, predicate) -> 'ArraySelection':
+        """ :return The ArraySelection of every integer for which @predicate(x, y) is true, where x and y are boolean
+        arrays saying whether the integer is revealed in this selection and in the intervals with edge array
+        @other_edges respectively. """
+        # Membership only changes at an edge of either operand, so evaluating the predicate there is enough
+        points = sorted_union(self._edges, other_edges)
+        inside = predicate(numpy.searchsorted(self._edges, points, side='right') % 2 == 1,
+                           numpy.searchsorted(other_edges, points, side='right') % 2 == 1)
+        changed = inside != numpy.concatenate([[False], inside[:-1]])
+        return self._from_edges(self.universe, points[changed].astype(EDGE_DTYPE, copy=False))
+
+    def __or__(self, other: IGSlice) -> 'ArraySelection':
+        return self._combined(other, numpy.logical_or)
+
+    def __and__(self, other: IGSlice) -> 'ArraySelection':
+        return self._combined(other, numpy.logical_and)
+
+    def __sub__(self, other: IGSlice) -> 'ArraySelection':
+        return self._combined(other, lambda x, y: x & ~y)
+
+    def __xor__(self, other: IGSlice) -> 'ArraySelection':
+        return self._combined(other, numpy.logical_xor)
+
+    def __mul__(self, other: int):
+        if other == 0:
+            return ArraySelection(universe=slice(0, 0), revealed=[])
+        scaled_universe = slice(self.universe.start * other, self.universe.stop * other)
+        return self._from_edges(scaled_universe, self._edges * other, self._revealed_count * other)
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __repr__(self):
+        return "{}(universe={}, revealed={})".format(self.__class__.__name__, self.universe, list(self.pairs()))
+
+    def __str__(self):
+        return repr(self)
+
+    def snapshot(self) -> 'ArraySelection':
+        """ :return A copy of this selection, made in O(1). Mutations never write to an edge array but replace it, so
+        the copy can share the edges with this selection indefinitely. """
+        copy = self._from_edges(self.universe, self._edges, self._revealed_count)
+        copy._cumulative = self._cumulative
+        copy._shared_memory = self._shared_memory
+        return copy
+
+    def __copy__(self):
+        return self.snapshot()
+
+    def __deepcopy__(self, memo):
+        return self.snapshot()
+
+    def deepcopy(self):
+        """ :return A deep copy of this object. """
+        return self.snapshot()
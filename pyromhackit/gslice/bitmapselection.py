@@ -0,0 +1,484 @@
+from typing import Optional, Union, List, Tuple, Iterator, Iterable, Dict
+
+import numpy
+
+from pyromhackit.gslice.arrayselection import ArraySelection, EDGE_DTYPE, merge_edges, normalized_range, batch2edges, \
+    sorted_union
+from pyromhackit.gslice.cursor import IntervalCursor
+from pyromhackit.gslice.delta import notifying, notifying_batch
+from pyromhackit.gslice.igslice import IGSlice
+from pyromhackit.gslice.imutablegslice import IMutableGSlice
+
+CHUNK_SIZE = 2 ** 16  # Number of integers covered by each container
+RUN_DTYPE = numpy.int32
+BITMAP_DTYPE = numpy.uint8
+# A container stores runs iff it has at most (container size) / RUN_LIMIT_DIVISOR runs. Each run takes 8 bytes, and the
+# bitmap one bit per integer, so this is the point where runs stop being the smaller of the two forms.
+RUN_LIMIT_DIVISOR = 64
+
+_POPCOUNT = numpy.array([bin(byte).count('1') for byte in range(256)], dtype=numpy.int64)
+_NO_RUNS = numpy.empty(0, dtype=RUN_DTYPE)
+
+# Each set operation is given as a function that works on boolean arrays and on packed bitmaps alike
+UNION = numpy.bitwise_or
+INTERSECTION = numpy.bitwise_and
+SYMMETRIC_DIFFERENCE = numpy.bitwise_xor
+
+
+def DIFFERENCE(x, y):
+    return x & ~y
+
+
+def _is_bitmap(container: numpy.ndarray) -> bool:
+    return container.dtype == BITMAP_DTYPE
+
+
+def _runs2mask(runs: numpy.ndarray, size: int) -> numpy.ndarray:
+    """ :return A boolean array of length @size which is true exactly on the runs with edges @runs. """
+    steps = numpy.zeros(size + 1, dtype=numpy.int64)
+    steps[runs[0::2]] += 1
+    steps[runs[1::2]] -= 1
+    return numpy.cumsum(steps[:-1]) > 0
+
+
+def _mask2runs(mask: numpy.ndarray) -> numpy.ndarray:
+    """ :return The edges [a0, b0, a1, b1, ...] of the runs of true values in the boolean array @mask. """
+    padded = numpy.concatenate([[False], mask, [False]])
+    return numpy.flatnonzero(padded[1:] != padded[:-1]).astype(RUN_DTYPE)
+
+
+def _mask(container: numpy.ndarray, size: int) -> numpy.ndarray:
+    if _is_bitmap(container):
+        return numpy.unpackbits(container, count=size).astype(bool)
+    return _runs2mask(container, size)
+
+
+def _bitmap(container: numpy.ndarray, size: int) -> numpy.ndarray:
+    if _is_bitmap(container):
+        return container
+    return numpy.packbits(_runs2mask(container, size))
+
+
+def _optimized(container: numpy.ndarray, size: int) -> numpy.ndarray:
+    """ :return @container in whichever of the run form and the bitmap form is the more compact. """
+    runs = _mask2runs(_mask(container, size)) if _is_bitmap(container) else container
+    if len(runs) // 2 <= size // RUN_LIMIT_DIVISOR:
+        return runs
+    return container if _is_bitmap(container) else _bitmap(container, size)
+
+
+def _cardinality(container: numpy.ndarray) -> int:
+    if _is_bitmap(container):
+        return int(_POPCOUNT[container].sum())
+    return int((container[1::2] - container[0::2]).sum())
+
+
+def _contains(container: numpy.ndarray, offset: int) -> bool:
+    if _is_bitmap(container):
+        return bool((container[offset // 8] >> (7 - offset % 8)) & 1)
+    return int(numpy.searchsorted(container, offset, side='right')) % 2 == 1
+
+
+def _rank(container: numpy.ndarray, offset: int) -> int:
+    """ :return The number of integers in @container less than @offset. """
+    if _is_bitmap(container):
+        full_bytes, remainder = divmod(offset, 8)
+        count = int(_POPCOUNT[container[:full_bytes]].sum())
+        if remainder:
+            count += int(_POPCOUNT[container[full_bytes] >> (8 - remainder)])
+        return count
+    starts, stops = container[0::2], container[1::2]
+    return int(numpy.clip(numpy.minimum(stops, offset) - starts, 0, None).sum())
+
+
+def _select(container: numpy.ndarray, k: int) -> int:
+    """ :return The @k'th smallest integer in @container, counting from 0. """
+    if _is_bitmap(container):
+        cumulative = numpy.cumsum(_POPCOUNT[container])
+        byte = int(numpy.searchsorted(cumulative, k, side='right'))
+        within = k - (int(cumulative[byte - 1]) if byte > 0 else 0)
+        return 8 * byte + int(numpy.flatnonzero(numpy.unpackbits(container[byte:byte + 1]))[within])
+    cumulative = numpy.cumsum(container[1::2] - container[0::2])
+    j = int(numpy.searchsorted(cumulative, k, side='right'))
+    return int(container[2 * j]) + k - (int(cumulative[j - 1]) if j > 0 else 0)
+
+
+def _combined(container1: numpy.ndarray, container2: numpy.ndarray, size: int, operation) -> numpy.ndarray:
+    """ :return The container holding every integer x for which @operation(x in @container1, x in @container2). """
+    if _is_bitmap(container1) or _is_bitmap(container2):
+        return _optimized(operation(_bitmap(container1, size), _bitmap(container2, size)), size)
+    points = sorted_union(container1, container2)
+    inside = operation(numpy.searchsorted(container1, points, side='right') % 2 == 1,
+                       numpy.searchsorted(container2, points, side='right') % 2 == 1)
+    changed = inside != numpy.concatenate([[False], inside[:-1]])
+    return _optimized(points[changed].astype(RUN_DTYPE), size)
+
+
+def _complemented(container: numpy.ndarray, size: int) -> numpy.ndarray:
+    if _is_bitmap(container):
+        complement = ~container
+        if size % 8:
+            complement[-1] &= 0xff << (8 - size % 8) & 0xff  # Padding bits stay clear
+        return complement
+    edges = numpy.concatenate([[0], container, [size]]).astype(RUN_DTYPE)
+    if len(container) and container[0] == 0:
+        edges = edges[2:]
+    if len(container) and container[-1] == size:
+        edges = edges[:-2]
+    return _optimized(edges, size)
+
+
+class BitmapSelection(IMutableGSlice):
+    """ Selection partitioned into chunks of CHUNK_SIZE integers, each stored in a container of one of two forms: a
+    sorted array of run edges, or a bitmap with one bit per integer. A container switches between the forms whenever it
+    changes, depending on which one is smaller. Unlike the edge-based selections, this stays compact when the selection
+    is extremely fragmented, e.g. when every other integer is revealed. Length is kept per container (counted by popcount
+    for bitmaps), which makes translating between physical and virtual indices O(number of chunks) at worst and set
+    operations a matter of combining containers pairwise. Mutations that are insensitive to density, such as
+    include_partially and include_expand, go through the edge representation in O(n). """
+
+    def __init__(
+            self,
+            universe: slice,
+            revealed: list = None,
+            intervals: Iterator = None,
+            _length: Optional[int] = None  # Unused, for signature compatibility with Selection
+    ):
+        """ @revealed and @intervals mean the same as for Selection. If neither is given, everything is revealed. """
+        self.universe = universe
+        self._assign_edges(ArraySelection(universe, revealed=revealed, intervals=intervals)._edges)
+
+    @classmethod
+    def _from_edges(cls, universe: slice, edges: numpy.ndarray, length: Optional[int] = None) -> 'BitmapSelection':
+        """ :return A BitmapSelection revealing the intervals of the edge array @edges, which must already be on the
+        canonical form used by ArraySelection. @length is unused, as the length is counted per chunk anyway. """
+        selection = cls.__new__(cls)
+        selection.universe = universe
+        selection._assign_edges(edges)
+        return selection
+
+    def _chunk_count(self) -> int:
+        return -(-self.universe.stop // CHUNK_SIZE)
+
+    def _chunk_size(self, i: int) -> int:
+        return min(CHUNK_SIZE, self.universe.stop - i * CHUNK_SIZE)
+
+    @staticmethod
+    def _chunked(edges: numpy.ndarray) -> Dict[int, numpy.ndarray]:
+        """ :return A dictionary mapping the index of every chunk that the intervals of the edge array @edges intersect
+        to the edges of those intervals relative to the start of the chunk, in run form. """
+        if len(edges) == 0:
+            return {}
+        # Cut every interval spanning a chunk boundary in two at that boundary
+        boundaries = numpy.arange(CHUNK_SIZE, edges[-1], CHUNK_SIZE, dtype=EDGE_DTYPE)
+        cuts = boundaries[numpy.searchsorted(edges, boundaries, side='right') % 2 == 1]
+        pairs = numpy.sort(numpy.concatenate([edges, cuts, cuts])).reshape(-1, 2)
+        pairs = pairs[pairs[:, 0] < pairs[:, 1]]
+        chunk_indices = pairs[:, 0] // CHUNK_SIZE
+        present, first = numpy.unique(chunk_indices, return_index=True)
+        last = numpy.append(first[1:], len(pairs))
+        return {int(i): (pairs[a:b] - i * CHUNK_SIZE).reshape(-1).astype(RUN_DTYPE)
+                for i, a, b in zip(present, first, last)}
+
+    def _assign_edges(self, edges: numpy.ndarray):
+        """ Replaces the revealed intervals with those of the edge array @edges. """
+        self._containers = [_NO_RUNS] * self._chunk_count()
+        for i, runs in self._chunked(edges).items():
+            self._containers[i] = _optimized(runs, self._chunk_size(i))
+        self._cardinalities = numpy.array([_cardinality(c) for c in self._containers], dtype=numpy.int64)
+        self._mutated()
+
+    def _mutated(self):
+        self._revealed_count = int(self._cardinalities.sum())
+        self._cumulative = None  # Cumulative cardinalities, computed on demand
+        self._edges = None  # Edge array, computed on demand
+
+    def _cumulative_cardinalities(self) -> numpy.ndarray:
+        if self._cumulative is None:
+            self._cumulative = numpy.cumsum(self._cardinalities)
+        return self._cumulative
+
+    def _edge_array(self) -> numpy.ndarray:
+        """ :return The edge array [a0, b0, a1, b1, ...] of the revealed intervals. """
+        if self._edges is None:
+            pieces = [(_mask2runs(_mask(c, self._chunk_size(i))) if _is_bitmap(c) else c).astype(EDGE_DTYPE)
+                      + i * CHUNK_SIZE for i, c in enumerate(self._containers) if len(c)]
+            edges = numpy.concatenate(pieces) if pieces else numpy.empty(0, dtype=EDGE_DTYPE)
+            self._edges = merge_edges(edges[0::2], edges[1::2])  # Joins runs that meet at a chunk boundary
+        return self._edges
+
+    def _as_array_selection(self) -> ArraySelection:
+        return ArraySelection._from_edges(self.universe, self._edge_array(), self._revealed_count)
+
+    def to_array(self) -> numpy.ndarray:
+        return self._edge_array().reshape(-1, 2).copy()
+
+    def to_mask(self, dtype=bool) -> numpy.ndarray:
+        """ See IGSlice.to_mask. Bitmap containers are unpacked as they are rather than going through their runs. """
+        masks = [_mask(c, self._chunk_size(i)) for i, c in enumerate(self._containers)]
+        return numpy.concatenate(masks).astype(dtype, copy=False) if masks else numpy.empty(0, dtype=dtype)
+
+    def container_kinds(self) -> List[str]:
+        """ :return For each chunk, 'bitmap' or 'runs' depending on the form its container currently has. """
+        return ['bitmap' if _is_bitmap(c) else 'runs' for c in self._containers]
+
+    def _apply(self, operand: Dict[int, numpy.ndarray], operation, untouched_cleared: bool = False) -> int:
+        """ Replaces each container C with the container of every x such that @operation(x in C, x in D), where D is the
+        container that @operand maps the chunk to. Chunks that @operand does not map are left as they are, unless
+        @untouched_cleared is true, in which case they are emptied.
+        :return The change in the number of revealed integers. """
+        original_length = self._revealed_count
+        for i, container in operand.items():
+            self._containers[i] = _combined(self._containers[i], container, self._chunk_size(i), operation)
+            self._cardinalities[i] = _cardinality(self._containers[i])
+        if untouched_cleared:
+            for i in range(self._chunk_count()):
+                if i not in operand:
+                    self._containers[i] = _NO_RUNS
+                    self._cardinalities[i] = 0
+        self._mutated()
+        return self._revealed_count - original_length
+
+    def _range_operand(self, from_index: Optional[int], to_index: Optional[int]) -> Dict[int, numpy.ndarray]:
+        a, b = normalized_range(self.universe, from_index, to_index)
+        return self._chunked(numpy.array([a, b], dtype=EDGE_DTYPE) if a < b else numpy.empty(0, dtype=EDGE_DTYPE))
+
+    def _batch_operand(self, intervals: Iterable[Tuple[Optional[int], Optional[int]]]) -> Dict[int, numpy.ndarray]:
+        return self._chunked(batch2edges(self.universe, intervals))
+
+    def _operand(self, other: IGSlice) -> Dict[int, numpy.ndarray]:
+        if isinstance(other, BitmapSelection):
+            return {i: c for i, c in enumerate(other._containers) if len(c)}
+        if isinstance(other, ArraySelection):
+            return self._chunked(other._edges)
+        return self._chunked(numpy.array([x for pair in other.pairs() for x in pair], dtype=EDGE_DTYPE))
+
+    def slices(self) -> List[slice]:
+        return [slice(a, b) for a, b in self.pairs()]
+
+    def pairs(self) -> Iterator[Tuple[int, int]]:
+        edges = self._edge_array().tolist()
+        return zip(edges[0::2], edges[1::2])
+
+    def gap_pairs(self) -> Iterator[Tuple[int, int]]:
+        return self.complement().pairs()
+
+    def intervals(self) -> numpy.ndarray:
+        """ :return A read-only (k, 2) array of the revealed intervals. """
+        view = self._edge_array().reshape(-1, 2)
+        view.flags.writeable = False
+        return view
+
+    @notifying
+    def include(self, from_index: Optional[int], to_index: Optional[int]):
+        return self._apply(self._range_operand(from_index, to_index), UNION)
+
+    @notifying
+    def exclude(self, from_index: Optional[int], to_index: Optional[int]):
+        return -self._apply(self._range_operand(from_index, to_index), DIFFERENCE)
+
+    @notifying_batch
+    def include_many(self, intervals: Iterable[Tuple[Optional[int], Optional[int]]]):
+        return self._apply(self._batch_operand(intervals), UNION)
+
+    @notifying_batch
+    def exclude_many(self, intervals: Iterable[Tuple[Optional[int], Optional[int]]]):
+        return -self._apply(self._batch_operand(intervals), DIFFERENCE)
+
+    def _delegated(self, method: str, *args):
+        """ Performs the mutation @method on the edge representation of this selection. O(n). """
+        array_selection = self._as_array_selection()
+        result = getattr(array_selection, method)(*args)
+        self._assign_edges(array_selection._edges)
+        return result
+
+    @notifying
+    def include_partially(self, from_index: Optional[int], to_index: Optional[int], count: Union[int, tuple]):
+        return self._delegated('include_partially', from_index, to_index, count)
+
+    @notifying
+    def include_expand(self, from_index: Optional[int], to_index: Optional[int], count: Union[int, Tuple[int, int]]):
+        return self._delegated('include_expand', from_index, to_index, count)
+
+    def cursor(self, pindex: Optional[int] = None) -> IntervalCursor:
+        edges = self._edge_array()
+        return IntervalCursor(self, len(edges), lambda i, j: edges[i:j].tolist(),
+                              lambda p: int(numpy.searchsorted(edges, p, side='right')), pindex)
+
+    def _virtual_range2physical(self, from_index: Optional[int], to_index: Optional[int]) -> Tuple[Optional[int], ...]:
+        p_from_index = None
+        if from_index is not None and -len(self) <= from_index < len(self):
+            p_from_index = self.virtual2physical(from_index)
+        p_to_index = None
+        if to_index is not None and -len(self) <= to_index < len(self):
+            p_to_index = self.virtual2physical(to_index)
+        return p_from_index, p_to_index
+
+    def include_virtual(self, from_index: Optional[int], to_index: Optional[int]):
+        return self.include(*self._virtual_range2physical(from_index, to_index))
+
+    def include_partially_virtual(self, from_index: Optional[int], to_index: Optional[int], count: Union[int, tuple]):
+        return self.include_partially(*self._virtual_range2physical(from_index, to_index), count)
+
+    def exclude_virtual(self, from_index: Optional[int], to_index: Optional[int]):
+        return self.exclude(*self._virtual_range2physical(from_index, to_index))
+
+    def __iter__(self):
+        return self.pairs()
+
+    def complement(self) -> 'BitmapSelection':
+        complement = self.snapshot()
+        for i, container in enumerate(self._containers):
+            size = self._chunk_size(i)
+            complement._containers[i] = _complemented(container, size)
+            complement._cardinalities[i] = size - self._cardinalities[i]
+        complement._mutated()
+        return complement
+
+    def subslice(self, from_index: Optional[int], to_index: Optional[int]) -> 'BitmapSelection':
+        a, b = slice(from_index, to_index).indices(self.universe.stop)[:2]
+        subslice = self.snapshot()
+        subslice._apply(self._range_operand(a, max(a, b)), INTERSECTION, untouched_cleared=True)
+        return subslice
+
+    def _revealed_before(self, pindex: int) -> int:
+        """ :return The number of revealed integers less than @pindex. """
+        i, offset = divmod(pindex, CHUNK_SIZE)
+        if i >= len(self._containers):
+            return self._revealed_count
+        before = int(self._cumulative_cardinalities()[i - 1]) if i > 0 else 0
+        return before + _rank(self._containers[i], offset)
+
+    def count_revealed(self, from_index: Optional[int], to_index: Optional[int]) -> int:
+        """ :return The number of revealed elements in [@from_index, @to_index). """
+        a, b = normalized_range(self.universe, from_index, to_index)
+        if a >= b:
+            return 0
+        return self._revealed_before(b) - self._revealed_before(a)
+
+    def select(self, listlike):
+        """ :return The elements of @listlike that this selection reveals. A bytes-like @listlike is gathered chunk by
+        chunk into a single bytearray of len(self) bytes, which is returned as is, so every byte is copied once. """
+        try:
+            numpy.frombuffer(listlike, dtype=numpy.uint8)
+        except TypeError:  # Not a bytes-like object
+            return listlike[0:0].join(listlike[a:b] for a, b in self.pairs())
+        destination = bytearray(len(self))
+        self.select_into(listlike, destination)
+        return destination
+
+    def select_into(self, buffer, destination) -> int:
+        """ Copies the bytes of the bytes-like @buffer that this selection reveals to the start of the writable
+        bytes-like @destination, which must hold at least len(self) bytes.
+        :return The number of bytes copied. """
+        source = numpy.frombuffer(buffer, dtype=numpy.uint8)
+        target = numpy.frombuffer(destination, dtype=numpy.uint8)
+        offset = 0
+        for i, container in enumerate(self._containers):
+            base = i * CHUNK_SIZE
+            if _is_bitmap(container):
+                size = self._chunk_size(i)
+                count = int(self._cardinalities[i])
+                numpy.compress(_mask(container, size), source[base:base + size], out=target[offset:offset + count])
+                offset += count
+            else:
+                for a, b in container.reshape(-1, 2).tolist():
+                    target[offset:offset + b - a] = source[base + a:base + b]
+                    offset += b - a
+        return offset
+
+    def physical2virtual(self, pindex: int):
+        """ :return The number of revealed elements preceding the @pindex'th element, which must be revealed. """
+        i, offset = divmod(pindex, CHUNK_SIZE)
+        if not 0 <= pindex < self.universe.stop or not _contains(self._containers[i], offset):
+            raise IndexError("Physical index {} out of bounds for selection {}".format(pindex, self))
+        return self._revealed_before(pindex)
+
+    def virtual2physical(self, vindex: int):
+        """ :return the integer n such that where the @vindex'th revealed element is the nth element. If
+        @vindex < 0, @vindex is interpreted as (number of revealed elements) + @vindex. """
+        if vindex < 0:
+            vindex += len(self)
+        if not 0 <= vindex < len(self):
+            raise IndexError("Virtual index {} out of bounds for selection {}".format(vindex, self))
+        cumulative = self._cumulative_cardinalities()
+        i = int(numpy.searchsorted(cumulative, vindex, side='right'))
+        before = int(cumulative[i - 1]) if i > 0 else 0
+        return i * CHUNK_SIZE + _select(self._containers[i], vindex - before)
+
+    def virtual2physicalselection(self, vslice: slice) -> 'BitmapSelection':
+        """ :return the sub-Selection that is the intersection of this selection and @vslice. """
+        return self._from_edges(self.universe, self._as_array_selection().virtual2physicalselection(vslice)._edges)
+
+    def virtualselection2physical(self, vselection: IGSlice) -> 'BitmapSelection':
+        """ :return the sub-Selection that is the intersection of this selection and @vselection. """
+        return self._from_edges(self.universe, self._as_array_selection().virtualselection2physical(vselection)._edges)
+
+    def __getitem__(self, item):
+        return self.virtual2physical(item)
+
+    def __len__(self):
+        return self._revealed_count
+
+    def __eq__(self, other):
+        if not isinstance(other, IGSlice):
+            return False
+        return self.universe == other.universe and list(self.pairs()) == list(other.pairs())
+
+    def _combined_with(self, other: IGSlice, operation) -> 'BitmapSelection':
+        if not isinstance(other, IGSlice):
+            return NotImplemented
+        if other.universe != self.universe:
+            raise ValueError("Cannot combine selections with universes {} and {}".format(self.universe, other.universe))
+        result = self.snapshot()
+        result._apply(self._operand(other), operation, untouched_cleared=operation is INTERSECTION)
+        return result
+
+    def __or__(self, other: IGSlice) -> 'BitmapSelection':
+        return self._combined_with(other, UNION)
+
+    def __and__(self, other: IGSlice) -> 'BitmapSelection':
+        return self._combined_with(other, INTERSECTION)
+
+    def __sub__(self, other: IGSlice) -> 'BitmapSelection':
+        return self._combined_with(other, DIFFERENCE)
+
+    def __xor__(self, other: IGSlice) -> 'BitmapSelection':
+        return self._combined_with(other, SYMMETRIC_DIFFERENCE)
+
+    def __mul__(self, other: int):
+        if other == 0:
+            return BitmapSelection(universe=slice(0, 0), revealed=[])
+        scaled_universe = slice(self.universe.start * other, self.universe.stop * other)
+        return self._from_edges(scaled_universe, self._edge_array() * other)
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __repr__(self):
+        return "{}(universe={}, revealed={})".format(self.__class__.__name__, self.universe, list(self.pairs()))
+
+    def __str__(self):
+        return repr(self)
+
+    def snapshot(self) -> 'BitmapSelection':
+        """ :return A copy of this selection. Containers are never written to but replaced, so the copy shares them with
+        this selection and only the list of containers is copied. O(number of chunks). """
+        copy = BitmapSelection.__new__(BitmapSelection)
+        copy.universe = self.universe
+        copy._containers = list(self._containers)
+        copy._cardinalities = self._cardinalities.copy()
+        copy._revealed_count = self._revealed_count
+        copy._cumulative = self._cumulative
+        copy._edges = self._edges
+        return copy
+
+    def __copy__(self):
+        return self.snapshot()
+
+    def __deepcopy__(self, memo):
+        return self.snapshot()
+
+    def deepcopy(self):
+        """ :return A deep copy of this object. """
+        return self.snapshot()
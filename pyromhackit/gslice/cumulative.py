@@ -0,0 +1,182 @@
+import random
+from typing import Iterable, Optional, Tuple
+
+
+class _Node(object):
+    __slots__ = ('key', 'priority', 'left', 'right', 'size', 'alternating_sum')
+
+    def __init__(self, key: int, priority: float):
+        self.key = key
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.size = 1
+        self.alternating_sum = key
+
+
+def _size(node: Optional[_Node]) -> int:
+    return node.size if node is not None else 0
+
+
+def _sign(count: int) -> int:
+    """ :return The sign of the element at position @count in an alternating sum, i.e. +1 if @count is even, otherwise
+    -1. """
+    return -1 if count & 1 else 1
+
+
+def _update(node: _Node):
+    """ Recomputes the augmented data of @node from that of its children. """
+    left_size = _size(node.left)
+    alternating_sum = node.left.alternating_sum if node.left is not None else 0
+    alternating_sum += _sign(left_size) * node.key
+    if node.right is not None:
+        alternating_sum += _sign(left_size + 1) * node.right.alternating_sum
+    node.size = left_size + 1 + _size(node.right)
+    node.alternating_sum = alternating_sum
+
+
+def _split(node: Optional[_Node], key: int, inclusive: bool) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """ :return A pair (L, R) of treaps such that L holds every key in @node less than @key (or less than or equal to
+    @key if @inclusive) and R holds the rest. """
+    if node is None:
+        return None, None
+    if node.key < key or inclusive and node.key == key:
+        node.right, right = _split(node.right, key, inclusive)
+        _update(node)
+        return node, right
+    left, node.left = _split(node.left, key, inclusive)
+    _update(node)
+    return left, node
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    """ :return The treap holding every key in @left followed by every key in @right. Every key in @left must be less
+    than every key in @right. """
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+def _build(keys: Iterable[int]) -> Optional[_Node]:
+    """ :return A treap holding the ascending sequence of integers @keys, built in O(n). """
+    stack = []
+    for key in keys:
+        node = _Node(key, random.random())
+        last = None
+        while stack and stack[-1].priority < node.priority:
+            last = stack.pop()
+        node.left = last
+        if stack:
+            stack[-1].right = node
+        stack.append(node)
+    if not stack:
+        return None
+    root = stack[0]
+    # Post-order traversal to compute the augmented data bottom-up
+    pending = [(root, False)]
+    while pending:
+        node, children_done = pending.pop()
+        if children_done:
+            _update(node)
+            continue
+        pending.append((node, True))
+        if node.right is not None:
+            pending.append((node.right, False))
+        if node.left is not None:
+            pending.append((node.left, False))
+    return root
+
+
+class CumulativeLengthIndex(object):
+    """ Order-statistics tree over the interval edges of a Selection, augmented with the alternating sum of the edges.
+    The alternating sum of the first k edges is what the number of revealed integers preceding the kth edge is derived
+    from, so it lets a Selection translate between physical and virtual indices in O(log(n)) rather than walking every
+    interval. The index is kept in sync by replacing the edges in the range that an include/exclude touched. """
+
+    def __init__(self, edges: Iterable[int]):
+        """ @edges is the ascending sequence of interval edges, using the same convention as Selection._intervals: if
+        there is an odd number of edges, the first interval starts at 0. """
+        self._root = _build(edges)
+
+    def __len__(self):
+        return _size(self._root)
+
+    def replace(self, from_index: int, to_index: int, edges: Iterable[int]):
+        """ Replaces every edge e in the index such that @from_index <= e <= @to_index with the ascending sequence of
+        edges @edges, each of which must lie within the same range. O(log(n) + k), k = number of edges replaced. """
+        left, rest = _split(self._root, from_index, inclusive=False)
+        _, right = _split(rest, to_index, inclusive=True)
+        self._root = _merge(_merge(left, _build(edges)), right)
+
+    def _prefix(self, pindex: int) -> Tuple[int, int]:
+        """ :return A pair (k, s) where k is the number of edges less than or equal to @pindex and s is the alternating
+        sum of those edges. """
+        count = 0
+        alternating_sum = 0
+        node = self._root
+        while node is not None:
+            if node.key <= pindex:
+                if node.left is not None:
+                    alternating_sum += _sign(count) * node.left.alternating_sum
+                    count += node.left.size
+                alternating_sum += _sign(count) * node.key
+                count += 1
+                node = node.right
+            else:
+                node = node.left
+        return count, alternating_sum
+
+    def _revealed_before(self, pindex: int, count: int, alternating_sum: int) -> int:
+        """ :return The number of revealed integers less than @pindex, given that @count edges are less than or equal to
+        @pindex and that their alternating sum is @alternating_sum. """
+        if len(self) % 2 == 0:
+            return pindex * (count % 2) - alternating_sum
+        return pindex * ((count + 1) % 2) + alternating_sum
+
+    def is_revealed(self, pindex: int) -> bool:
+        """ :return True iff the integer @pindex lies on a revealed interval. """
+        count, _ = self._prefix(pindex)
+        return (count + len(self)) % 2 == 1
+
+    def revealed_before(self, pindex: int) -> int:
+        """ :return The number of revealed integers less than @pindex. O(log(n)). """
+        count, alternating_sum = self._prefix(pindex)
+        return self._revealed_before(pindex, count, alternating_sum)
+
+    def physical(self, vindex: int) -> Optional[int]:
+        """ :return The integer n such that n is revealed and exactly @vindex revealed integers are less than n, or None
+        if there are not that many revealed integers. O(log(n)). """
+        if vindex < 0:
+            return None
+        # Descend to the leftmost edge e such that more than @vindex revealed integers are less than e. Such an edge is
+        # necessarily the stop of the interval that the sought integer lies on.
+        count = 0
+        alternating_sum = 0
+        node = self._root
+        found = None
+        while node is not None:
+            node_count = count
+            node_sum = alternating_sum
+            if node.left is not None:
+                node_sum += _sign(node_count) * node.left.alternating_sum
+                node_count += node.left.size
+            node_sum += _sign(node_count) * node.key
+            node_count += 1
+            if self._revealed_before(node.key, node_count, node_sum) > vindex:
+                found = (node.key, node_count, node_sum)
+                node = node.left
+            else:
+                count, alternating_sum = node_count, node_sum
+                node = node.right
+        if found is None:
+            return None
+        stop, stop_count, stop_sum = found
+        return stop - (self._revealed_before(stop, stop_count, stop_sum) - vindex)
@@ -0,0 +1,162 @@
+from typing import Callable, List, Optional, Tuple
+
+
+class IntervalCursor(object):
+    """ A position on the sequence of alternating revealed and covered runs (maximal intervals) that a selection
+    partitions its universe into. The cursor is on exactly one run at a time and steps to the neighbouring runs in O(1)
+    amortized time, which makes walking k runs O(log(n) + k) rather than the O(n) of materializing the complement.
+
+    The cursor reads the interval edges of the selection lazily, a block at a time. A cursor on a Selection is
+    invalidated when the selection is mutated, whereas one on an ArraySelection or BitmapSelection keeps seeing the
+    selection as it was when the cursor was created, since those never modify their edge arrays in place. """
+
+    BLOCK_SIZE = 64  # Number of edges fetched at a time
+
+    def __init__(
+            self,
+            selection,
+            edge_count: int,
+            fetch: Callable[[int, int], List[int]],
+            bisect: Callable[[int], int],
+            pindex: Optional[int] = None
+    ):
+        """ @selection has the ascending interval edges E = [a0, b0, a1, b1, ...] in which every interval start is
+        explicit. @edge_count is the length of E, @fetch(i, j) returns E[i:j] and @bisect(p) returns the number of edges
+        in E that are less than or equal to p. The cursor starts out on the run containing @pindex or, if @pindex is
+        None, on the first run. """
+        self._selection = selection
+        self._universe = selection.universe
+        self._edge_count = edge_count
+        self._fetch = fetch
+        self._bisect = bisect
+        self._block_start = 0
+        self._block = []
+        # The runs are [B[j], B[j+1]) for 0 <= j <= len(E), where B = [universe start] + E + [universe stop]. Run j is
+        # revealed iff j is odd. Only the first and last of them can be empty.
+        self._run = 0
+        if pindex is not None:
+            self.seek(pindex)
+        elif self._universe.start < self._universe.stop:
+            self.seek(self._universe.start)
+
+    def _edge(self, k: int) -> int:
+        """ :return E[@k]. """
+        if not self._block_start <= k < self._block_start + len(self._block):
+            self._block_start = max(0, k - self.BLOCK_SIZE // 2)  # Centered, as the cursor may go either way
+            self._block = self._fetch(self._block_start, min(self._edge_count, self._block_start + self.BLOCK_SIZE))
+        return self._block[k - self._block_start]
+
+    def _boundary(self, j: int) -> int:
+        """ :return B[@j]. """
+        if j == 0:
+            return self._universe.start
+        if j == self._edge_count + 1:
+            return self._universe.stop
+        return self._edge(j - 1)
+
+    def _is_empty(self, j: int) -> bool:
+        return self._boundary(j) == self._boundary(j + 1)
+
+    @property
+    def start(self) -> int:
+        """ :return The first integer of the current run. """
+        return self._boundary(self._run)
+
+    @property
+    def stop(self) -> int:
+        """ :return The integer following the last integer of the current run. """
+        return self._boundary(self._run + 1)
+
+    @property
+    def pair(self) -> Tuple[int, int]:
+        """ :return The pair (a, b) of the current run [a, b). """
+        return self.start, self.stop
+
+    @property
+    def revealed(self) -> bool:
+        """ :return True iff the current run is revealed. """
+        return self._run % 2 == 1
+
+    def has_next(self) -> bool:
+        j = self._run + 1
+        return j <= self._edge_count and not self._is_empty(j)
+
+    def has_previous(self) -> bool:
+        j = self._run - 1
+        return j >= 0 and not self._is_empty(j)
+
+    def next_run(self) -> Tuple[int, int]:
+        """ Moves the cursor to the run immediately to the right of the current one. O(1) amortized.
+        :return The pair (a, b) of the run [a, b) moved to.
+        :raise IndexError if the current run is the last one. """
+        if not self.has_next():
+            raise IndexError("There is no run to the right of {}.".format(self.pair))
+        self._run += 1
+        return self.pair
+
+    def previous_run(self) -> Tuple[int, int]:
+        """ Moves the cursor to the run immediately to the left of the current one. O(1) amortized.
+        :return The pair (a, b) of the run [a, b) moved to.
+        :raise IndexError if the current run is the first one. """
+        if not self.has_previous():
+            raise IndexError("There is no run to the left of {}.".format(self.pair))
+        self._run -= 1
+        return self.pair
+
+    def _next_of_kind(self, revealed: bool) -> Tuple[int, int]:
+        original_run = self._run
+        try:
+            self.next_run()
+            if self.revealed != revealed:  # Runs alternate, so the one after this is of the right kind
+                self.next_run()
+        except IndexError:
+            self._run = original_run
+            raise
+        return self.pair
+
+    def _previous_of_kind(self, revealed: bool) -> Tuple[int, int]:
+        original_run = self._run
+        try:
+            self.previous_run()
+            if self.revealed != revealed:
+                self.previous_run()
+        except IndexError:
+            self._run = original_run
+            raise
+        return self.pair
+
+    def next_revealed(self) -> Tuple[int, int]:
+        """ Moves the cursor to the first revealed run to the right of the current one. O(1) amortized.
+        :raise IndexError if there is none, in which case the cursor stays where it is. """
+        return self._next_of_kind(True)
+
+    def next_covered(self) -> Tuple[int, int]:
+        """ Moves the cursor to the first covered run to the right of the current one. O(1) amortized.
+        :raise IndexError if there is none, in which case the cursor stays where it is. """
+        return self._next_of_kind(False)
+
+    def previous_revealed(self) -> Tuple[int, int]:
+        """ Moves the cursor to the last revealed run to the left of the current one. O(1) amortized.
+        :raise IndexError if there is none, in which case the cursor stays where it is. """
+        return self._previous_of_kind(True)
+
+    def previous_covered(self) -> Tuple[int, int]:
+        """ Moves the cursor to the last covered run to the left of the current one. O(1) amortized.
+        :raise IndexError if there is none, in which case the cursor stays where it is. """
+        return self._previous_of_kind(False)
+
+    def seek(self, pindex: int) -> Tuple[int, int]:
+        """ Moves the cursor to the run containing the physical index @pindex. O(log(n)).
+        :return The pair (a, b) of the run [a, b) moved to. """
+        if not self._universe.start <= pindex < self._universe.stop:
+            raise IndexError("Physical index {} out of bounds for universe {}".format(pindex, self._universe))
+        self._run = self._bisect(pindex)
+        return self.pair
+
+    def seek_virtual(self, vindex: int) -> Tuple[int, int]:
+        """ Moves the cursor to the revealed run containing the @vindex'th revealed integer. O(log(n)).
+        :return The pair (a, b) of the run [a, b) moved to. """
+        return self.seek(self._selection.virtual2physical(vindex))
+
+    def __repr__(self):
+        return "{}({}, {}, revealed={})".format(self.__class__.__name__, self.start, self.stop, self.revealed)
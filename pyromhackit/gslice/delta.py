@@ -0,0 +1,83 @@
+""" Change notifications for mutable generalized slices. A mutation that changes a selection emits a SelectionDelta to
+the listeners registered on it, so that anything derived from the selection can update the changed ranges only. """
+
+import functools
+from collections import namedtuple
+from typing import Iterable, List, Optional, Tuple
+
+
+def subtracted(pairs: Iterable[Tuple[int, int]], removals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """ :return The ranges [a, b) in @pairs with every range in @removals cut out of them. Both must be ascending lists
+    of disjoint pairs. O(n + k). """
+    result = []
+    j = 0
+    for a, b in pairs:
+        while j < len(removals) and removals[j][1] <= a:
+            j += 1
+        while j < len(removals) and removals[j][0] < b:
+            c, d = removals[j]
+            if a < c:
+                result.append((a, c))
+            a = max(a, d)
+            if d > b:  # The removal may reach into the next pair
+                break
+            j += 1
+        if a < b:
+            result.append((a, b))
+    return result
+
+
+class SelectionDelta(namedtuple("SelectionDelta", "revealed covered")):
+    """ The change made to a selection by one mutation: @revealed is the ascending list of pairs (a, b) of the physical
+    ranges [a, b) that became revealed and @covered that of the ranges that became covered. """
+
+    @classmethod
+    def between(cls, before: List[Tuple[int, int]], after: List[Tuple[int, int]]) -> 'SelectionDelta':
+        """ :return The delta that turns the revealed pairs @before into the revealed pairs @after. O(n + m). """
+        return cls(revealed=subtracted(after, before), covered=subtracted(before, after))
+
+    def __bool__(self):
+        return bool(self.revealed or self.covered)
+
+
+def _argument_window(selection, from_index: Optional[int], to_index: Optional[int], *_) -> Tuple[Optional[int], ...]:
+    return from_index, to_index
+
+
+def _universe_window(selection, *_) -> Tuple[Optional[int], ...]:
+    return None, None
+
+
+def _notifier(window):
+    """ :return A decorator for the mutators of an IMutableGSlice. If any listener is registered on the selection, the
+    revealed pairs within the physical range [a, b) are read before and after the mutation, where (a, b) =
+    @window(selection, *arguments) must enclose every integer the mutation may change, and the difference is sent to
+    each listener. Reading k pairs through a view of the range costs O(log(n) + k), and nothing at all while no listener
+    is registered. Only the outermost of nested mutations notifies, so a mutator built on others emits a single delta.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args):
+            if not self._listeners or self._notifying:
+                return method(self, *args)
+            from_index, to_index = window(self, *args)
+            before = list(self.subslice_view(from_index, to_index).pairs())
+            self._notifying = True
+            try:
+                result = method(self, *args)
+            finally:
+                self._notifying = False
+            if result:
+                delta = SelectionDelta.between(before, list(self.subslice_view(from_index, to_index).pairs()))
+                for listener in self._listeners:
+                    listener(delta)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+notifying = _notifier(_argument_window)  # For mutators f(self, from_index, to_index, ...) confined to that range
+notifying_batch = _notifier(_universe_window)  # For mutators that may change anything, such as include_many
@@ -0,0 +1,56 @@
+""" Vectorized operations on edge arrays, i.e. ascending arrays [a0, b0, a1, b1, ...] of interval edges in which every
+interval start is explicit, and conversions between them and per-integer masks. """
+
+import numpy
+
+EDGE_DTYPE = numpy.int64
+
+
+def merge_edges(starts: numpy.ndarray, stops: numpy.ndarray) -> numpy.ndarray:
+    """ :return The edge array [a0, b0, a1, b1, ...] of the union of the intervals [@starts[i], @stops[i]), in which
+    every interval is non-empty and no two intervals overlap or touch. The input intervals may be in any order and may
+    overlap. O(n*log(n)). """
+    starts = numpy.asarray(starts, dtype=EDGE_DTYPE)
+    stops = numpy.asarray(stops, dtype=EDGE_DTYPE)
+    nonempty = starts < stops
+    starts = starts[nonempty]
+    stops = stops[nonempty]
+    if len(starts) == 0:
+        return numpy.empty(0, dtype=EDGE_DTYPE)
+    order = numpy.argsort(starts, kind='stable')
+    starts = starts[order]
+    stops = numpy.maximum.accumulate(stops[order])
+    # An interval begins a new run iff it starts after every interval preceding it has stopped
+    is_first = numpy.empty(len(starts), dtype=bool)
+    is_first[0] = True
+    is_first[1:] = starts[1:] > stops[:-1]
+    is_last = numpy.empty(len(starts), dtype=bool)
+    is_last[:-1] = is_first[1:]
+    is_last[-1] = True
+    edges = numpy.empty(2 * int(is_first.sum()), dtype=EDGE_DTYPE)
+    edges[0::2] = starts[is_first]
+    edges[1::2] = stops[is_last]
+    return edges
+
+
+def edges2mask(universe: slice, edges: numpy.ndarray, dtype=bool) -> numpy.ndarray:
+    """ :return An array with one element per integer of @universe which is 1 (or True) for the integers in the
+    intervals with the ascending edges @edges, in which every interval start is explicit, and 0 (or False) for the
+    others. The array is built from the run lengths in a single numpy.repeat. """
+    boundaries = numpy.concatenate([[universe.start], edges, [universe.stop]]).astype(EDGE_DTYPE, copy=False)
+    values = numpy.arange(len(boundaries) - 1) % 2 == 1  # Runs alternate between covered and revealed
+    return numpy.repeat(values.astype(dtype), numpy.diff(boundaries))
+
+
+def mask2edges(mask: numpy.ndarray) -> numpy.ndarray:
+    """ :return The ascending edges, every interval start explicit, of the runs of nonzero (or True) elements in the
+    one-dimensional array @mask, relative to its beginning. """
+    mask = numpy.asarray(mask)
+    if mask.dtype != bool:
+        mask = mask != 0
+    if len(mask) == 0:
+        return numpy.empty(0, dtype=EDGE_DTYPE)
+    changes = numpy.flatnonzero(numpy.diff(mask)) + 1  # Where a run ends and the next begins
+    head = [0] if mask[0] else []
+    tail = [len(mask)] if mask[-1] else []
+    return numpy.concatenate([head, changes, tail]).astype(EDGE_DTYPE, copy=False)
@@ -0,0 +1,53 @@
+from typing import Iterator, Optional, Union
+
+import numpy
+
+from pyromhackit.gslice.arrayselection import ArraySelection, EDGE_DTYPE
+from pyromhackit.gslice.bitmapselection import BitmapSelection
+from pyromhackit.gslice.edges import mask2edges
+from pyromhackit.gslice.selection import Selection
+
+ARRAY_UNIVERSE_THRESHOLD = 2 ** 24  # Universes at least this large are backed by an ArraySelection
+ARRAY_INTERVAL_THRESHOLD = 2 ** 14  # As are selections starting out with at least this many intervals
+# ...unless their intervals are so many that there are fewer than this many integers per interval on average, in which
+# case they are backed by a BitmapSelection
+BITMAP_FRAGMENTATION_THRESHOLD = 64
+
+
+def _implementation(universe: slice, interval_count: int) -> type:
+    """ :return The selection class best suited to a selection of @universe with @interval_count intervals. """
+    size = universe.stop - universe.start
+    if interval_count >= ARRAY_INTERVAL_THRESHOLD and size < BITMAP_FRAGMENTATION_THRESHOLD * interval_count:
+        return BitmapSelection
+    if size >= ARRAY_UNIVERSE_THRESHOLD or interval_count >= ARRAY_INTERVAL_THRESHOLD:
+        return ArraySelection
+    return Selection
+
+
+def make_selection(universe: slice, revealed: list = None,
+                   intervals: Iterator = None) -> Union[Selection, ArraySelection, BitmapSelection]:
+    """ :return A Selection of @universe revealing @revealed or @intervals (see Selection.__init__), backed by whichever
+    implementation suits its size. Large selections use the NumPy array-backed ArraySelection, which costs about 16
+    bytes per interval rather than several hundred, while small ones use the SortedSet-backed Selection, whose mutations
+    are cheaper. Extremely fragmented selections use the BitmapSelection, which falls back on one bit per integer. """
+    if intervals is not None:
+        intervals = list(intervals)
+        interval_count = len(intervals) // 2
+    else:
+        interval_count = len(revealed) if revealed is not None else 1
+    return _implementation(universe, interval_count)(universe, revealed=revealed, intervals=intervals)
+
+
+def selection_from_edges(universe: slice, edges: numpy.ndarray,
+                         length: Optional[int] = None) -> Union[Selection, ArraySelection, BitmapSelection]:
+    """ :return The selection of @universe whose intervals have the ascending edges @edges, in which every interval
+    start is explicit, backed by whichever implementation suits its size. @length is the number of revealed integers,
+    if known. """
+    edges = numpy.asarray(edges, dtype=EDGE_DTYPE)
+    return _implementation(universe, len(edges) // 2)._from_edges(universe, edges, length)
+
+
+def selection_from_mask(mask) -> Union[Selection, ArraySelection, BitmapSelection]:
+    """ :return The selection of [0, len(@mask)) revealing the integers at which the array @mask is nonzero (or True),
+    backed by whichever implementation suits its size. """
+    return selection_from_edges(slice(0, len(mask)), mask2edges(mask))
@@ -1,5 +1,11 @@
+import bisect
 from abc import ABCMeta, abstractmethod
-from typing import Optional
+from typing import Iterator, Optional, Tuple
+
+import numpy
+
+from pyromhackit.gslice.cursor import IntervalCursor
+from pyromhackit.gslice.edges import EDGE_DTYPE, edges2mask
 
 
 class IGSlice(metaclass=ABCMeta):
@@ -18,6 +24,46 @@ class IGSlice(metaclass=ABCMeta):
         """ :return A sequence of pairs (a, b) such that for every a <= n < b, n is contained in this IGSlice. """
         raise NotImplementedError
 
+    def pairs(self) -> Iterator[Tuple[int, int]]:
+        """ :return An iterator over the pairs (a, b) of the maximal intervals [a, b) contained in this IGSlice, in
+        ascending order. """
+        raise NotImplementedError
+
+    def to_array(self) -> numpy.ndarray:
+        """ :return A new (k, 2) int64 array whose rows are the pairs (a, b) of the maximal intervals [a, b) contained in
+        this IGSlice, in ascending order. """
+        return numpy.array(list(self.pairs()), dtype=EDGE_DTYPE).reshape(-1, 2)
+
+    def to_mask(self, dtype=bool) -> numpy.ndarray:
+        """ :return A new array with one element of type @dtype per integer of the universe, which is 1 (or True) if the
+        integer is contained in this IGSlice and 0 (or False) otherwise. O(n + universe size), vectorized. """
+        return edges2mask(self.universe, self.to_array().reshape(-1), dtype)
+
+    def cursor(self, pindex: Optional[int] = None) -> IntervalCursor:
+        """ :return A cursor on the run of revealed or covered integers containing @pindex, or on the first run if
+        @pindex is None. See IntervalCursor. """
+        edges = [x for pair in self.pairs() for x in pair]
+        return IntervalCursor(self, len(edges), lambda i, j: edges[i:j], lambda p: bisect.bisect_right(edges, p), pindex)
+
+    def iter_segments(self, buffer) -> Iterator[memoryview]:
+        """ :return An iterator over memoryviews of the segments of the bytes-like object @buffer (e.g. an mmap) that
+        this IGSlice selects, in order. Nothing is copied, but @buffer cannot be resized or closed while any of the views
+        are alive. """
+        view = memoryview(buffer)
+        for a, b in self.pairs():
+            yield view[a:b]
+
+    def select_into(self, buffer, destination) -> int:
+        """ Writes the bytes of the bytes-like object @buffer that this IGSlice selects into the writable bytes-like
+        object @destination (e.g. a bytearray), starting at its beginning, copying every byte exactly once.
+        :return The number of bytes written. """
+        target = memoryview(destination)
+        offset = 0
+        for segment in self.iter_segments(buffer):
+            target[offset:offset + len(segment)] = segment
+            offset += len(segment)
+        return offset
+
     @abstractmethod
     def complement(self) -> 'IGSlice':
         """ :return An IGslice which is identical to this one except that for every 0 <= n < upperbound, n is contained
@@ -1,12 +1,110 @@
 from abc import ABCMeta, abstractmethod
-from typing import Optional, Union, Tuple
+from copy import deepcopy
+from typing import Callable, Iterable, Optional, Union, Tuple
 
+import numpy
+
+from pyromhackit.gslice.delta import SelectionDelta
+from pyromhackit.gslice.edges import EDGE_DTYPE, merge_edges, mask2edges
 from pyromhackit.gslice.igslice import IGSlice
+from pyromhackit.gslice.lazyview import SelectionView
+from pyromhackit.gslice.shared import SharedSelection, open_shared
 
 
 class IMutableGSlice(IGSlice, metaclass=ABCMeta):
     """ An IMutableGSlice is an IGSlice where integers can be added or removed. """
 
+    _listeners = ()  # Replaced by a tuple of the instance's own listeners by add_listener
+    _notifying = False  # True while a mutation that will notify the listeners is in progress
+    _shared_memory = None  # The shared memory segment an attached selection may be reading its edges from
+
+    @classmethod
+    def _from_edges(cls, universe: slice, edges: numpy.ndarray, length: Optional[int] = None) -> 'IMutableGSlice':
+        """ :return An instance of this class revealing the intervals with the ascending edge array @edges, in which
+        every interval is non-empty, no two intervals touch and every interval start is explicit. @length is the number
+        of revealed integers, if known. """
+        raise NotImplementedError
+
+    @classmethod
+    def from_mask(cls, mask) -> 'IMutableGSlice':
+        """ :return An instance of this class with universe [0, len(@mask)) revealing the integers i for which the
+        one-dimensional array @mask is nonzero (or True) at i. Run boundaries are found with numpy.diff, so this is
+        vectorized. """
+        return cls._from_edges(slice(0, len(mask)), mask2edges(mask))
+
+    @classmethod
+    def from_array(cls, universe: slice, array) -> 'IMutableGSlice':
+        """ :return An instance of this class with universe @universe revealing [a, b) for each row (a, b) of the
+        (k, 2) array @array. The rows may be in any order and may overlap. """
+        array = numpy.asarray(array, dtype=EDGE_DTYPE).reshape(-1, 2)
+        return cls._from_edges(universe, merge_edges(array[:, 0], array[:, 1]))
+
+    def to_shared(self) -> SharedSelection:
+        """ Copies the interval edges of this generalized slice into a new shared memory segment. O(n).
+        :return The handle that owns the segment, whose name other processes pass to attach. """
+        return SharedSelection(self.universe, self.to_array().ravel(), len(self))
+
+    @classmethod
+    def attach(cls, name: str) -> 'IMutableGSlice':
+        """ :return An instance of this class revealing what the generalized slice exported to the shared memory
+        segment @name by to_shared revealed. Nothing is unpickled: an ArraySelection uses the edge array in the segment
+        as its own, read-only and without copying it, while the other classes build their structures from it. Mutating
+        the result never writes to the segment. """
+        universe, edges, length, memory = open_shared(name)
+        selection = cls._from_edges(universe, edges, length)
+        selection._shared_memory = memory  # Keeps the segment mapped for as long as the selection may read from it
+        return selection
+
+    def snapshot(self) -> 'IMutableGSlice':
+        """ :return A copy of this generalized slice which is unaffected by later mutations of this one and vice versa.
+        Implementations should make this cheap, e.g. by sharing state until either copy is mutated. """
+        return deepcopy(self)
+
+    @property
+    def listeners(self) -> Tuple[Callable[[SelectionDelta], None], ...]:
+        return self._listeners
+
+    def add_listener(self, listener: Callable[[SelectionDelta], None]):
+        """ Registers @listener to be called with a SelectionDelta, holding the physical ranges that became revealed and
+        covered, after every mutation through include, exclude and the like that changes this generalized slice.
+        Snapshots do not inherit the listeners. """
+        self._listeners = self._listeners + (listener,)
+
+    def remove_listener(self, listener: Callable[[SelectionDelta], None]):
+        """ Stops calling @listener on mutations.
+        :raise ValueError if @listener is not registered. """
+        if listener not in self._listeners:
+            raise ValueError("{} is not listening to {}".format(listener, self))
+        listeners = list(self._listeners)
+        listeners.remove(listener)
+        self._listeners = tuple(listeners)
+
+    def complement_view(self) -> SelectionView:
+        """ :return A read-only view of the complement of this generalized slice, which, unlike complement(), copies
+        nothing and follows later mutations. O(1). """
+        return SelectionView(self, complemented=True)
+
+    def subslice_view(self, from_index: Optional[int], to_index: Optional[int]) -> SelectionView:
+        """ :return A read-only view of the integers of this generalized slice in [@from_index, @to_index), which,
+        unlike subslice(), copies nothing and follows later mutations. O(1). """
+        return SelectionView(self, from_index, to_index)
+
+    def virtualselection2physical(self, vselection: IGSlice) -> 'IMutableGSlice':
+        """ Let S denote the sequence of integers currently included in this generalized slice.
+        :return The generalized slice of every ith integer in S such that i is in @vselection. """
+        raise NotImplementedError
+
+    def compose(self, inner: IGSlice) -> 'IMutableGSlice':
+        """ Let S denote the sequence of integers currently included in this generalized slice, and think of it as a
+        view of its universe. @inner is a generalized slice of that view, i.e. of [0, len(S)).
+        :return The generalized slice of the universe of this one that includes every ith integer in S such that i is
+        in @inner, i.e. the equivalent of @inner on the underlying space. The selections of any number of stacked views
+        thus compose into a single one. O(n + k) for k intervals in @inner. """
+        if inner.universe != slice(0, len(self)):
+            raise ValueError("Expected an inner selection with universe {}, got {}".format(slice(0, len(self)),
+                                                                                         inner.universe))
+        return self.virtualselection2physical(inner)
+
     @abstractmethod
     def include(self, from_index: Optional[int], to_index: Optional[int]):
         """ Expands this generalized slice by including any integer in [@from_index, @to_index).
@@ -44,6 +142,11 @@ class IMutableGSlice(IGSlice, metaclass=ABCMeta):
         :return The number of excluded elements that were included. """
         raise NotImplementedError
 
+    def include_many(self, intervals: Iterable[Tuple[Optional[int], Optional[int]]]):
+        """ Includes every integer in [a, b) for each pair (a, b) in @intervals, as if by calling include once per pair.
+        :return The number of excluded integers that were included. """
+        return sum(self.include(a, b) for a, b in intervals)
+
     @abstractmethod
     def exclude(self, from_index: Optional[int], to_index: Optional[int]):
         """ Shrinks this generalized slice by excluding any integer in [@from_index, @to_index).
@@ -56,3 +159,8 @@ class IMutableGSlice(IGSlice, metaclass=ABCMeta):
         generalized slice by excluding each ith integer in S, where @from_index <= i < @to_index.
         :return The number of included integers that were excluded. """
         raise NotImplementedError
+
+    def exclude_many(self, intervals: Iterable[Tuple[Optional[int], Optional[int]]]):
+        """ Excludes every integer in [a, b) for each pair (a, b) in @intervals, as if by calling exclude once per pair.
+        :return The number of included integers that were excluded. """
+        return sum(self.exclude(a, b) for a, b in intervals)
@@ -0,0 +1,163 @@
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Optional, Tuple, Union
+
+import numpy
+from sortedcontainers import SortedDict
+
+from pyromhackit.gslice.arrayselection import normalized_range
+from pyromhackit.gslice.edges import EDGE_DTYPE
+from pyromhackit.gslice.factory import selection_from_edges
+from pyromhackit.gslice.imutablegslice import IMutableGSlice
+
+
+class IntervalMap(object):
+    """ Maps disjoint intervals [a, b) of a universe to labels, e.g. the kinds of data (script, pointer tables,
+    graphics, ...) found in the regions of a ROM. Any object other than None can be a label; None stands for the
+    absence of one. Adjacent intervals with equal labels are merged, so every interval is a maximal run of one label.
+
+    The intervals are kept in a SortedDict keyed by their starts, so looking up the label of an integer is O(log(n)) and
+    iterating over the k intervals in a range is O(log(n) + k). A Selection of the integers with a given label is built
+    on demand in O(n). """
+
+    def __init__(self, universe: slice, intervals: Iterable[Tuple[int, int, Any]] = ()):
+        """ @intervals holds triples (a, b, label) that are assigned in order, so that later ones take precedence where
+        they overlap. """
+        self.universe = universe
+        self._intervals = SortedDict()  # Maps the start a of each interval [a, b) to the pair (b, label)
+        for a, b, label in intervals:
+            self.assign(a, b, label)
+
+    def _index_at(self, pindex: int) -> Optional[int]:
+        """ :return The position in self._intervals of the interval containing @pindex, or None if there is none. """
+        i = self._intervals.bisect_right(pindex) - 1
+        if i >= 0 and self._intervals.peekitem(i)[1][0] > pindex:
+            return i
+        return None
+
+    def interval_at(self, pindex: int) -> Tuple[int, int, Any]:
+        """ :return The triple (a, b, label) of the interval [a, b) containing @pindex. O(log(n)).
+        :raise KeyError if @pindex is not in any interval. """
+        i = self._index_at(pindex)
+        if i is None:
+            raise KeyError(pindex)
+        a, (b, label) = self._intervals.peekitem(i)
+        return a, b, label
+
+    def get(self, pindex: int, default=None):
+        """ :return The label of the integer @pindex, or @default if it has none. O(log(n)). """
+        i = self._index_at(pindex)
+        return default if i is None else self._intervals.peekitem(i)[1][1]
+
+    def __getitem__(self, pindex: int):
+        return self.interval_at(pindex)[2]
+
+    def __contains__(self, pindex: int) -> bool:
+        return self._index_at(pindex) is not None
+
+    def _cut(self, a: int, b: int):
+        """ Removes every label from [@a, @b), splitting the intervals that stick out of it. """
+        i = self._intervals.bisect_right(a) - 1
+        if i >= 0:
+            start, (stop, label) = self._intervals.peekitem(i)
+            if start < a < stop:
+                self._intervals[start] = (a, label)
+                if stop > b:
+                    self._intervals[b] = (stop, label)
+        for start in list(self._intervals.irange(a, b, inclusive=(True, False))):
+            stop, label = self._intervals.pop(start)
+            if stop > b:
+                self._intervals[b] = (stop, label)
+
+    def assign(self, from_index: Optional[int], to_index: Optional[int], label):
+        """ Labels every integer in [@from_index, @to_index) with @label, replacing any label it had. The indices are
+        interpreted the way Selection.include interprets them. O(log(n) + k) for the k intervals overlapping the
+        range. """
+        if label is None:
+            raise ValueError("None is not a label; use discard to remove labels")
+        a, b = normalized_range(self.universe, from_index, to_index)
+        if a >= b:
+            return
+        self._cut(a, b)
+        i = self._intervals.bisect_left(a) - 1
+        if i >= 0:
+            start, (stop, previous_label) = self._intervals.peekitem(i)
+            if stop == a and previous_label == label:
+                del self._intervals[start]
+                a = start
+        if b in self._intervals and self._intervals[b][1] == label:
+            b = self._intervals.pop(b)[0]
+        self._intervals[a] = (b, label)
+
+    def discard(self, from_index: Optional[int], to_index: Optional[int]):
+        """ Removes the labels of every integer in [@from_index, @to_index). O(log(n) + k). """
+        a, b = normalized_range(self.universe, from_index, to_index)
+        if a < b:
+            self._cut(a, b)
+
+    def items(self, from_index: Optional[int] = None, to_index: Optional[int] = None) -> Iterator[Tuple[int, int, Any]]:
+        """ :return An iterator over the triples (a, b, label) of the intervals [a, b) intersected with
+        [@from_index, @to_index), in ascending order. O(log(n) + k) for k intervals. """
+        a, b = normalized_range(self.universe, from_index, to_index)
+        if a >= b:
+            return
+        i = self._intervals.bisect_right(a) - 1
+        for start in self._intervals.islice(max(i, 0)):
+            if start >= b:
+                return
+            stop, label = self._intervals[start]
+            if stop > a:
+                yield max(start, a), min(stop, b), label
+
+    def __iter__(self):
+        return self.items()
+
+    def __len__(self):
+        return len(self._intervals)
+
+    def relabel(self, mapping: Union[Dict, Callable[[Any], Any]], from_index: Optional[int] = None,
+                to_index: Optional[int] = None):
+        """ Replaces the label L of every interval in [@from_index, @to_index) with @mapping(L) if @mapping is callable
+        and with @mapping.get(L, L) otherwise. Intervals mapped to None lose their label. O(k*log(n)) for the k
+        intervals in the range. """
+        translate = mapping if callable(mapping) else (lambda label: mapping.get(label, label))
+        for a, b, label in list(self.items(from_index, to_index)):
+            new_label = translate(label)
+            if new_label is None:
+                self._cut(a, b)
+            elif new_label != label:
+                self.assign(a, b, new_label)
+
+    def labels(self) -> set:
+        """ :return The set of labels in use. O(n). """
+        return {label for _, (_, label) in self._intervals.items()}
+
+    @staticmethod
+    def _edges(pairs: Iterable[Tuple[int, int]]) -> numpy.ndarray:
+        """ :return The edge array of the ascending pairs @pairs of one label, which never touch as they would have been
+        merged. """
+        return numpy.fromiter((x for pair in pairs for x in pair), dtype=EDGE_DTYPE)
+
+    def selection(self, label, from_index: Optional[int] = None, to_index: Optional[int] = None) -> IMutableGSlice:
+        """ :return A selection of the universe revealing the integers in [@from_index, @to_index) labelled @label,
+        backed by whichever implementation suits its size. O(n). """
+        return selection_from_edges(self.universe, self._edges(
+            (a, b) for a, b, other in self.items(from_index, to_index) if other == label))
+
+    def selections(self) -> Dict[Hashable, IMutableGSlice]:
+        """ :return A dict mapping each label, which must be hashable, to the selection of the integers labelled with
+        it, built in a single pass over the intervals. O(n). """
+        pairs = {}
+        for a, b, label in self.items():
+            pairs.setdefault(label, []).append((a, b))
+        return {label: selection_from_edges(self.universe, self._edges(label_pairs))
+                for label, label_pairs in pairs.items()}
+
+    def __eq__(self, other):
+        if not isinstance(other, IntervalMap):
+            return False
+        return self.universe == other.universe and list(self.items()) == list(other.items())
+
+    def __repr__(self):
+        return "{}(universe={}, intervals={})".format(self.__class__.__name__, self.universe, list(self.items()))
+
+    def __str__(self):
+        return repr(self)
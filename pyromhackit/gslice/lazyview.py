@@ -0,0 +1,127 @@
+from typing import Iterator, List, Optional, Tuple
+
+from pyromhackit.gslice.igslice import IGSlice
+
+
+class SelectionView(IGSlice):
+    """ Read-only view of the integers of a window [a, b) of a parent selection that are revealed in it or, if the view
+    is complemented, covered in it. Nothing is copied: every query is answered by the parent, through its cursor and its
+    count_revealed and virtual2physical. Thus creating a view is O(1), len and membership are O(log(n)) and iterating
+    over the k pairs of the view is O(log(n) + k).
+
+    The view reflects later mutations of the parent; take a snapshot of the parent first to avoid that. Call
+    materialize() for an independent selection. """
+
+    def __init__(self, parent, from_index: Optional[int] = None, to_index: Optional[int] = None,
+                 complemented: bool = False):
+        """ @parent is a Selection, ArraySelection or BitmapSelection. The window [@from_index, @to_index) is normalized
+        the way subslice normalizes its arguments. """
+        self._parent = parent
+        self.universe = parent.universe
+        self._from_index, self._to_index = slice(from_index, to_index).indices(self.universe.stop)[:2]
+        self._to_index = max(self._from_index, self._to_index)
+        self._complemented = complemented
+
+    @property
+    def window(self) -> Tuple[int, int]:
+        return self._from_index, self._to_index
+
+    def _is_whole(self) -> bool:
+        return (self._from_index, self._to_index) == (self.universe.start, self.universe.stop)
+
+    def _clipped(self, from_index: Optional[int], to_index: Optional[int]) -> Tuple[int, int]:
+        a, b = slice(from_index, to_index).indices(self.universe.stop)[:2]
+        a, b = max(a, self._from_index), min(b, self._to_index)
+        return a, max(a, b)
+
+    def pairs(self) -> Iterator[Tuple[int, int]]:
+        if self._from_index == self._to_index:
+            return
+        cursor = self._parent.cursor(self._from_index)
+        while True:
+            a, b = cursor.pair
+            if cursor.revealed != self._complemented:
+                yield max(a, self._from_index), min(b, self._to_index)
+            if b >= self._to_index or not cursor.has_next():
+                return
+            cursor.next_run()
+
+    def slices(self) -> List[slice]:
+        return [slice(a, b) for a, b in self.pairs()]
+
+    def intervals(self) -> List[Tuple[int, int]]:
+        return list(self.pairs())
+
+    def __iter__(self):
+        return self.pairs()
+
+    def select(self, listlike):
+        return listlike[0:0].join(listlike[a:b] for a, b in self.pairs())
+
+    def count_revealed(self, from_index: Optional[int], to_index: Optional[int]) -> int:
+        """ :return The number of integers of this view in [@from_index, @to_index). O(log(n)). """
+        a, b = self._clipped(from_index, to_index)
+        revealed = self._parent.count_revealed(a, b) if a < b else 0
+        return (b - a) - revealed if self._complemented else revealed
+
+    def __len__(self):
+        return self.count_revealed(None, None)
+
+    def __contains__(self, pindex: int) -> bool:
+        """ :return True iff the integer @pindex is in this view. O(log(n)). """
+        return self._from_index <= pindex < self._to_index and self.count_revealed(pindex, pindex + 1) == 1
+
+    def physical2virtual(self, pindex: int) -> int:
+        """ :return The number of integers of this view less than @pindex, which must be in this view. O(log(n)). """
+        if pindex not in self:
+            raise IndexError("Physical index {} out of bounds for {}".format(pindex, self))
+        return self.count_revealed(self._from_index, pindex)
+
+    def virtual2physical(self, vindex: int) -> int:
+        """ :return The @vindex'th integer of this view, counting from the end if @vindex < 0. O(log(n)) unless the view
+        is complemented, in which case the integer is found by bisection in O(log(n)*log(universe size)). """
+        length = len(self)
+        if vindex < 0:
+            vindex += length
+        if not 0 <= vindex < length:
+            raise IndexError("Virtual index {} out of bounds for {}".format(vindex, self))
+        if not self._complemented:
+            return self._parent.virtual2physical(self._parent.count_revealed(None, self._from_index) + vindex)
+        lower, upper = self._from_index, self._to_index - 1
+        while lower < upper:  # Find the smallest p such that [from_index, p] holds more than vindex integers
+            middle = (lower + upper) // 2
+            if self.count_revealed(self._from_index, middle + 1) > vindex:
+                upper = middle
+            else:
+                lower = middle + 1
+        return lower
+
+    def __getitem__(self, item):
+        return self.virtual2physical(item)
+
+    def complement(self) -> IGSlice:
+        """ :return The complement of this view, which is a view itself if this one spans the whole universe, and a
+        materialized selection otherwise. """
+        if self._is_whole():
+            return SelectionView(self._parent, self._from_index, self._to_index, not self._complemented)
+        return self.materialize().complement()
+
+    def subslice(self, from_index: Optional[int], to_index: Optional[int]) -> 'SelectionView':
+        """ :return A view of the integers of this view in [@from_index, @to_index). O(1). """
+        return SelectionView(self._parent, *self._clipped(from_index, to_index), complemented=self._complemented)
+
+    def materialize(self):
+        """ :return A selection of the same type as the parent, independent of it, that holds the integers of this view.
+        O(n). """
+        return type(self._parent)(self.universe, revealed=list(self.pairs()))
+
+    def __eq__(self, other):
+        if not isinstance(other, IGSlice):
+            return False
+        return self.universe == other.universe and list(self.pairs()) == list(other.pairs())
+
+    def __repr__(self):
+        return "{}(universe={}, revealed={})".format(self.__class__.__name__, self.universe, list(self.pairs()))
+
+    def __str__(self):
+        return repr(self)
@@ -3,23 +3,11 @@ from typing import List
 
 import matplotlib.pyplot as plt
 
-from pyromhackit.gslice.selection import Selection
+from pyromhackit.gslice.igslice import IGSlice
 
 
-def selection2bitarray(selection: Selection) -> List[float]:
-    excluded_number = 0.0
-    included_number = 1.0
-    bit_array = []
-    last_end = 0
-    for a, b in selection.pairs():
-        for _ in range(last_end, a):
-            bit_array.append(excluded_number)
-        for _ in range(a, b):
-            bit_array.append(included_number)
-        last_end = b
-    for _ in range(last_end, selection.universe.stop):
-        bit_array.append(excluded_number)
-    return bit_array
+def selection2bitarray(selection: IGSlice) -> List[float]:
+    return selection.to_mask(float).tolist()
 
 
 def bitarray2bitmatrix(bit_array: List[float]) -> List[List[float]]:
@@ -36,7 +24,7 @@ def bitarray2bitmatrix(bit_array: List[float]) -> List[List[float]]:
     return bit_matrix
 
 
-def plot_selection(selection: Selection):
+def plot_selection(selection: IGSlice):
     bit_array = selection2bitarray(selection)
     bit_matrix = bitarray2bitmatrix(bit_array)
     plt.imshow(bit_matrix)
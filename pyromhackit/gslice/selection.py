@@ -1,14 +1,93 @@
 #!/usr/bin/env python
+import functools
+import heapq
+import operator
 from copy import deepcopy
 
-from typing import Optional, Union, List, Tuple, Iterator
+from typing import Optional, Union, List, Tuple, Iterator, Iterable
 
 import itertools
+import numpy
 from sortedcontainers import SortedSet
 
+from pyromhackit.gslice.cumulative import CumulativeLengthIndex
+from pyromhackit.gslice.cursor import IntervalCursor
+from pyromhackit.gslice.delta import notifying, notifying_batch, subtracted
+from pyromhackit.gslice.edges import EDGE_DTYPE
+from pyromhackit.gslice.igslice import IGSlice
 from pyromhackit.gslice.imutablegslice import IMutableGSlice
 
 
+def _copy_on_write(method):
+    """ Decorator for mutators that alter self._intervals in place. Gives the selection a private copy of its interval
+    edges first if it shares them with a snapshot. """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._sharers[0] > 1:
+            self._detach()
+            self._intervals = self._intervals.copy()
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _reindexing(method):
+    """ Decorator for mutators of the form f(self, from_index, to_index) that only touch interval edges within
+    [from_index, to_index]. Brings the cumulative length index, if one has been built, up to date afterwards. """
+
+    @functools.wraps(method)
+    def wrapper(self, from_index, to_index):
+        result = method(self, from_index, to_index)
+        if self._index is not None:
+            a, b = self._touched_range(from_index, to_index)
+            self._index.replace(a, b, self._intervals.irange(a, b))
+        return result
+
+    return wrapper
+
+
+def _coalesced(pairs: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """ :return The union of the ranges [a, b) in @pairs, which must be sorted by a, as an ascending list of disjoint and
+    non-adjacent pairs. O(k). """
+    merged = []
+    for a, b in pairs:
+        if merged and a <= merged[-1][1]:
+            if b > merged[-1][1]:
+                merged[-1] = (merged[-1][0], b)
+        else:
+            merged.append((a, b))
+    return merged
+
+
+def _merged_edges(edges1: List[int], edges2: List[int], predicate) -> Tuple[List[int], int]:
+    """ Walks the ascending edge lists @edges1 and @edges2, in which every interval start is explicit, with one pointer
+    each. An integer belongs to the result iff @predicate(x, y) is true, where x and y say whether the integer belongs to
+    the first and the second set of intervals respectively. O(n + m).
+    :return A pair (E, c) where E is the ascending edge list of the resulting intervals and c is their total length. """
+    result = []
+    length = 0
+    i = j = 0
+    inside1 = inside2 = inside = False
+    while i < len(edges1) or j < len(edges2):
+        if j == len(edges2) or i < len(edges1) and edges1[i] <= edges2[j]:
+            edge = edges1[i]
+        else:
+            edge = edges2[j]
+        if i < len(edges1) and edges1[i] == edge:
+            inside1 = not inside1
+            i += 1
+        if j < len(edges2) and edges2[j] == edge:
+            inside2 = not inside2
+            j += 1
+        if predicate(inside1, inside2) != inside:
+            inside = not inside
+            if not inside:
+                length += edge - result[-1]
+            result.append(edge)
+    return result, length
+
+
 class Selection(IMutableGSlice):
     def __init__(
             self,
@@ -29,6 +108,17 @@ class Selection(IMutableGSlice):
         else:
             self._intervals = self.revealed2sortedset(revealed)
         self._revealed_count = _length if isinstance(_length, int) else Selection._compute_len(self._intervals)
+        self._index = None  # Built on demand by _cumulative_index
+        self._sharers = [1]  # Number of selections sharing self._intervals, see snapshot
+
+    @classmethod
+    def _from_edges(cls, universe: slice, edges: numpy.ndarray, length: Optional[int] = None) -> 'Selection':
+        if length is None:
+            length = int((edges[1::2] - edges[0::2]).sum())
+        intervals = edges.tolist()
+        if intervals and intervals[0] == 0:
+            del intervals[0]
+        return cls(universe, intervals=intervals, _length=length)
 
     @staticmethod
     def revealed2sortedset(revealed: List[Union[tuple, slice]]) -> SortedSet:
@@ -83,11 +173,36 @@ class Selection(IMutableGSlice):
         return itertools.chain([(0, self._intervals[0])], zip(self._intervals[1::2], self._intervals[2::2]))
 
     def gap_pairs(self) -> Iterator[Tuple[int, int]]:
-        return self.complement().pairs()
+        return self.complement_view().pairs()
 
     def intervals(self):
         return self._intervals
 
+    def to_array(self) -> numpy.ndarray:
+        edges = numpy.fromiter(self._intervals, dtype=EDGE_DTYPE, count=len(self._intervals))
+        if len(edges) % 2 == 1:
+            edges = numpy.concatenate([numpy.zeros(1, dtype=EDGE_DTYPE), edges])
+        return edges.reshape(-1, 2)
+
+    def _cumulative_index(self) -> CumulativeLengthIndex:
+        """ :return The index of cumulative interval lengths, building it in O(n) if it does not exist yet. Once built,
+        it is kept up to date by include and exclude in O(log(n)) per call. """
+        if self._index is None:
+            self._index = CumulativeLengthIndex(self._intervals)
+        return self._index
+
+    def _touched_range(self, from_index: Optional[int], to_index: Optional[int]) -> Tuple[int, int]:
+        """ :return The range [a, b] containing every interval edge that include or exclude may add or remove when
+        called with the same arguments. """
+        stop = self.universe.stop
+        a = self.universe.start if from_index is None else min(from_index % stop if from_index < 0 else from_index,
+                                                                stop)
+        b = stop if to_index is None else min(to_index % stop if to_index < 0 else to_index, stop)
+        return a, max(a, b)
+
+    @notifying
+    @_copy_on_write
+    @_reindexing
     def exclude(self, from_index: Optional[int], to_index: Optional[int]):
         original_length = self._revealed_count
         if isinstance(from_index, int) and -self.universe.stop <= from_index < 0:
@@ -160,11 +275,12 @@ class Selection(IMutableGSlice):
                             self._intervals.add(to_index)
                 else:
                     from_start = 0 if m == 0 else self._intervals[m - 1]
-                    from_end = self._intervals[m]
-                    self._revealed_count -= from_end - from_start
+                    to_remove = self._intervals[m:n]
+                    self._revealed_count -= (to_remove[0] - from_start) + sum(
+                        b - a for a, b in zip(to_remove[1::2], to_remove[2::2]))
+                    del self._intervals[m:n]
                     if from_start > 0:
                         self._intervals.remove(from_start)
-                    self._intervals.remove(from_end)
             else:
                 if to_index_is_included:
                     from_end = self._intervals[m]
@@ -179,15 +295,15 @@ class Selection(IMutableGSlice):
                         self._revealed_count -= (from_end - from_index) + (to_index - to_start) + sum(
                             b - a for a, b in zip(intermediates[::2], intermediates[1::2]))
                         del self._intervals[m + 1:n - 1]  # intermediates
+                        self._intervals.remove(from_end)
+                        self._intervals.remove(to_start)
                         if from_index > 0:
                             self._intervals.add(from_index)
                         self._intervals.add(to_index)
-                        self._intervals.remove(from_end)
-                        self._intervals.remove(to_start)
                 else:
                     to_remove = self._intervals[m:n]
                     self._revealed_count -= self._intervals[m] - from_index + sum(
-                        b - a for a, b in zip(to_remove[1::2], to_remove[::2]))
+                        b - a for a, b in zip(to_remove[1::2], to_remove[2::2]))
                     del self._intervals[m:n]
                     if from_index != 0:
                         self._intervals.add(from_index)
@@ -201,8 +317,8 @@ class Selection(IMutableGSlice):
                     to_remove = self._intervals[m:n]
                     del self._intervals[m:n]
                     self._intervals.add(to_index)
-                    self._revealed_count -= (to_index - to_remove[0]) + sum(
-                        b - a for a, b in zip(to_remove[1::2], to_remove[::2]))
+                    self._revealed_count -= (to_index - to_remove[-1]) + sum(
+                        b - a for a, b in zip(to_remove[::2], to_remove[1::2]))
             else:
                 to_remove = self._intervals[m:n]
                 del self._intervals[m:n]
@@ -221,6 +337,21 @@ class Selection(IMutableGSlice):
             p_to_index = self.virtual2physical(to_index)
         return self.exclude(p_from_index, p_to_index)
 
+    @notifying_batch
+    def exclude_many(self, intervals: Iterable[Tuple[Optional[int], Optional[int]]]):
+        """ Excludes every integer in [a, b) for each pair (a, b) in @intervals by sorting the pairs and cutting them out
+        of the revealed intervals in a single sweep, rather than by calling exclude once per pair. O(k*log(k) + n).
+        :return The number of included integers that were excluded. """
+        batch = self._batch2pairs(intervals)
+        if not batch:
+            return 0
+        original_length = len(self)
+        self._set_pairs(subtracted(self.pairs(), batch))
+        return original_length - len(self)
+
+    @notifying
+    @_copy_on_write
+    @_reindexing
     def include(self, from_index: Optional[int], to_index: Optional[int]):
         original_length = len(self)
         if isinstance(from_index, int) and -self.universe.stop <= from_index < 0:
@@ -236,14 +367,14 @@ class Selection(IMutableGSlice):
             from_index = self.universe.start
         if to_index is None:
             to_index = self.universe.stop
+        if from_index >= to_index:
+            return 0
         if not self._intervals:
             if from_index > 0:
                 self._intervals.add(from_index)
             self._intervals.add(to_index)
             self._revealed_count += to_index - from_index
             return to_index - from_index
-        if from_index == to_index:
-            return 0
 
         m = self._intervals.bisect_right(from_index)
         n = self._intervals.bisect_right(to_index)
@@ -271,7 +402,7 @@ class Selection(IMutableGSlice):
                 del self._intervals[m:n]
                 self._intervals.add(to_index)
                 self._revealed_count += (to_index - to_remove[-1]) + sum(
-                    b - a for a, b in zip(to_remove[1::2], to_remove[::2]))
+                    b - a for a, b in zip(to_remove[::2], to_remove[1::2]))
         else:
             if to_index_is_included:
                 if from_index_right_of_included:
@@ -281,9 +412,10 @@ class Selection(IMutableGSlice):
                 else:
                     to_remove = self._intervals[m:n]
                     del self._intervals[m:n]
-                    self._intervals.add(from_index)
+                    if from_index > 0:
+                        self._intervals.add(from_index)
                     self._revealed_count += (to_remove[0] - from_index) + sum(
-                        b - a for a, b in zip(to_remove[1::2], to_remove[::2]))
+                        b - a for a, b in zip(to_remove[1::2], to_remove[2::2]))
             else:
                 if from_index_right_of_included:
                     intermediates = self._intervals[m:n]
@@ -303,6 +435,35 @@ class Selection(IMutableGSlice):
 
         return len(self) - original_length
 
+    def _batch2pairs(self, intervals: Iterable[Tuple[Optional[int], Optional[int]]]) -> List[Tuple[int, int]]:
+        """ :return The union of the ranges in @intervals, each normalized the way include and exclude normalize their
+        arguments, as an ascending list of disjoint and non-adjacent pairs. O(k*log(k)). """
+        ranges = (self._touched_range(a, b) for a, b in intervals)
+        return _coalesced(sorted((a, b) for a, b in ranges if a < b))
+
+    def _set_pairs(self, pairs: List[Tuple[int, int]]):
+        """ Replaces the revealed intervals with the ascending, disjoint and non-adjacent pairs @pairs. O(n). """
+        edges = [x for pair in pairs for x in pair]
+        if edges and edges[0] == 0:
+            del edges[0]
+        self._detach()
+        self._intervals = SortedSet(edges)
+        self._revealed_count = sum(b - a for a, b in pairs)
+        self._index = None
+
+    @notifying_batch
+    def include_many(self, intervals: Iterable[Tuple[Optional[int], Optional[int]]]):
+        """ Includes every integer in [a, b) for each pair (a, b) in @intervals by sorting the pairs and sweeping them
+        together with the revealed intervals, rather than by calling include once per pair. O(k*log(k) + n).
+        :return The number of excluded integers that were included. """
+        batch = self._batch2pairs(intervals)
+        if not batch:
+            return 0
+        original_length = len(self)
+        self._set_pairs(_coalesced(heapq.merge(self.pairs(), batch)))
+        return len(self) - original_length
+
+    @notifying
     def include_partially(self, from_index: Optional[int], to_index: Optional[int], count: Union[int, tuple]):
         if isinstance(count, int):
             return self.include_partially(from_index, to_index, (count, count))
@@ -311,80 +472,94 @@ class Selection(IMutableGSlice):
         tail_revealed_count = self._include_partially_from_right(from_index, to_index, tail_count)
         return head_revealed_count + tail_revealed_count
 
+    def _covered_pairs(self, from_index: int, to_index: int, reverse: bool = False) -> Iterator[Tuple[int, int]]:
+        """ :return An iterator over the pairs (a, b) of the covered intervals [a, b) intersected with
+        [@from_index, @to_index), in ascending order, or descending if @reverse. Reads the runs between the two indices
+        only, so taking k pairs is O(log(n) + k). The selection must not be mutated while the iterator is in use. """
+        if from_index >= to_index:
+            return
+        cursor = self.cursor(to_index - 1 if reverse else from_index)
+        while True:
+            a, b = cursor.pair
+            if not cursor.revealed:
+                yield max(a, from_index), min(b, to_index)
+            if (a <= from_index if reverse else b >= to_index) or not (
+                    cursor.has_previous() if reverse else cursor.has_next()):
+                return
+            cursor.previous_run() if reverse else cursor.next_run()
+
     def _include_partially_from_left(self, from_index: int, to_index: int, count: int):
         if count == 0:
             return 0
         from_index, to_index = self._normalized_range(from_index, to_index)
-        subsel = self._spanning_subslice(from_index, to_index).complement().subslice(from_index, to_index)
-
-        revealed_count = 0
-        for covered_start, covered_stop in subsel.pairs():
-            coverage = covered_stop - covered_start
-            if revealed_count + coverage < count:
-                self.include(covered_start, covered_stop)
-                revealed_count += coverage
-            else:
-                self.include(covered_start, covered_start + count - revealed_count)
-                revealed_count = count
+        pieces = []
+        remaining = count
+        for covered_start, covered_stop in self._covered_pairs(from_index, to_index):
+            pieces.append((covered_start, min(covered_stop, covered_start + remaining)))
+            remaining -= pieces[-1][1] - covered_start
+            if remaining == 0:
                 break
-        return revealed_count
+        return sum(self.include(a, b) for a, b in pieces)
 
     def _include_partially_from_right(self, from_index: int, to_index: int, count: int):
         if count == 0:
             return 0
         from_index, to_index = self._normalized_range(from_index, to_index)
-        subsel = self._spanning_subslice(from_index, to_index).complement().subslice(from_index, to_index)
-
-        revealed_count = 0
-        for covered_start, covered_stop in reversed(list(subsel.pairs())):
-            coverage = covered_stop - covered_start
-            if revealed_count + coverage < count:
-                self.include(covered_start, covered_stop)
-                revealed_count += coverage
-            else:
-                self.include(covered_stop - (count - revealed_count), covered_stop)
-                revealed_count = count
+        pieces = []
+        remaining = count
+        for covered_start, covered_stop in self._covered_pairs(from_index, to_index, reverse=True):
+            pieces.append((max(covered_start, covered_stop - remaining), covered_stop))
+            remaining -= covered_stop - pieces[-1][0]
+            if remaining == 0:
                 break
-        return revealed_count
+        return sum(self.include(a, b) for a, b in pieces)
 
+    @notifying
     def include_expand(self, from_index: Optional[int], to_index: Optional[int], count: Union[int, Tuple[int, int]]):
         if isinstance(count, int):
             return self.include_expand(from_index, to_index, (count, count))
         if count == (0, 0):
             return 0
         head_count, tail_count = count
-        revealed_counter = 0
-        gaps = self.complement().subslice(from_index, to_index)
-        for a, b in gaps.pairs():
-            if b < self.universe.stop:
-                revealed_counter += self._include_partially_from_right(a, b, head_count)
-            if a > self.universe.start:
-                revealed_counter += self._include_partially_from_left(a, b, tail_count)
-        return revealed_counter
+        pieces = []
+        for a, b in self._covered_pairs(*self._normalized_range(from_index, to_index)):
+            head_length = min(head_count, b - a) if b < self.universe.stop else 0
+            if head_length > 0:
+                pieces.append((b - head_length, b))
+            if a > self.universe.start and tail_count > 0:
+                pieces.append((a, min(b - head_length, a + tail_count)))
+        return sum(self.include(a, b) for a, b in pieces if a < b)
+
+    def cursor(self, pindex: Optional[int] = None) -> IntervalCursor:
+        """ See IGSlice.cursor. Creating the cursor is O(log(n)) and so is every block of edges it reads. """
+        implicit = len(self._intervals) % 2  # Whether the edges begin with the start 0 of the first interval
+
+        def fetch(i: int, j: int) -> List[int]:
+            head = [0] if implicit and i == 0 else []
+            return head + list(self._intervals[max(0, i - implicit):j - implicit])
+
+        return IntervalCursor(self, len(self._intervals) + implicit, fetch,
+                              lambda p: self._intervals.bisect_right(p) + implicit, pindex)
 
     def _previous_slice(self, sl: slice):
-        """ :return The revealed or covered slice immediately to the left of @sl.
+        """ :return The revealed or covered slice immediately to the left of @sl. O(log(n)).
         :raise ValueError if there is none. """
         if sl.start == self.universe.start:
             raise ValueError("There is no slice to the left of {}.".format(sl))
-        # TODO O(n) -> O(1)
-        zero_or_one = [s for s in self._intervals + self.complement()._intervals if s.stop == sl.start]
-        if len(zero_or_one) == 1:
-            return zero_or_one[0]
-        else:
+        cursor = self.cursor(sl.start - 1)
+        if cursor.stop != sl.start:
             raise ValueError("Slice not found: {}.".format(sl))
+        return slice(*cursor.pair)
 
     def _next_slice(self, sl: slice):
-        """ :return The revealed or covered slice immediately to the right of @sl.
+        """ :return The revealed or covered slice immediately to the right of @sl. O(log(n)).
         :raise ValueError if there is none. """
         if sl.stop == self.universe.stop:
             raise ValueError("There is no slice to the right of {}.".format(sl))
-        # TODO O(n)
-        zero_or_one = [s for s in self._intervals + self.complement()._intervals if s.start == sl.stop]
-        if len(zero_or_one) == 1:
-            return zero_or_one[0]
-        else:
+        cursor = self.cursor(sl.stop)
+        if cursor.start != sl.stop:
             raise ValueError("Slice not found: {}.".format(sl))
+        return slice(*cursor.pair)
 
     def include_virtual(self, from_index, to_index):
         if from_index is None or from_index < -len(self) or from_index >= len(self):
@@ -430,12 +605,12 @@ class Selection(IMutableGSlice):
         elif from_index > self.universe.stop:
             from_index = self.universe.stop
         elif -self.universe.stop <= from_index < 0:
-            from_index = self.universe.stop - from_index
+            from_index = self.universe.stop + from_index
 
         if to_index is None or to_index >= self.universe.stop:
             to_index = self.universe.stop
         elif -self.universe.stop <= to_index < 0:
-            to_index = self.universe.stop - to_index
+            to_index = self.universe.stop + to_index
         elif to_index < -self.universe.stop:
             to_index = self.universe.start
 
@@ -509,6 +684,10 @@ class Selection(IMutableGSlice):
 
     def select(self, listlike):
         # TODO only works for stringlike objects
+        try:  # Bytes-like objects are sliced as memoryviews and copied once, by the join
+            return listlike[0:0].join(self.iter_segments(listlike))
+        except TypeError:
+            pass
         lst = []
         for interval in self.slices():
             lst.append(listlike[interval])
@@ -516,34 +695,34 @@ class Selection(IMutableGSlice):
         return selection
 
     def physical2virtual(self, pindex: int):
-        vindex = 0
-        for a, b in self.pairs():
-            if a <= pindex < b:
-                vindex += pindex - a
-                return vindex
-            vindex += b - a
-        raise IndexError("Physical index {} out of bounds for selection {}".format(pindex, self))
+        """ :return The number of revealed elements preceding the @pindex'th element, which must be revealed.
+        O(log(n)). """
+        index = self._cumulative_index()
+        if not self.universe.start <= pindex < self.universe.stop or not index.is_revealed(pindex):
+            raise IndexError("Physical index {} out of bounds for selection {}".format(pindex, self))
+        return index.revealed_before(pindex)
 
-    # TODO: O(n) -> O(log(n)) (using another sorted set for cumulative lengths?)
     def virtual2physical(self, vindex: int):  # TODO -> virtualint2physical
         """ :return the integer n such that where the @vindex'th revealed element is the nth element. If
-        @vindex < 0, @vindex is interpreted as (number of revealed elements) + @vindex.
+        @vindex < 0, @vindex is interpreted as (number of revealed elements) + @vindex. O(log(n)).
         """
         if vindex < -len(self):
             raise IndexError(
                 "Got index {}, expected it to be within range [{},{})".format(vindex, -len(self), len(self)))
         elif vindex < 0:
             return self.virtual2physical(len(self) + vindex)
-        cumlength = 0
-        for a, b in self.pairs():
-            cumlength += b - a
-            if vindex < cumlength:
-                pindex = b - (cumlength - vindex)
-                if a <= pindex < b:
-                    return pindex
-                else:
-                    break
-        raise IndexError("Virtual index {} out of bounds for selection {}".format(vindex, self))
+        pindex = self._cumulative_index().physical(vindex)
+        if pindex is None:
+            raise IndexError("Virtual index {} out of bounds for selection {}".format(vindex, self))
+        return pindex
+
+    def count_revealed(self, from_index: Optional[int], to_index: Optional[int]) -> int:
+        """ :return The number of revealed elements in [@from_index, @to_index). O(log(n)). """
+        from_index, to_index = self._touched_range(from_index, to_index)
+        if from_index >= to_index:
+            return 0
+        index = self._cumulative_index()
+        return index.revealed_before(to_index) - index.revealed_before(from_index)
 
     def virtual2physicalselection(self, vslice: slice) -> 'Selection':  # TODO -> virtualslice2physical
         """ :return the sub-Selection that is the intersection of this selection and @vslice. """
@@ -571,13 +750,30 @@ class Selection(IMutableGSlice):
         intervals = SortedSet([a] + self._intervals[m:n] + [b + 1])
         return Selection(universe=self.universe, intervals=intervals)
 
-    def virtualselection2physical(self, vselection: 'Selection'):  # TODO -> virtualslice2physical
-        """ :return the sub-Selection that is the intersection of this selection and @vselection. """
-        intervals = []
-        for start, stop in vselection:
-            for a, b in self.virtual2physicalselection(slice(start, stop)):
-                intervals.append(slice(a, b))
-        return Selection(universe=self.universe, revealed=intervals)
+    def virtualselection2physical(self, vselection: IGSlice) -> 'Selection':
+        """ :return the sub-Selection that is the intersection of this selection and @vselection, whose integers are
+        virtual indices. The intervals of both are walked in a single merge, which maps every interval of @vselection to
+        the physical range spanning its first and last integer, and the ranges are then intersected with this selection
+        in a second one. O(n + k) for k intervals. """
+        ranges = []
+        physical_pairs = self.pairs()
+        a = b = offset = 0  # The current physical interval [a, b) holds the virtual indices [offset, offset + b - a)
+        for start, stop in vselection.pairs():
+            stop = min(stop, len(self))
+            if start >= stop:
+                continue
+            while offset + (b - a) <= start:
+                offset += b - a
+                a, b = next(physical_pairs)
+            ranges.append(a + start - offset)
+            while offset + (b - a) < stop:
+                offset += b - a
+                a, b = next(physical_pairs)
+            ranges.append(a + stop - offset)
+        edges, length = _merged_edges(self._explicit_edges(), ranges, operator.and_)
+        if edges and edges[0] == 0:
+            del edges[0]
+        return Selection(universe=self.universe, intervals=edges, _length=length)
 
     def stretched(self, from_index: Optional[int], to_index: Optional[int]):  # TODO remove?
         """ :return A potentially shrinked deep copy of this selection, delimited by the universe
@@ -593,18 +789,57 @@ class Selection(IMutableGSlice):
     @staticmethod
     def _compute_len(sortedset: SortedSet):
         """ :return The sum of the lengths of every slice in @slicelist. """
-        if len(sortedset) == 0:
-            return 0
-        elif len(sortedset) % 2 == 0:
-            return sum(sortedset[i + 1] - sortedset[i] for i in range(0, len(sortedset), 2))
-        return sortedset[0] + sum(sortedset[i + 1] - sortedset[i] for i in range(1, len(sortedset), 2))
+        edges = list(sortedset)  # Indexing a SortedSet is O(log(n)), so the edges are copied out once
+        if len(edges) % 2 == 1:
+            edges.insert(0, 0)
+        return sum(edges[1::2]) - sum(edges[0::2])
 
     def __len__(self):
         return self._revealed_count
 
     def __eq__(self, other):
+        if isinstance(other, IMutableGSlice) and not isinstance(other, Selection):
+            return NotImplemented  # Let other implementations, e.g. ArraySelection, compare by revealed intervals
         return repr(self) == repr(other)
 
+    def _explicit_edges(self) -> List[int]:
+        """ :return The interval edges of this selection, including the start of the first interval even if it is 0. """
+        if len(self._intervals) % 2 == 1:
+            return [0] + list(self._intervals)
+        return list(self._intervals)
+
+    def _combined(self, other: IGSlice, predicate) -> 'Selection':
+        """ :return The Selection of every integer in the universe for which @predicate(x, y) is true, where x and y say
+        whether the integer is revealed in this selection and in @other respectively. """
+        if not isinstance(other, IGSlice):
+            return NotImplemented
+        if other.universe != self.universe:
+            raise ValueError("Cannot combine selections with universes {} and {}".format(self.universe, other.universe))
+        if isinstance(other, Selection):
+            other_edges = other._explicit_edges()
+        else:
+            other_edges = [x for pair in other.pairs() for x in pair]
+        edges, length = _merged_edges(self._explicit_edges(), other_edges, predicate)
+        if edges and edges[0] == 0:
+            del edges[0]
+        return Selection(universe=self.universe, intervals=edges, _length=length)
+
+    def __or__(self, other: IGSlice) -> 'Selection':
+        """ :return The union of this selection and @other. O(n + m). """
+        return self._combined(other, operator.or_)
+
+    def __and__(self, other: IGSlice) -> 'Selection':
+        """ :return The intersection of this selection and @other. O(n + m). """
+        return self._combined(other, operator.and_)
+
+    def __sub__(self, other: IGSlice) -> 'Selection':
+        """ :return The selection of integers revealed in this selection but not in @other. O(n + m). """
+        return self._combined(other, lambda x, y: x and not y)
+
+    def __xor__(self, other: IGSlice) -> 'Selection':
+        """ :return The selection of integers revealed in exactly one of this selection and @other. O(n + m). """
+        return self._combined(other, operator.xor)
+
     def __mul__(self, other: int):
         if other == 0:
             return Selection(universe=slice(0, 0), revealed=[])
@@ -621,6 +856,39 @@ class Selection(IMutableGSlice):
     def __str__(self):
         return repr(self)
 
+    def snapshot(self) -> 'Selection':
+        """ :return A copy of this selection, made in O(1). The copy shares its interval edges and its cumulative index
+        with this selection. Whichever of the two is mutated first copies the edges at that point, so a copy that is
+        only ever read never costs more than the O(1). """
+        self._sharers[0] += 1
+        copy = type(self).__new__(type(self))
+        copy.universe = self.universe
+        copy._intervals = self._intervals
+        copy._revealed_count = self._revealed_count
+        copy._index = self._index
+        copy._sharers = self._sharers
+        return copy
+
+    def _detach(self):
+        """ Stops sharing the interval edges and the cumulative index with any snapshot. The caller must replace
+        self._intervals with a private set of edges afterwards. """
+        if self._sharers[0] > 1:
+            self._sharers[0] -= 1
+            self._sharers = [1]
+            self._index = None
+
+    def __del__(self):
+        # Releases the share of a collected snapshot, so that the last remaining sharer mutates in place again
+        sharers = getattr(self, '_sharers', None)
+        if sharers is not None and sharers[0] > 1:
+            sharers[0] -= 1
+
+    def __copy__(self):
+        return self.snapshot()
+
+    def __deepcopy__(self, memo):
+        return self.snapshot()
+
     def deepcopy(self):
         """ :return A deep copy of this object. """
-        return Selection(universe=deepcopy(self.universe), intervals=deepcopy(self._intervals))
+        return self.snapshot()
@@ -0,0 +1,58 @@
+""" Export of selections to shared memory, so that a pool of worker processes can query a selection without it being
+pickled. A segment holds a header of HEADER_LENGTH integers (universe start and stop, number of revealed integers and
+number of edges) followed by the edge array of the selection, in which every interval start is explicit. """
+
+from multiprocessing.shared_memory import SharedMemory
+from typing import Tuple
+
+import numpy
+
+from pyromhackit.gslice.edges import EDGE_DTYPE
+
+HEADER_LENGTH = 4
+
+
+class SharedSelection(object):
+    """ A selection exported to a shared memory segment, from which other processes attach it by name. The exporting
+    process owns the segment: it must keep this handle until the other processes are done with the segment and then
+    unlink it, which the handle also does when used as a context manager. Processes that attach the segment should be
+    started by the exporting one, as the workers of a process pool are, so that they share its resource tracker. """
+
+    def __init__(self, universe: slice, edges: numpy.ndarray, length: int):
+        itemsize = numpy.dtype(EDGE_DTYPE).itemsize
+        self._memory = SharedMemory(create=True, size=max(1, HEADER_LENGTH + len(edges)) * itemsize)
+        array = numpy.ndarray(HEADER_LENGTH + len(edges), dtype=EDGE_DTYPE, buffer=self._memory.buf)
+        array[:HEADER_LENGTH] = (universe.start, universe.stop, length, len(edges))
+        array[HEADER_LENGTH:] = edges
+
+    @property
+    def name(self) -> str:
+        """ :return The name to attach the segment by. """
+        return self._memory.name
+
+    def unlink(self):
+        """ Unmaps the segment in this process and destroys it once every process has unmapped it. """
+        self._memory.close()
+        self._memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.unlink()
+
+    def __repr__(self):
+        return "{}(name={!r})".format(self.__class__.__name__, self.name)
+
+
+def open_shared(name: str) -> Tuple[slice, numpy.ndarray, int, SharedMemory]:
+    """ Maps the segment exported as @name without copying it.
+    :return A tuple (universe, edges, length, memory) where edges is a read-only view of the edge array in the segment
+    and memory is the SharedMemory mapping it. The view holds a buffer export of the mapping, so the mapping outlives
+    memory if need be, but memory should be kept as long as the view is in use. """
+    memory = SharedMemory(name=name)
+    array = numpy.frombuffer(memory.buf, dtype=EDGE_DTYPE)
+    start, stop, length, edge_count = array[:HEADER_LENGTH].tolist()
+    edges = array[HEADER_LENGTH:HEADER_LENGTH + edge_count]
+    edges.flags.writeable = False
+    return slice(start, stop), edges, length, memory
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+
+""" Compact binary file format for selections.
+
+A file consists of a 4-byte magic number followed by a sequence of unsigned LEB128 varints: the universe start, the
+universe stop, the number of revealed integers, the number of interval edges, and then the edges themselves, each
+encoded as its difference from the preceding edge (the first one from the universe start). Every interval start is
+stored explicitly, so the edges alternate between starts and stops. As neighbouring edges tend to be close to each
+other, most of them take up one or two bytes. """
+
+import json
+import mmap
+import sys
+from typing import Iterable, Tuple
+
+import numpy
+
+from pyromhackit.gslice.arrayselection import ArraySelection, merge_edges
+from pyromhackit.gslice.bitmapselection import BitmapSelection
+from pyromhackit.gslice.factory import selection_from_edges
+from pyromhackit.gslice.igslice import IGSlice
+from pyromhackit.gslice.imutablegslice import IMutableGSlice
+
+MAGIC = b'GSL\x01'
+HEADER_FIELD_COUNT = 4
+
+
+def encode_varints(values: numpy.ndarray) -> bytes:
+    """ :return The concatenation of the unsigned LEB128 encodings of the non-negative integers in @values. """
+    values = numpy.asarray(values, dtype=numpy.uint64)
+    if len(values) == 0:
+        return b''
+    byte_counts = numpy.ones(len(values), dtype=numpy.int64)
+    remaining = values >> numpy.uint64(7)
+    while remaining.any():
+        byte_counts += remaining > 0
+        remaining >>= numpy.uint64(7)
+    offsets = numpy.concatenate([[0], numpy.cumsum(byte_counts)[:-1]])
+    encoded = numpy.empty(int(byte_counts.sum()), dtype=numpy.uint8)
+    for k in range(int(byte_counts.max())):
+        present = byte_counts > k
+        septet = (values[present] >> numpy.uint64(7 * k)) & numpy.uint64(0x7f)
+        continued = (byte_counts[present] > k + 1).astype(numpy.uint64) << numpy.uint64(7)
+        encoded[offsets[present] + k] = (septet | continued).astype(numpy.uint8)
+    return encoded.tobytes()
+
+
+def decode_varints(data) -> numpy.ndarray:
+    """ :return The integers encoded as consecutive unsigned LEB128 varints in the buffer @data. """
+    octets = numpy.frombuffer(data, dtype=numpy.uint8)
+    if len(octets) == 0:
+        return numpy.empty(0, dtype=numpy.int64)
+    if octets[-1] & 0x80:
+        raise ValueError("Truncated varint")
+    last = numpy.flatnonzero(octets < 0x80)
+    starts = numpy.concatenate([[0], last[:-1] + 1])
+    # The position of each byte within its varint determines how far its septet is shifted
+    positions = numpy.arange(len(octets)) - numpy.repeat(starts, last - starts + 1)
+    septets = (octets & 0x7f).astype(numpy.uint64) << (7 * positions).astype(numpy.uint64)
+    return numpy.add.reduceat(septets, starts).astype(numpy.int64)
+
+
+def _explicit_edges(selection: IGSlice) -> numpy.ndarray:
+    """ :return The ascending interval edges of @selection, with every interval start stored explicitly. """
+    if isinstance(selection, ArraySelection):  # Already stored this way
+        return selection._edges
+    if isinstance(selection, BitmapSelection):
+        return selection._edge_array()
+    return numpy.array([x for pair in selection.pairs() for x in pair], dtype=numpy.int64)
+
+
+def dumps(selection: IGSlice) -> bytes:
+    """ :return The binary encoding of @selection. """
+    edges = _explicit_edges(selection)
+    universe = selection.universe
+    header = numpy.array([universe.start, universe.stop, len(selection), len(edges)], dtype=numpy.int64)
+    deltas = numpy.diff(edges, prepend=universe.start)
+    return MAGIC + encode_varints(header) + encode_varints(deltas)
+
+
+def loads(data) -> IMutableGSlice:
+    """ :return The selection encoded in the buffer @data, backed by whichever implementation suits its size. """
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a binary selection: bad magic number")
+    values = decode_varints(memoryview(data)[len(MAGIC):])
+    if len(values) < HEADER_FIELD_COUNT:
+        raise ValueError("Truncated binary selection header")
+    start, stop, revealed_count, edge_count = (int(x) for x in values[:HEADER_FIELD_COUNT])
+    deltas = values[HEADER_FIELD_COUNT:]
+    if len(deltas) != edge_count or edge_count % 2 == 1:
+        raise ValueError("Expected {} edges in binary selection, found {}".format(edge_count, len(deltas)))
+    edges = numpy.cumsum(deltas) + start
+    if int((edges[1::2] - edges[0::2]).sum()) != revealed_count:
+        raise ValueError("Binary selection is corrupt: revealed count does not match its intervals")
+    return selection_from_edges(slice(start, stop), edges, revealed_count)
+
+
+def is_binary(path: str) -> bool:
+    """ :return True iff the file with path @path starts with the magic number of the binary selection format. """
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def dump(selection: IGSlice, path: str):
+    """ Writes the binary encoding of @selection to the file with path @path. """
+    with open(path, 'wb') as f:
+        f.write(dumps(selection))
+
+
+def load(path: str) -> IMutableGSlice:
+    """ :return The selection stored in the binary file with path @path, which is memory-mapped rather than read. """
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            return loads(content)
+
+
+def pairs2selection(pairs: Iterable[Tuple[int, int]], universe: slice = None) -> IMutableGSlice:
+    """ :return The selection revealing the pairs (a, b) in @pairs. If @universe is None, the universe is taken to
+    stretch from 0 to the end of the last pair. """
+    array = numpy.array(list(pairs), dtype=numpy.int64).reshape(-1, 2)
+    edges = merge_edges(array[:, 0], array[:, 1])
+    if universe is None:
+        universe = slice(0, int(edges[-1]) if len(edges) else 0)
+    return selection_from_edges(universe, edges)
+
+
+def json2binary(json_path: str, binary_path: str, universe: slice = None):
+    """ Converts the JSON list of [a, b] pairs in the file with path @json_path, as written by
+    Hacker.dump_selection, to the binary format and writes it to @binary_path. See pairs2selection for @universe. """
+    with open(json_path, 'r') as f:
+        loaded = json.load(f)
+    dump(pairs2selection(loaded, universe), binary_path)
+
+
+if __name__ == '__main__':
+    """ Converts a JSON selection file to the binary format: storage.py IN.sel.json OUT.sel [UNIVERSE_STOP] """
+    json2binary(sys.argv[1], sys.argv[2], slice(0, int(sys.argv[3])) if len(sys.argv) == 4 else None)
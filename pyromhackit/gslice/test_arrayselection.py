@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+
+import pytest
+
+from pyromhackit.gslice.arrayselection import ArraySelection, merge_edges
+from pyromhackit.gslice.factory import make_selection, ARRAY_UNIVERSE_THRESHOLD, ARRAY_INTERVAL_THRESHOLD
+from pyromhackit.gslice.selection import Selection
+
+
+@pytest.mark.parametrize("starts, stops, expected", [
+    ([], [], []),
+    ([3], [3], []),
+    ([5, 1], [7, 3], [1, 3, 5, 7]),
+    ([1, 3], [3, 5], [1, 5]),
+    ([1, 2, 8], [9, 4, 10], [1, 10]),
+])
+def test_merge_edges(starts, stops, expected):
+    assert merge_edges(starts, stops).tolist() == expected
+
+
+class TestMatchesSelection(object):
+    """ Applies the same mutation to an ArraySelection and a Selection and checks that they agree. """
+
+    @staticmethod
+    @pytest.fixture(params=[
+        [],
+        [(0, 10)],
+        [(3, 7)],
+        [(0, 2), (4, 6), (9, 10)],
+        [(1, 2), (3, 4), (5, 6), (7, 8)],
+    ])
+    def pair(request):
+        revealed = request.param
+        return ArraySelection(slice(0, 10), revealed=revealed), Selection(slice(0, 10), revealed=revealed)
+
+    @pytest.mark.parametrize("method, args", [
+        ('include', (None, None)),
+        ('include', (1, 5)),
+        ('include', (2, 9)),
+        ('include', (-3, None)),
+        ('exclude', (None, None)),
+        ('exclude', (1, 5)),
+        ('exclude', (3, 10)),
+        ('exclude', (None, -4)),
+        ('include_expand', (None, None, 1)),
+        ('include_expand', (2, 8, (2, 0))),
+        ('include_virtual', (0, 2)),
+        ('exclude_virtual', (1, 3)),
+        ('include_many', ([(8, 9), (1, 3), (2, 5)],)),
+        ('exclude_many', ([(8, None), (1, 3), (2, 5)],)),
+    ])
+    def test_mutation(self, pair, method, args):
+        array_selection, selection = pair
+        assert getattr(array_selection, method)(*args) == getattr(selection, method)(*args)
+        assert list(array_selection.pairs()) == list(selection.pairs())
+        assert len(array_selection) == len(selection)
+
+    def test_complement(self, pair):
+        array_selection, selection = pair
+        assert list(array_selection.complement().pairs()) == list(selection.complement().pairs())
+
+    def test_translation(self, pair):
+        array_selection, selection = pair
+        for vindex in range(-len(selection), len(selection)):
+            assert array_selection.virtual2physical(vindex) == selection.virtual2physical(vindex)
+        for a, b in selection.pairs():
+            for pindex in range(a, b):
+                assert array_selection.physical2virtual(pindex) == selection.physical2virtual(pindex)
+        for a, b in selection.complement().pairs():
+            for pindex in range(a, b):
+                with pytest.raises(IndexError):
+                    array_selection.physical2virtual(pindex)
+
+    def test_select(self, pair):
+        array_selection, selection = pair
+        assert array_selection.select(b"0123456789") == selection.select(b"0123456789")
+        assert array_selection.select("0123456789") == selection.select("0123456789")
+
+    @pytest.mark.parametrize("revealed", [[], [(0, 10)], [(2, 5), (6, 9)]])
+    def test_set_algebra(self, pair, revealed):
+        array_selection, selection = pair
+        other = Selection(slice(0, 10), revealed=revealed)
+        assert array_selection | other == selection | other
+        assert array_selection & other == selection & other
+        assert array_selection - other == selection - other
+        assert array_selection ^ other == selection ^ other
+        assert isinstance(array_selection | other, ArraySelection)
+
+    def test_select_into(self, pair):
+        array_selection, selection = pair
+        destination = bytearray(len(selection))
+        assert array_selection.select_into(b"0123456789", destination) == len(selection)
+        assert destination == selection.select(b"0123456789")
+
+    def test_mul(self, pair):
+        array_selection, selection = pair
+        assert array_selection * 4 == selection * 4
+
+
+class TestIncludePartially(object):
+    @pytest.mark.parametrize("revealed, from_index, to_index, count, expected_return_value, expected_revealed", [
+        ([(5, 7), (11, 14), (17, 18)], 13, 16, 1, 2, [(5, 7), (11, 16), (17, 18)]),
+        ([(2, 6), (7, 19)], 5, 6, (3, 0), 0, [(2, 6), (7, 19)]),
+        ([(3, 4)], 0, 10, (2, 3), 5, [(0, 2), (3, 4), (7, 10)]),
+        ([], 2, 8, (10, 0), 6, [(2, 8)]),
+    ])
+    def test_include_partially(self, revealed, from_index, to_index, count, expected_return_value,
+                               expected_revealed):
+        selection = ArraySelection(slice(0, 19), revealed=revealed)
+        assert selection.include_partially(from_index, to_index, count) == expected_return_value
+        assert selection == ArraySelection(slice(0, 19), revealed=expected_revealed)
+
+
+def test_snapshot():
+    original = ArraySelection(slice(0, 10), revealed=[(2, 4), (6, 9)])
+    snapshot = original.snapshot()
+    assert snapshot._edges is original._edges
+    snapshot.include(0, 3)
+    original.exclude(6, 7)
+    assert original == ArraySelection(slice(0, 10), revealed=[(2, 4), (7, 9)])
+    assert snapshot == ArraySelection(slice(0, 10), revealed=[(0, 4), (6, 9)])
+
+
+class TestLargeSelection(object):
+    def setup(self):
+        self.universe = slice(0, 10 ** 7)
+        self.selection = ArraySelection(self.universe, intervals=range(0, 10 ** 7, 5))
+
+    def test_len(self):
+        assert len(self.selection) == 10 ** 7 // 2
+
+    def test_translation_roundtrip(self):
+        for vindex in [0, 1, 5, 12345, 10 ** 7 // 2 - 1]:
+            assert self.selection.physical2virtual(self.selection.virtual2physical(vindex)) == vindex
+
+    def test_select(self):
+        content = bytes(range(250)) * (10 ** 7 // 250)
+        selected = self.selection.select(content)
+        assert len(selected) == len(self.selection)
+        assert selected[:7] == bytes([0, 1, 2, 3, 4, 10, 11])
+        destination = bytearray(len(self.selection))
+        self.selection.select_into(content, destination)
+        assert destination == selected
+
+
+class TestFactory(object):
+    def test_small_universe(self):
+        assert isinstance(make_selection(slice(0, 100)), Selection)
+
+    def test_large_universe(self):
+        assert isinstance(make_selection(slice(0, ARRAY_UNIVERSE_THRESHOLD)), ArraySelection)
+
+    def test_many_intervals(self):
+        revealed = [(100 * i, 100 * i + 1) for i in range(ARRAY_INTERVAL_THRESHOLD)]
+        selection = make_selection(slice(0, 100 * ARRAY_INTERVAL_THRESHOLD), revealed=revealed)
+        assert isinstance(selection, ArraySelection)
+        assert selection == Selection(slice(0, 100 * ARRAY_INTERVAL_THRESHOLD), revealed=revealed)
+
+    def test_equivalent_results(self):
+        revealed = [(1, 3), (6, 8)]
+        assert make_selection(slice(0, 10), revealed=revealed) == ArraySelection(slice(0, 10), revealed=revealed)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+
+import pytest
+
+from pyromhackit.gslice.arrayselection import ArraySelection
+from pyromhackit.gslice.bitmapselection import BitmapSelection, CHUNK_SIZE
+from pyromhackit.gslice.factory import make_selection, selection_from_edges, ARRAY_INTERVAL_THRESHOLD
+from pyromhackit.gslice.selection import Selection
+
+
+class TestMatchesSelection(object):
+    """ Applies the same mutation to a BitmapSelection and a Selection and checks that they agree. """
+
+    @staticmethod
+    @pytest.fixture(params=[
+        [],
+        [(0, 10)],
+        [(3, 7)],
+        [(0, 2), (4, 6), (9, 10)],
+        [(1, 2), (3, 4), (5, 6), (7, 8)],
+    ])
+    def pair(request):
+        revealed = request.param
+        return BitmapSelection(slice(0, 10), revealed=revealed), Selection(slice(0, 10), revealed=revealed)
+
+    @pytest.mark.parametrize("method, args", [
+        ('include', (None, None)),
+        ('include', (1, 5)),
+        ('include', (-3, None)),
+        ('exclude', (None, None)),
+        ('exclude', (3, 10)),
+        ('exclude', (None, -4)),
+        ('include_expand', (2, 8, (2, 0))),
+        ('include_partially', (0, 10, (1, 1))),
+        ('include_virtual', (0, 2)),
+        ('exclude_virtual', (1, 3)),
+        ('include_many', ([(8, 9), (1, 3), (2, 5)],)),
+        ('exclude_many', ([(8, None), (1, 3), (2, 5)],)),
+    ])
+    def test_mutation(self, pair, method, args):
+        bitmap_selection, selection = pair
+        assert getattr(bitmap_selection, method)(*args) == getattr(selection, method)(*args)
+        assert list(bitmap_selection.pairs()) == list(selection.pairs())
+        assert len(bitmap_selection) == len(selection)
+
+    def test_complement(self, pair):
+        bitmap_selection, selection = pair
+        assert list(bitmap_selection.complement().pairs()) == list(selection.complement().pairs())
+
+    def test_translation(self, pair):
+        bitmap_selection, selection = pair
+        for vindex in range(-len(selection), len(selection)):
+            assert bitmap_selection.virtual2physical(vindex) == selection.virtual2physical(vindex)
+        for a, b in selection.pairs():
+            for pindex in range(a, b):
+                assert bitmap_selection.physical2virtual(pindex) == selection.physical2virtual(pindex)
+        for a, b in selection.complement().pairs():
+            for pindex in range(a, b):
+                with pytest.raises(IndexError):
+                    bitmap_selection.physical2virtual(pindex)
+
+    def test_select(self, pair):
+        bitmap_selection, selection = pair
+        assert bitmap_selection.select(b"0123456789") == selection.select(b"0123456789")
+        assert bitmap_selection.select("0123456789") == selection.select("0123456789")
+
+    @pytest.mark.parametrize("revealed", [[], [(0, 10)], [(2, 5), (6, 9)]])
+    def test_set_algebra(self, pair, revealed):
+        bitmap_selection, selection = pair
+        for other in [Selection(slice(0, 10), revealed=revealed), BitmapSelection(slice(0, 10), revealed=revealed)]:
+            assert bitmap_selection | other == selection | other
+            assert bitmap_selection & other == selection & other
+            assert bitmap_selection - other == selection - other
+            assert bitmap_selection ^ other == selection ^ other
+            assert isinstance(bitmap_selection | other, BitmapSelection)
+
+
+class TestFragmentedSelection(object):
+    """ Every other integer revealed across several chunks, which makes every container a bitmap. """
+
+    def setup(self):
+        self.universe = slice(0, 3 * CHUNK_SIZE + 100)
+        self.selection = BitmapSelection(self.universe, intervals=range(1, self.universe.stop))
+        self.expected = ArraySelection(self.universe, intervals=range(1, self.universe.stop))
+
+    def test_containers(self):
+        assert self.selection.container_kinds() == ['bitmap'] * 4
+
+    def test_len(self):
+        assert len(self.selection) == len(self.expected) == (3 * CHUNK_SIZE + 100) // 2
+
+    def test_translation_across_chunks(self):
+        for vindex in [0, CHUNK_SIZE // 2 - 1, CHUNK_SIZE // 2, 3 * CHUNK_SIZE // 2 + 7, -1]:
+            pindex = self.selection.virtual2physical(vindex)
+            assert pindex == self.expected.virtual2physical(vindex)
+            assert self.selection.physical2virtual(pindex) == self.expected.physical2virtual(pindex)
+
+    def test_count_revealed(self):
+        assert self.selection.count_revealed(CHUNK_SIZE - 3, 2 * CHUNK_SIZE + 3) == CHUNK_SIZE // 2 + 3
+
+    def test_becomes_runs_when_cleared(self):
+        self.selection.exclude(0, CHUNK_SIZE)
+        self.selection.include(2 * CHUNK_SIZE, 3 * CHUNK_SIZE)
+        assert self.selection.container_kinds() == ['runs', 'bitmap', 'runs', 'bitmap']
+        self.expected.exclude(0, CHUNK_SIZE)
+        self.expected.include(2 * CHUNK_SIZE, 3 * CHUNK_SIZE)
+        assert self.selection == self.expected
+        assert len(self.selection) == len(self.expected)
+
+    def test_set_algebra(self):
+        other = BitmapSelection(self.universe, revealed=[(10, 2 * CHUNK_SIZE + 1)])
+        assert self.selection & other == self.expected & other
+        assert self.selection ^ other == self.expected ^ other
+        assert self.selection.complement() == self.expected.complement()
+
+    def test_select(self):
+        content = bytes(range(256)) * (self.universe.stop // 256) + bytes(range(self.universe.stop % 256))
+        assert self.selection.select(content) == self.expected.select(content)
+        assert self.selection.select(memoryview(content)) == self.expected.select(content)
+
+    def test_select_into(self):
+        content = bytes(range(256)) * (self.universe.stop // 256) + bytes(range(self.universe.stop % 256))
+        self.selection.exclude(CHUNK_SIZE, 2 * CHUNK_SIZE)  # A chunk of runs between chunks of bitmaps
+        self.expected.exclude(CHUNK_SIZE, 2 * CHUNK_SIZE)
+        destination = bytearray(len(self.selection) + 1)
+        assert self.selection.select_into(content, destination) == len(self.selection)
+        assert destination == self.expected.select(content) + b'\x00'
+
+    def test_snapshot(self):
+        snapshot = self.selection.snapshot()
+        snapshot.exclude(None, None)
+        assert len(snapshot) == 0
+        assert self.selection == self.expected
+
+
+def test_sparse_selection_uses_runs():
+    selection = BitmapSelection(slice(0, 2 * CHUNK_SIZE), revealed=[(5, 10), (CHUNK_SIZE - 1, CHUNK_SIZE + 1)])
+    assert selection.container_kinds() == ['runs', 'runs']
+    assert list(selection.pairs()) == [(5, 10), (CHUNK_SIZE - 1, CHUNK_SIZE + 1)]
+    assert selection.virtual2physical(6) == CHUNK_SIZE
+
+
+class TestFactory(object):
+    def test_fragmented(self):
+        universe = slice(0, 2 * ARRAY_INTERVAL_THRESHOLD)
+        revealed = [(2 * i, 2 * i + 1) for i in range(ARRAY_INTERVAL_THRESHOLD)]
+        selection = make_selection(universe, revealed=revealed)
+        assert isinstance(selection, BitmapSelection)
+        assert selection == Selection(universe, revealed=revealed)
+
+    def test_from_edges(self):
+        universe = slice(0, 2 * ARRAY_INTERVAL_THRESHOLD)
+        selection = selection_from_edges(universe, ArraySelection(universe, intervals=range(1, universe.stop))._edges)
+        assert isinstance(selection, BitmapSelection)
+        assert len(selection) == ARRAY_INTERVAL_THRESHOLD
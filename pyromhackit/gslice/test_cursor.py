@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+import pytest
+
+from pyromhackit.gslice.arrayselection import ArraySelection
+from pyromhackit.gslice.bitmapselection import BitmapSelection
+from pyromhackit.gslice.cursor import IntervalCursor
+from pyromhackit.gslice.selection import Selection
+
+
+@pytest.fixture(params=[Selection, ArraySelection, BitmapSelection])
+def implementation(request):
+    return request.param
+
+
+class TestCursor(object):
+    @pytest.mark.parametrize("revealed, expected_runs", [
+        ([], [(0, 10, False)]),
+        ([(0, 10)], [(0, 10, True)]),
+        ([(0, 3)], [(0, 3, True), (3, 10, False)]),
+        ([(3, 10)], [(0, 3, False), (3, 10, True)]),
+        ([(2, 4), (6, 7)], [(0, 2, False), (2, 4, True), (4, 6, False), (6, 7, True), (7, 10, False)]),
+    ])
+    def test_walk(self, implementation, revealed, expected_runs):
+        cursor = implementation(slice(0, 10), revealed=revealed).cursor()
+        runs = [(cursor.start, cursor.stop, cursor.revealed)]
+        while cursor.has_next():
+            cursor.next_run()
+            runs.append((cursor.start, cursor.stop, cursor.revealed))
+        assert runs == expected_runs
+        with pytest.raises(IndexError):
+            cursor.next_run()
+        backwards = [(cursor.start, cursor.stop, cursor.revealed)]
+        while cursor.has_previous():
+            cursor.previous_run()
+            backwards.append((cursor.start, cursor.stop, cursor.revealed))
+        assert backwards == expected_runs[::-1]
+
+    def test_seek(self, implementation):
+        selection = implementation(slice(0, 10), revealed=[(2, 4), (6, 7)])
+        cursor = selection.cursor(5)
+        assert cursor.pair == (4, 6) and not cursor.revealed
+        assert cursor.seek(3) == (2, 4)
+        assert cursor.seek_virtual(2) == (6, 7)
+        assert cursor.seek_virtual(-3) == (2, 4)
+        with pytest.raises(IndexError):
+            cursor.seek(10)
+
+    def test_jump_by_kind(self, implementation):
+        cursor = implementation(slice(0, 10), revealed=[(2, 4), (6, 7)]).cursor()
+        assert cursor.next_revealed() == (2, 4)
+        assert cursor.next_revealed() == (6, 7)
+        with pytest.raises(IndexError):
+            cursor.next_revealed()
+        assert cursor.pair == (6, 7)
+        assert cursor.next_covered() == (7, 10)
+        assert cursor.previous_covered() == (4, 6)
+        assert cursor.previous_revealed() == (2, 4)
+        with pytest.raises(IndexError):
+            cursor.previous_revealed()
+
+    def test_empty_universe(self, implementation):
+        cursor = implementation(slice(0, 0), revealed=[]).cursor()
+        assert not cursor.has_next() and not cursor.has_previous()
+
+
+def test_walk_across_blocks():
+    revealed = [(3 * i, 3 * i + 1) for i in range(5 * IntervalCursor.BLOCK_SIZE)]
+    selection = Selection(slice(0, 15 * IntervalCursor.BLOCK_SIZE), revealed=revealed)
+    cursor = selection.cursor(selection.universe.stop - 1)
+    found = []
+    while True:
+        try:
+            found.append(cursor.previous_revealed())
+        except IndexError:
+            break
+    assert found == revealed[::-1]
+
+
+class TestNeighbouringSlices(object):
+    def setup(self):
+        self.selection = Selection(slice(0, 10), revealed=[(2, 4), (6, 7)])
+
+    def test_previous_slice(self):
+        assert self.selection._previous_slice(slice(2, 4)) == slice(0, 2)
+        assert self.selection._previous_slice(slice(7, 10)) == slice(6, 7)
+        with pytest.raises(ValueError):
+            self.selection._previous_slice(slice(0, 2))
+        with pytest.raises(ValueError):
+            self.selection._previous_slice(slice(3, 4))
+
+    def test_next_slice(self):
+        assert self.selection._next_slice(slice(2, 4)) == slice(4, 6)
+        assert self.selection._next_slice(slice(0, 2)) == slice(2, 4)
+        with pytest.raises(ValueError):
+            self.selection._next_slice(slice(7, 10))
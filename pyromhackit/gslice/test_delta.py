@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+import pytest
+
+from pyromhackit.gslice.arrayselection import ArraySelection
+from pyromhackit.gslice.bitmapselection import BitmapSelection
+from pyromhackit.gslice.delta import SelectionDelta
+from pyromhackit.gslice.selection import Selection
+
+
+@pytest.fixture(params=[Selection, ArraySelection, BitmapSelection])
+def selection(request):
+    return request.param(slice(0, 20), revealed=[(2, 5), (8, 9), (12, 18)])
+
+
+class TestListeners(object):
+    @pytest.mark.parametrize("method, args, expected", [
+        ('include', (0, 10), SelectionDelta(revealed=[(0, 2), (5, 8), (9, 10)], covered=[])),
+        ('exclude', (4, 13), SelectionDelta(revealed=[], covered=[(4, 5), (8, 9), (12, 13)])),
+        ('include_many', ([(0, 1), (18, 20)],), SelectionDelta(revealed=[(0, 1), (18, 20)], covered=[])),
+        ('exclude_many', ([(0, 3), (17, 20)],), SelectionDelta(revealed=[], covered=[(2, 3), (17, 18)])),
+        ('include_partially', (0, 20, 1), SelectionDelta(revealed=[(0, 1), (19, 20)], covered=[])),
+        ('include_expand', (None, None, (1, 0)), SelectionDelta(revealed=[(1, 2), (7, 8), (11, 12)], covered=[])),
+        ('include_virtual', (2, 4), SelectionDelta(revealed=[(5, 8), (9, 12)], covered=[])),
+        ('exclude_virtual', (0, 4), SelectionDelta(revealed=[], covered=[(2, 5), (8, 9)])),
+    ])
+    def test_delta(self, selection, method, args, expected):
+        deltas = []
+        selection.add_listener(deltas.append)
+        getattr(selection, method)(*args)
+        assert deltas == [expected]
+
+    def test_no_change(self, selection):
+        deltas = []
+        selection.add_listener(deltas.append)
+        selection.include(2, 5)
+        selection.exclude(5, 8)
+        assert deltas == []
+
+    def test_remove_listener(self, selection):
+        deltas = []
+        selection.add_listener(deltas.append)
+        selection.remove_listener(deltas.append)
+        selection.include(None, None)
+        assert deltas == []
+        with pytest.raises(ValueError):
+            selection.remove_listener(deltas.append)
+
+    def test_snapshot_has_no_listeners(self, selection):
+        deltas = []
+        selection.add_listener(deltas.append)
+        snapshot = selection.snapshot()
+        snapshot.include(None, None)
+        assert deltas == [] and snapshot.listeners == ()
+
+
+def test_between():
+    delta = SelectionDelta.between([(0, 4), (6, 8)], [(2, 7)])
+    assert delta == SelectionDelta(revealed=[(4, 6)], covered=[(0, 2), (7, 8)])
+    assert not SelectionDelta.between([(1, 2)], [(1, 2)])
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+
+import numpy
+import pytest
+
+from pyromhackit.gslice.arrayselection import ArraySelection
+from pyromhackit.gslice.bitmapselection import BitmapSelection
+from pyromhackit.gslice.edges import edges2mask, mask2edges
+from pyromhackit.gslice.factory import selection_from_mask
+from pyromhackit.gslice.selection import Selection
+
+
+@pytest.mark.parametrize("mask, edges", [
+    ([], []),
+    ([0, 0, 0], []),
+    ([1, 1, 1], [0, 3]),
+    ([0, 1, 1, 0, 1], [1, 3, 4, 5]),
+    ([1, 0, 0, 1, 0], [0, 1, 3, 4]),
+])
+def test_mask2edges(mask, edges):
+    assert mask2edges(numpy.array(mask, dtype=bool)).tolist() == edges
+    assert mask2edges(numpy.array(mask, dtype=float) * 0.5).tolist() == edges
+    assert edges2mask(slice(0, len(mask)), numpy.array(edges)).tolist() == [bool(x) for x in mask]
+
+
+@pytest.fixture(params=[Selection, ArraySelection, BitmapSelection])
+def implementation(request):
+    return request.param
+
+
+class TestMaskInterop(object):
+    def setup(self):
+        self.revealed = [(0, 2), (4, 6), (9, 10)]
+        self.mask = numpy.array([1, 1, 0, 0, 1, 1, 0, 0, 0, 1], dtype=bool)
+
+    def test_to_mask(self, implementation):
+        selection = implementation(slice(0, 10), revealed=self.revealed)
+        assert (selection.to_mask() == self.mask).all()
+        assert selection.to_mask(numpy.float64).tolist() == self.mask.astype(float).tolist()
+
+    def test_from_mask(self, implementation):
+        selection = implementation.from_mask(self.mask)
+        assert isinstance(selection, implementation)
+        assert selection == Selection(slice(0, 10), revealed=self.revealed)
+        assert len(selection) == 5
+
+    def test_to_array(self, implementation):
+        selection = implementation(slice(0, 10), revealed=self.revealed)
+        assert selection.to_array().tolist() == [list(pair) for pair in self.revealed]
+
+    def test_from_array(self, implementation):
+        selection = implementation.from_array(slice(0, 10), numpy.array([[9, 10], [4, 5], [0, 2], [5, 6]]))
+        assert selection == Selection(slice(0, 10), revealed=self.revealed)
+
+    def test_empty(self, implementation):
+        selection = implementation.from_mask(numpy.zeros(0, dtype=bool))
+        assert len(selection) == 0 and selection.to_mask().shape == (0,)
+
+
+def test_selection_from_mask():
+    mask = numpy.arange(10 ** 5) % 3 == 0
+    selection = selection_from_mask(mask)
+    assert isinstance(selection, BitmapSelection)
+    assert (selection.to_mask() == mask).all()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+
+import pytest
+
+from pyromhackit.gslice.intervalmap import IntervalMap
+from pyromhackit.gslice.selection import Selection
+
+
+class TestIntervalMap(object):
+    def setup(self):
+        self.regions = IntervalMap(slice(0, 100), [(0, 10, 'header'), (10, 40, 'script'), (60, 80, 'graphics'),
+                                                   (80, 90, 'script')])
+
+    @pytest.mark.parametrize("pindex, expected", [(0, 'header'), (9, 'header'), (10, 'script'), (59, None),
+                                                  (85, 'script'), (99, None)])
+    def test_get(self, pindex, expected):
+        assert self.regions.get(pindex) == expected
+
+    def test_stabbing(self):
+        assert self.regions.interval_at(65) == (60, 80, 'graphics')
+        assert self.regions[39] == 'script'
+        assert 40 not in self.regions
+        with pytest.raises(KeyError):
+            self.regions[40]
+
+    def test_items(self):
+        assert list(self.regions.items(5, 65)) == [(5, 10, 'header'), (10, 40, 'script'), (60, 65, 'graphics')]
+        assert list(self.regions.items(40, 60)) == []
+        assert len(self.regions) == 4
+
+    def test_assign_splits_and_merges(self):
+        self.regions.assign(30, 70, 'script')
+        assert list(self.regions) == [(0, 10, 'header'), (10, 70, 'script'), (70, 80, 'graphics'), (80, 90, 'script')]
+        self.regions.assign(70, 80, 'script')
+        assert list(self.regions) == [(0, 10, 'header'), (10, 90, 'script')]
+        with pytest.raises(ValueError):
+            self.regions.assign(0, 1, None)
+
+    def test_discard(self):
+        self.regions.discard(5, 15)
+        assert list(self.regions.items(None, 20)) == [(0, 5, 'header'), (15, 20, 'script')]
+
+    def test_relabel(self):
+        self.regions.relabel({'script': 'pointers', 'graphics': None}, 20, None)
+        assert list(self.regions) == [(0, 10, 'header'), (10, 20, 'script'), (20, 40, 'pointers'), (80, 90, 'pointers')]
+        self.regions.relabel(str.upper)
+        assert self.regions.labels() == {'HEADER', 'SCRIPT', 'POINTERS'}
+
+    def test_selection(self):
+        assert self.regions.selection('script') == Selection(slice(0, 100), revealed=[(10, 40), (80, 90)])
+        assert self.regions.selection('script', 20, 85) == Selection(slice(0, 100), revealed=[(20, 40), (80, 85)])
+        assert len(self.regions.selection('code')) == 0
+
+    def test_selections(self):
+        selections = self.regions.selections()
+        assert set(selections) == {'header', 'script', 'graphics'}
+        assert list(selections['graphics'].pairs()) == [(60, 80)]
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+
+import pytest
+
+from pyromhackit.gslice.arrayselection import ArraySelection
+from pyromhackit.gslice.bitmapselection import BitmapSelection
+from pyromhackit.gslice.lazyview import SelectionView
+from pyromhackit.gslice.selection import Selection
+
+
+@pytest.fixture(params=[Selection, ArraySelection, BitmapSelection])
+def selection(request):
+    return request.param(slice(0, 10), revealed=[(0, 2), (4, 6), (9, 10)])
+
+
+class TestComplementView(object):
+    def test_pairs(self, selection):
+        view = selection.complement_view()
+        assert isinstance(view, SelectionView)
+        assert list(view.pairs()) == list(selection.complement().pairs())
+        assert len(view) == 5
+
+    def test_membership(self, selection):
+        view = selection.complement_view()
+        assert [p for p in range(10) if p in view] == [2, 3, 6, 7, 8]
+
+    def test_translation(self, selection):
+        view = selection.complement_view()
+        assert [view.virtual2physical(v) for v in range(5)] == [2, 3, 6, 7, 8]
+        assert view.virtual2physical(-1) == 8
+        assert view.physical2virtual(6) == 2
+        with pytest.raises(IndexError):
+            view.physical2virtual(4)
+
+    def test_complement(self, selection):
+        assert selection.complement_view().complement() == selection
+
+    def test_follows_parent(self, selection):
+        view = selection.complement_view()
+        selection.include(2, 4)
+        assert list(view.pairs()) == [(6, 9)]
+
+
+class TestSubsliceView(object):
+    @pytest.mark.parametrize("from_index, to_index", [(None, None), (1, 5), (3, 4), (5, 10), (8, 20), (7, 2)])
+    def test_matches_subslice(self, selection, from_index, to_index):
+        view = selection.subslice_view(from_index, to_index)
+        expected = ArraySelection(slice(0, 10), revealed=[(0, 2), (4, 6), (9, 10)]).subslice(from_index, to_index)
+        assert list(view.pairs()) == list(expected.pairs())
+        assert len(view) == len(expected)
+
+    def test_translation(self, selection):
+        view = selection.subslice_view(1, 5)
+        assert [view.virtual2physical(v) for v in range(len(view))] == [1, 4]
+        assert view.physical2virtual(4) == 1
+        assert 0 not in view
+
+    def test_select(self, selection):
+        assert selection.subslice_view(1, 9).select(b"0123456789") == b"145"
+
+    def test_nested(self, selection):
+        view = selection.complement_view().subslice(3, 8)
+        assert list(view.pairs()) == [(3, 4), (6, 8)]
+        assert list(view.subslice(None, 7).pairs()) == [(3, 4), (6, 7)]
+
+    def test_materialize(self, selection):
+        materialized = selection.subslice_view(1, 5).materialize()
+        assert type(materialized) is type(selection)
+        selection.exclude(None, None)
+        assert list(materialized.pairs()) == [(1, 2), (4, 5)]
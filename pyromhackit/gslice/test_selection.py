@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 
+import mmap
 import os
+from copy import deepcopy
 from typing import Tuple, Optional, Union
 
 import pytest
@@ -64,6 +66,10 @@ class TestInclude(object):
         ([(0, 5)], 1, 2, 0, [(0, 5)]),
         ([(2, 5), (6, 9)], 9, 10, 1, [(2, 5), (6, 10)]),
         ([(1, 2), (3, 4), (5, 6), (7, 8)], 4, 6, 1, [(1, 2), (3, 6), (7, 8)]),
+        ([(2, 4), (6, 7)], 3, 9, 4, [(2, 9)]),
+        ([(2, 4), (6, 9)], 1, 7, 3, [(1, 9)]),
+        ([(2, 4)], 0, 3, 2, [(0, 4)]),
+        ([(0, 2), (5, 6), (9, 10)], None, None, 6, [(0, 10)]),
     ])
     def data_and_expected(request):
         revealed, from_index, to_index, expected_return_value, expected_revealed = request.param
@@ -247,6 +253,10 @@ class TestExclude(object):
         ([(0, 2), (5, 6), (9, 10)], None, 9, 3, [(9, 10)]),
         ([(0, 2), (3, 4), (5, 6), (8, 10)], 1, 9, 4, [(0, 1), (9, 10)]),
         ([(1, 2), (3, 4), (5, 6), (8, 10)], 1, 9, 4, [(9, 10)]),
+        ([(2, 4), (6, 8)], 2, 9, 4, []),
+        ([(2, 4), (6, 8)], 3, 9, 3, [(2, 3)]),
+        ([(2, 4), (6, 9)], 1, 7, 3, [(7, 9)]),
+        ([(0, 4), (6, 9)], 2, 6, 2, [(0, 2), (6, 9)]),
     ])
     def data_and_expected(request):
         revealed, from_index, to_index, expected_return_value, expected_revealed = request.param
@@ -373,6 +383,8 @@ class TestIncludePartially(object):
         ([(0, 2), (7, 10)], 7, 8, 1, [(0, 2), (7, 10)]),
         ([(0, 2), (7, 10)], 8, 9, 1, [(0, 2), (7, 10)]),
         ([(0, 2), (4, 6), (9, 10)], None, None, 1, [(0, 3), (4, 6), (8, 10)]),
+        ([], 8, 9, 1, [(8, 9)]),
+        ([(3, 5), (6, 9)], 3, 5, 1, [(3, 5), (6, 9)]),
     ])
     def data(request):
         revealed, from_index, to_index, count, expected_revealed = request.param
@@ -451,6 +463,50 @@ class TestVirtualExclusion(object):
         assert self.v == Selection(universe=slice(0, 5), revealed=[])
 
 
+class TestVirtualSelection2Physical(object):
+    def setup(self):
+        self.v = Selection(slice(0, 20), revealed=[(2, 5), (8, 9), (12, 18)])
+
+    @pytest.mark.parametrize("vrevealed, expected_revealed", [
+        ([], []),
+        ([(0, 10)], [(2, 5), (8, 9), (12, 18)]),
+        ([(1, 2), (3, 5)], [(3, 4), (8, 9), (12, 13)]),
+        ([(2, 3), (4, 5), (8, 12)], [(4, 5), (12, 13), (16, 18)]),
+        ([(9, 30)], [(17, 18)]),
+    ])
+    def test_translation(self, vrevealed, expected_revealed):
+        vselection = Selection(slice(0, len(self.v)), revealed=vrevealed)
+        assert self.v.virtualselection2physical(vselection) == Selection(slice(0, 20), revealed=expected_revealed)
+
+    def test_agrees_with_per_interval_translation(self):
+        vselection = Selection(slice(0, len(self.v)), revealed=[(0, 1), (2, 4), (6, 9)])
+        expected = Selection(slice(0, 20), revealed=[])
+        for a, b in vselection.pairs():
+            expected.include_many(self.v.virtual2physicalselection(slice(a, b)).pairs())
+        assert self.v.virtualselection2physical(vselection) == expected
+
+
+class TestCompose(object):
+    def setup(self):
+        self.outer = Selection(slice(0, 20), revealed=[(2, 5), (8, 9), (12, 18)])
+
+    def test_compose(self):
+        inner = Selection(slice(0, len(self.outer)), revealed=[(1, 2), (3, 5)])
+        assert self.outer.compose(inner) == Selection(slice(0, 20), revealed=[(3, 4), (8, 9), (12, 13)])
+
+    def test_stacked(self):
+        middle = Selection(slice(0, len(self.outer)), revealed=[(0, 2), (4, 10)])
+        inner = Selection(slice(0, len(middle)), revealed=[(1, 3), (6, 8)])
+        stacked = self.outer.compose(middle.compose(inner))
+        assert stacked == self.outer.compose(middle).compose(inner)
+        expected = [self.outer[middle[v]] for a, b in inner.pairs() for v in range(a, b)]
+        assert [p for a, b in stacked.pairs() for p in range(a, b)] == expected
+
+    def test_universe_mismatch(self):
+        with pytest.raises(ValueError):
+            self.outer.compose(Selection(slice(0, 20)))
+
+
 def test_exclude_all_and_include():
     v = Selection(slice(0, 10))
     v.exclude(0, 10)
@@ -636,3 +692,184 @@ class TestNormalization(object):
         self.v.exclude(1, 2)
         self.v.include(2, 3)
         assert self.v.slices() == [slice(0, 1), slice(2, 5)]
+
+
+class TestCumulativeIndex(object):
+    def setup(self):
+        self.v = Selection(universe=slice(0, 20), revealed=[slice(0, 2), slice(5, 9), slice(12, 13), slice(17, 20)])
+        self.v.virtual2physical(0)  # Builds the index before the selection is mutated
+
+    @staticmethod
+    def revealed_indices(selection: Selection):
+        return [i for a, b in selection.pairs() for i in range(a, b)]
+
+    @pytest.mark.parametrize("from_index, to_index, method", [
+        (1, 6, "exclude"),
+        (0, 20, "exclude"),
+        (None, None, "include"),
+        (2, 5, "include"),
+        (9, 17, "include"),
+        (6, 7, "exclude"),
+        (13, 19, "include"),
+        (-3, None, "exclude"),
+    ])
+    def test_translation_after_mutation(self, from_index, to_index, method):
+        getattr(self.v, method)(from_index, to_index)
+        for vindex, pindex in enumerate(self.revealed_indices(self.v)):
+            assert self.v.virtual2physical(vindex) == pindex
+            assert self.v.physical2virtual(pindex) == vindex
+        with pytest.raises(IndexError):
+            self.v.virtual2physical(len(self.v))
+
+    @pytest.mark.parametrize("from_index, to_index, expected", [
+        (None, None, 10),
+        (0, 20, 10),
+        (1, 6, 2),
+        (2, 5, 0),
+        (8, 18, 3),
+        (12, 13, 1),
+        (-3, None, 3),
+        (10, 10, 0),
+    ])
+    def test_count_revealed(self, from_index, to_index, expected):
+        assert self.v.count_revealed(from_index, to_index) == expected
+
+
+class TestBulkMutation(object):
+    @pytest.mark.parametrize("revealed, intervals, expected_return_value, expected_revealed", [
+        ([], [], 0, []),
+        ([], [(5, 7), (1, 3), (2, 4)], 5, [(1, 4), (5, 7)]),
+        ([(3, 7)], [(1, 3), (7, 8), (9, None)], 4, [(1, 8), (9, 10)]),
+        ([(0, 2), (4, 6), (9, 10)], [(1, 5), (5, 9)], 5, [(0, 10)]),
+        ([(2, 4)], [(-2, None), (0, 1)], 3, [(0, 1), (2, 4), (8, 10)]),
+    ])
+    def test_include_many(self, revealed, intervals, expected_return_value, expected_revealed):
+        selection = Selection(universe=slice(0, 10), revealed=revealed)
+        assert selection.include_many(intervals) == expected_return_value
+        assert selection == Selection(universe=slice(0, 10), revealed=expected_revealed)
+        assert len(selection) == sum(b - a for a, b in expected_revealed)
+
+    @pytest.mark.parametrize("revealed, intervals, expected_return_value, expected_revealed", [
+        ([(0, 10)], [], 0, [(0, 10)]),
+        ([(0, 10)], [(5, 7), (1, 3), (2, 4)], 5, [(0, 1), (4, 5), (7, 10)]),
+        ([(3, 7)], [(1, 4), (6, 8)], 2, [(4, 6)]),
+        ([(0, 2), (4, 6), (9, 10)], [(1, 5), (5, 9)], 3, [(0, 1), (9, 10)]),
+        ([(0, 10)], [(None, 2), (-3, None)], 5, [(2, 7)]),
+    ])
+    def test_exclude_many(self, revealed, intervals, expected_return_value, expected_revealed):
+        selection = Selection(universe=slice(0, 10), revealed=revealed)
+        assert selection.exclude_many(intervals) == expected_return_value
+        assert selection == Selection(universe=slice(0, 10), revealed=expected_revealed)
+        assert len(selection) == sum(b - a for a, b in expected_revealed)
+
+    def test_translation_after_bulk_mutation(self):
+        selection = Selection(universe=slice(0, 10), revealed=[(0, 10)])
+        assert selection.virtual2physical(5) == 5  # Builds the cumulative index
+        selection.exclude_many([(1, 3), (6, 7)])
+        assert [selection.virtual2physical(i) for i in range(len(selection))] == [0, 3, 4, 5, 7, 8, 9]
+
+
+class TestSetAlgebra(object):
+    def setup(self):
+        self.a = Selection(universe=slice(0, 10), revealed=[(0, 2), (4, 7)])
+        self.b = Selection(universe=slice(0, 10), revealed=[(1, 5), (9, 10)])
+
+    @pytest.mark.parametrize("operation, expected_revealed", [
+        (lambda a, b: a | b, [(0, 7), (9, 10)]),
+        (lambda a, b: a & b, [(1, 2), (4, 5)]),
+        (lambda a, b: a - b, [(0, 1), (5, 7)]),
+        (lambda a, b: b - a, [(2, 4), (9, 10)]),
+        (lambda a, b: a ^ b, [(0, 1), (2, 4), (5, 7), (9, 10)]),
+    ])
+    def test_operation(self, operation, expected_revealed):
+        result = operation(self.a, self.b)
+        assert result == Selection(universe=slice(0, 10), revealed=expected_revealed)
+        assert len(result) == sum(b - a for a, b in expected_revealed)
+
+    def test_operands_unchanged(self):
+        _ = self.a | self.b
+        assert self.a == Selection(universe=slice(0, 10), revealed=[(0, 2), (4, 7)])
+        assert self.b == Selection(universe=slice(0, 10), revealed=[(1, 5), (9, 10)])
+
+    def test_complement_identities(self):
+        assert self.a | self.a.complement() == Selection(universe=slice(0, 10))
+        assert self.a & self.a.complement() == Selection(universe=slice(0, 10), revealed=[])
+        assert self.a ^ self.b == (self.a | self.b) - (self.a & self.b)
+
+    def test_different_universes_raises(self):
+        with pytest.raises(ValueError):
+            _ = self.a | Selection(universe=slice(0, 11))
+
+
+class TestSnapshot(object):
+    def setup(self):
+        self.original = Selection(universe=slice(0, 10), revealed=[(2, 4), (6, 9)])
+        self.original.virtual2physical(0)  # Builds the cumulative index
+        self.snapshot = self.original.snapshot()
+
+    def test_shares_edges_until_mutation(self):
+        assert self.snapshot == self.original
+        assert self.snapshot._intervals is self.original._intervals
+
+    def test_mutating_snapshot_leaves_original(self):
+        self.snapshot.include(0, 3)
+        self.snapshot.exclude_many([(7, 8)])
+        assert self.original == Selection(universe=slice(0, 10), revealed=[(2, 4), (6, 9)])
+        assert self.snapshot == Selection(universe=slice(0, 10), revealed=[(0, 4), (6, 7), (8, 9)])
+        assert [self.original.virtual2physical(i) for i in range(5)] == [2, 3, 6, 7, 8]
+
+    def test_mutating_original_leaves_snapshot(self):
+        self.original.exclude(None, None)
+        assert self.snapshot == Selection(universe=slice(0, 10), revealed=[(2, 4), (6, 9)])
+        assert [self.snapshot.virtual2physical(i) for i in range(5)] == [2, 3, 6, 7, 8]
+        assert len(self.original) == 0
+
+    def test_last_sharer_mutates_in_place(self):
+        self.original.include(0, 1)
+        intervals = self.snapshot._intervals
+        self.snapshot.include(0, 1)
+        assert self.snapshot._intervals is intervals
+
+    def test_dropped_snapshot_releases_share(self):
+        del self.snapshot
+        self.original.snapshot()  # Discarded at once, as callers that only read do
+        intervals, index = self.original._intervals, self.original._index
+        self.original.include(0, 1)
+        assert self.original._intervals is intervals
+        assert self.original._index is index
+
+    def test_snapshot_keeps_subclass(self):
+        class Subselection(Selection):
+            pass
+        assert type(Subselection(universe=slice(0, 10)).snapshot()) is Subselection
+
+    def test_deepcopy(self):
+        copy = deepcopy(self.original)
+        copy.exclude(None, None)
+        assert len(self.original) == 5
+
+
+class TestSegments(object):
+    def setup(self):
+        self.content = mmap.mmap(-1, 10)
+        self.content.write(b"0123456789")
+        self.selection = Selection(universe=slice(0, 10), revealed=[(1, 3), (5, 6), (8, 10)])
+
+    def teardown(self):
+        self.content.close()
+
+    def test_iter_segments(self):
+        segments = list(self.selection.iter_segments(self.content))
+        assert all(isinstance(segment, memoryview) for segment in segments)
+        assert [bytes(segment) for segment in segments] == [b"12", b"5", b"89"]
+        for segment in segments:
+            segment.release()
+
+    def test_select_into(self):
+        destination = bytearray(7)
+        assert self.selection.select_into(self.content, destination) == 5
+        assert destination == b"12589\x00\x00"
+
+    def test_select_mmap(self):
+        assert self.selection.select(self.content) == b"12589"
+        self.content.close()  # No views left behind
@@ -172,26 +172,20 @@ class TestPreviousSlice(object):
         for i in range(0, n):
             selection._previous_slice(slice(2 * i + 1, 2 * i + 2))
 
-    @pytest.mark.skip()
     def test_previous_slice_50_covered(self, benchmark):
         benchmark(self.covered_previous_slice_n_times, self.v, 50)
 
-    @pytest.mark.skip()
     def test_previous_slice_100_covered(self, benchmark):
         benchmark(self.covered_previous_slice_n_times, self.v, 100)
 
-    @pytest.mark.skip()
     def test_previous_slice_200_covered(self, benchmark):
         benchmark(self.covered_previous_slice_n_times, self.v, 200)
 
-    @pytest.mark.skip()
     def test_previous_slice_50_revealed(self, benchmark):
         benchmark(self.revealed_previous_slice_n_times, self.v, 50)
 
-    @pytest.mark.skip()
     def test_previous_slice_100_revealed(self, benchmark):
         benchmark(self.revealed_previous_slice_n_times, self.v, 100)
 
-    @pytest.mark.skip()
     def test_previous_slice_200_revealed(self, benchmark):
         benchmark(self.revealed_previous_slice_n_times, self.v, 200)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+
+""" Measures how the running time and memory use of the selection implementations grow with the size of the universe
+and the number of intervals, and fails when an operation grows faster than it should. The growth is measured by fitting
+t = c*n^k to the measurements, where k is the empirical complexity exponent: about 0 for logarithmic operations and
+about 1 for linear ones. """
+
+import gc
+import math
+import time
+import tracemalloc
+
+import numpy
+import pytest
+
+from pyromhackit.gslice.arrayselection import ArraySelection
+from pyromhackit.gslice.bitmapselection import BitmapSelection
+from pyromhackit.gslice.selection import Selection
+
+UNIVERSE_SIZES = [10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8]
+FRAGMENT_COUNTS = [1, 10, 10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+
+LOGARITHMIC_EXPONENT_LIMIT = 0.4  # A linear operation has an exponent of about 1
+LINEAR_EXPONENT_LIMIT = 1.3  # A quadratic operation has an exponent of about 2
+ROUNDS = 5  # Number of times each measurement is repeated, of which the fastest counts
+CALLS_PER_ROUND = 200  # Number of calls per measurement of a logarithmic operation
+MASK_FRAGMENT_COUNT = 10 ** 5  # Number of intervals of the selection whose mask round-trip is timed
+MASK_ROUNDTRIP_SECONDS_LIMIT = 1  # Time allowed for the mask round-trip over a universe of UNIVERSE_SIZES[-1] elements
+
+BYTES_PER_FRAGMENT_LIMIT = {  # Peak memory use when building a selection with 10^6 intervals, per interval
+    Selection: 400,
+    ArraySelection: 64,
+    BitmapSelection: 128,  # Splitting the intervals into chunks takes a few temporary arrays
+}
+
+
+def fragmented(implementation: type, universe_size: int, fragment_count: int):
+    """ :return A selection of [0, @universe_size) revealing @fragment_count evenly spaced intervals, each half as long
+    as the distance between them. """
+    stride = universe_size // fragment_count
+    starts = numpy.arange(fragment_count, dtype=numpy.int64) * stride + stride // 4
+    edges = numpy.empty(2 * fragment_count, dtype=numpy.int64)
+    edges[0::2] = starts
+    edges[1::2] = starts + max(1, stride // 2)
+    if implementation is Selection:
+        return Selection(slice(0, universe_size), intervals=edges.tolist())
+    return implementation._from_edges(slice(0, universe_size), edges)
+
+
+def seconds_per_call(function, arguments: list) -> float:
+    """ :return The least average time, over ROUNDS rounds, that calling @function with each of @arguments took. """
+    best = math.inf
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for argument in arguments:
+            function(*argument)
+        best = min(best, (time.perf_counter() - start) / len(arguments))
+    return best
+
+
+def complexity_exponent(sizes: list, measurements: list) -> float:
+    """ :return The exponent k of the power law c*n^k that best fits @measurements taken at the problem sizes @sizes,
+    in the least squares sense on a log-log scale. """
+    return float(numpy.polyfit(numpy.log(sizes), numpy.log(measurements), 1)[0])
+
+
+def peak_bytes(function) -> int:
+    """ :return The peak number of bytes allocated while calling @function, as traced by tracemalloc. """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("implementation", [Selection, ArraySelection, BitmapSelection])
+class TestLogarithmicOperations(object):
+    """ Operations that should stay O(log(n)) as the number of intervals n grows by four orders of magnitude. """
+    universe_size = 10 ** 8
+    fragment_counts = FRAGMENT_COUNTS[2:]
+
+    def test_exponent(self, implementation, record_property):
+        rng = numpy.random.RandomState(0)
+        timings = {'virtual2physical': [], 'physical2virtual': [], 'count_revealed': []}
+        for fragment_count in self.fragment_counts:
+            selection = fragmented(implementation, self.universe_size, fragment_count)
+            vindices = rng.randint(0, len(selection), CALLS_PER_ROUND).tolist()
+            pindices = [selection.virtual2physical(vindex) for vindex in vindices]  # Builds any lazy index
+            ranges = sorted(rng.randint(0, self.universe_size, 2).tolist() for _ in range(CALLS_PER_ROUND))
+            timings['virtual2physical'].append(seconds_per_call(selection.virtual2physical, [(v,) for v in vindices]))
+            timings['physical2virtual'].append(seconds_per_call(selection.physical2virtual, [(p,) for p in pindices]))
+            timings['count_revealed'].append(seconds_per_call(selection.count_revealed, ranges))
+            del selection
+        for operation, seconds in timings.items():
+            exponent = complexity_exponent(self.fragment_counts, seconds)
+            record_property(operation, {'seconds': seconds, 'exponent': exponent})
+            assert exponent < LOGARITHMIC_EXPONENT_LIMIT, "{} scales as n^{:.2f}".format(operation, exponent)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("implementation", [Selection, ArraySelection, BitmapSelection])
+class TestLinearOperations(object):
+    """ Operations that should stay O(n) (or better) in the number of intervals n. """
+    universe_size = 10 ** 7
+    fragment_counts = FRAGMENT_COUNTS[2:]
+
+    def test_exponent(self, implementation, record_property):
+        content = bytes(range(256)) * (self.universe_size // 256 + 1)
+        other = fragmented(implementation, self.universe_size, 1000)
+        operations = {
+            'complement': lambda selection: selection.complement(),
+            'select': lambda selection: selection.select(content),
+            '__mul__': lambda selection: selection * 3,
+            '__or__': lambda selection: selection | other,
+            '__and__': lambda selection: selection & other,
+            '__xor__': lambda selection: selection ^ other,
+        }
+        timings = {operation: [] for operation in operations}
+        for fragment_count in self.fragment_counts:
+            selection = fragmented(implementation, self.universe_size, fragment_count)
+            for operation, function in operations.items():
+                timings[operation].append(seconds_per_call(function, [(selection,)]))
+            del selection
+        for operation, seconds in timings.items():
+            exponent = complexity_exponent(self.fragment_counts, seconds)
+            record_property(operation, {'seconds': seconds, 'exponent': exponent})
+            assert exponent < LINEAR_EXPONENT_LIMIT, "{} scales as n^{:.2f}".format(operation, exponent)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("implementation", [Selection, ArraySelection])
+class TestUniverseSize(object):
+    """ The edge-based implementations should not care how large the universe is, only how many intervals it has. """
+    fragment_count = 100
+
+    def test_exponent(self, implementation, record_property):
+        timings = {'virtual2physical': [], 'complement': []}
+        for universe_size in UNIVERSE_SIZES:
+            selection = fragmented(implementation, universe_size, self.fragment_count)
+            vindices = [(vindex,) for vindex in range(0, len(selection), max(1, len(selection) // CALLS_PER_ROUND))]
+            timings['virtual2physical'].append(seconds_per_call(selection.virtual2physical, vindices))
+            timings['complement'].append(seconds_per_call(selection.complement, [()]))
+        for operation, seconds in timings.items():
+            exponent = complexity_exponent(UNIVERSE_SIZES, seconds)
+            record_property(operation, {'seconds': seconds, 'exponent': exponent})
+            assert exponent < LOGARITHMIC_EXPONENT_LIMIT, "{} scales as U^{:.2f}".format(operation, exponent)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("implementation", [Selection, ArraySelection, BitmapSelection])
+class TestPeakMemory(object):
+    universe_size = 10 ** 8
+
+    def test_bytes_per_fragment(self, implementation, record_property):
+        peaks = [peak_bytes(lambda: fragmented(implementation, self.universe_size, fragment_count))
+                 for fragment_count in FRAGMENT_COUNTS]
+        record_property('peak_bytes', dict(zip(FRAGMENT_COUNTS, peaks)))
+        record_property('exponent', complexity_exponent(FRAGMENT_COUNTS[3:], peaks[3:]))
+        assert peaks[-1] / FRAGMENT_COUNTS[-1] < BYTES_PER_FRAGMENT_LIMIT[implementation]
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("implementation", [Selection, ArraySelection, BitmapSelection])
+def test_mask_roundtrip(implementation, record_property):
+    """ Converting to a mask and back should stay O(U) in the size of the universe U, with an interval per 100 elements.
+    """
+    universe_sizes = UNIVERSE_SIZES[:-1]
+    timings = []
+    for universe_size in universe_sizes:
+        selection = fragmented(implementation, universe_size, universe_size // 100)
+        assert implementation.from_mask(selection.to_mask()) == selection
+        timings.append(seconds_per_call(lambda s: implementation.from_mask(s.to_mask()), [(selection,)]))
+        del selection
+    exponent = complexity_exponent(universe_sizes, timings)
+    record_property('seconds', timings)
+    record_property('exponent', exponent)
+    assert exponent < LINEAR_EXPONENT_LIMIT, "The mask roundtrip scales as U^{:.2f}".format(exponent)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("implementation", [Selection, ArraySelection, BitmapSelection])
+def test_mask_roundtrip_seconds(implementation, record_property):
+    """ A mask over the largest universe should convert to a selection and back well within a second. """
+    selection = fragmented(implementation, UNIVERSE_SIZES[-1], MASK_FRAGMENT_COUNT)
+    assert implementation.from_mask(selection.to_mask()) == selection
+    seconds = seconds_per_call(lambda s: implementation.from_mask(s.to_mask()), [(selection,)])
+    record_property('seconds', seconds)
+    assert seconds < MASK_ROUNDTRIP_SECONDS_LIMIT
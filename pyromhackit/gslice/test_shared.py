@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+
+import multiprocessing
+
+import pytest
+
+from pyromhackit.gslice.arrayselection import ArraySelection
+from pyromhackit.gslice.bitmapselection import BitmapSelection
+from pyromhackit.gslice.selection import Selection
+
+
+@pytest.fixture(params=[Selection, ArraySelection, BitmapSelection])
+def implementation(request):
+    return request.param
+
+
+def count_in_worker(name, from_index, to_index):
+    selection = ArraySelection.attach(name)
+    return selection.count_revealed(from_index, to_index), selection.virtual2physical(-1)
+
+
+class TestShared(object):
+    @pytest.mark.parametrize("revealed", [[], [(0, 3), (5, 10)], [(2, 4), (6, 7)], [(0, 10)]])
+    def test_roundtrip(self, implementation, revealed):
+        selection = implementation(slice(0, 10), revealed=revealed)
+        with selection.to_shared() as shared:
+            for other in [Selection, ArraySelection, BitmapSelection]:
+                attached = other.attach(shared.name)
+                assert list(attached.pairs()) == revealed
+                assert len(attached) == len(selection)
+                del attached
+
+    def test_zero_copy_and_read_only(self):
+        selection = ArraySelection(slice(0, 10), revealed=[(2, 4), (6, 7)])
+        with selection.to_shared() as shared:
+            attached = ArraySelection.attach(shared.name)
+            assert not attached._edges.flags.writeable
+            assert not attached._edges.flags.owndata
+            attached.include(None, None)
+            assert list(ArraySelection.attach(shared.name).pairs()) == [(2, 4), (6, 7)]
+            del attached
+
+    def test_pool(self):
+        selection = ArraySelection(slice(0, 1000), revealed=[(10 * i, 10 * i + 3) for i in range(100)])
+        with selection.to_shared() as shared:
+            with multiprocessing.Pool(2) as pool:
+                results = pool.starmap(count_in_worker, [(shared.name, 0, 500), (shared.name, 500, None)])
+        assert results == [(150, 992), (150, 992)]
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+import json
+
+import numpy
+import pytest
+
+from pyromhackit.gslice import storage
+from pyromhackit.gslice.arrayselection import ArraySelection
+from pyromhackit.gslice.selection import Selection
+
+
+@pytest.mark.parametrize("values, expected", [
+    ([], b''),
+    ([0], b'\x00'),
+    ([127], b'\x7f'),
+    ([128], b'\x80\x01'),
+    ([300, 1], b'\xac\x02\x01'),
+    ([2 ** 40], b'\x80\x80\x80\x80\x80\x20'),
+])
+def test_varints(values, expected):
+    assert storage.encode_varints(numpy.array(values, dtype=numpy.int64)) == expected
+    assert storage.decode_varints(expected).tolist() == values
+
+
+def test_truncated_varint_raises():
+    with pytest.raises(ValueError):
+        storage.decode_varints(b'\x01\x80')
+
+
+class TestRoundtrip(object):
+    @staticmethod
+    @pytest.fixture(params=[
+        Selection(universe=slice(0, 10)),
+        Selection(universe=slice(0, 10), revealed=[]),
+        Selection(universe=slice(0, 10), revealed=[(0, 2), (4, 6), (9, 10)]),
+        Selection(universe=slice(0, 10 ** 6), revealed=[(5, 300), (70000, 10 ** 6)]),
+        ArraySelection(universe=slice(0, 10), revealed=[(3, 7)]),
+    ])
+    def selection(request):
+        return request.param
+
+    def test_loads(self, selection):
+        loaded = storage.loads(storage.dumps(selection))
+        assert loaded == selection
+        assert len(loaded) == len(selection)
+
+    def test_load(self, selection, tmp_path):
+        path = str(tmp_path / "selection.sel")
+        storage.dump(selection, path)
+        assert storage.is_binary(path)
+        assert storage.load(path) == selection
+
+
+def test_compact():
+    selection = Selection(universe=slice(0, 2 ** 20), revealed=[(i, i + 50) for i in range(0, 2 ** 20, 100)])
+    assert len(storage.dumps(selection)) < 3 * 2 * len(list(selection)) + 16
+
+
+def test_large_selection_loads_into_array_backend():
+    selection = ArraySelection(slice(0, 2 ** 25), intervals=range(0, 2 ** 25, 1000))
+    loaded = storage.loads(storage.dumps(selection))
+    assert isinstance(loaded, ArraySelection)
+    assert loaded == selection
+
+
+@pytest.mark.parametrize("data", [
+    b'JSON',
+    storage.MAGIC + b'\x00\x0a',
+    storage.MAGIC + b'\x00\x0a\x05\x02\x01\x03',  # Intervals reveal 3 integers, header claims 5
+    storage.MAGIC + b'\x00\x0a\x03\x04\x01\x03',  # Header claims 4 edges, only 2 present
+])
+def test_corrupt_raises(data):
+    with pytest.raises(ValueError):
+        storage.loads(data)
+
+
+def test_json2binary(tmp_path):
+    json_path = str(tmp_path / "selection.sel.json")
+    binary_path = str(tmp_path / "selection.sel")
+    with open(json_path, 'w') as f:
+        json.dump([[2, 4], [6, 9]], f)
+    storage.json2binary(json_path, binary_path, universe=slice(0, 12))
+    assert not storage.is_binary(json_path)
+    assert storage.load(binary_path) == Selection(universe=slice(0, 12), revealed=[(2, 4), (6, 9)])
+    storage.json2binary(json_path, binary_path)
+    assert storage.load(binary_path).universe == slice(0, 9)
@@ -19,18 +19,13 @@ $ python hacks.py all > hack.ips
 
 """
 
-from struct import pack
-
-# TODO Move this to another file
-def ips(records):
-    recordstrings = [pack('>I',adr)[-3:]+pack('>I',len(records[adr]))[-2:]+records[adr] for adr in records]
-    return b"PATCH"+b"".join(recordstrings)+b"EOF"
+from pyromhackit.patch_formats import ips
 
 def sebepresents():
     records = {
         0x2F02B2: bytes([0x00,0,0x1D,0,0x0F,0,0x0C,0,0x0F]),  # "_ S E B E"
     }
-    ipsstr = ips(records)
+    ipsstr = ips(sorted(records.items()))
     with open('mt2.ips','wb') as f:
         f.write(ipsstr)
 
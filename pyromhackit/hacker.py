@@ -8,6 +8,8 @@ from typing import Union
 import re
 from bidict import bidict, KeyAndValueDuplicationError, OVERWRITE
 
+from pyromhackit.gslice import storage
+from pyromhackit.gslice.factory import make_selection
 from pyromhackit.rom import ROM
 from pyromhackit.irom import IROM
 from pyromhackit.thousandcurses.codec import Tree
@@ -41,6 +43,7 @@ class Hacker(object):
         self.last_codec_path = None
         self.last_visage_path = None
         self.last_selection_path = None
+        self.last_selection_format = 'json'  # The format of the file at last_selection_path, see dump_selection
 
     def _compute_dst(self):
         """ Uses the information in self.src, self.affection, and self.codec to update self.dst. """
@@ -50,8 +53,7 @@ class Hacker(object):
         if selection is None:
             return
         self.coverup(None, None)
-        for a, b in selection:
-            self.reveal(a, b)
+        self.reveal_many(selection)
             # self.dst = self.dsttree.transliterate(self.codec)
             # self.dst = self.dsttree.restructured(self.affection)
 
@@ -139,13 +141,38 @@ class Hacker(object):
             raise NotImplementedError("Support for multi-character keys in visage not implemented yet.")
         self.visage[actual_char] = viewed_substring
 
+    def _derive_dst_selection(self):
+        """ Makes the IROM reveal exactly the atoms that the ROM reveals. Every selection change is made to the ROM and
+        then derived this way, so the two selections cannot drift apart. """
+        self.dst.set_selection(self.src.selection())
+
     def coverup(self, from_index: Union[int, None], to_index: Union[int, None]):
-        self.src.coverup(from_index, to_index, virtual=True)
-        self.dst.coverup(from_index, to_index, virtual=True)
+        """ Hides the visible atoms [@from_index, @to_index) by restricting the ROM to the others, which composes them
+        with its selection in a single merge. """
+        length = len(self.src)
+        start, stop, _ = slice(from_index, to_index).indices(length)
+        if start < stop:
+            kept = [(a, b) for a, b in [(0, start), (stop, length)] if a < b]
+            self.restrict(make_selection(slice(0, length), revealed=kept))
 
     def reveal(self, from_index: Union[int, None], to_index: Union[int, None]):
+        length = len(self.src)
         self.src.reveal(from_index, to_index)
-        self.dst.reveal(from_index, to_index)
+        if len(self.src) != length:
+            self._derive_dst_selection()
+
+    def restrict(self, vselection):
+        """ Hides everything currently shown except the characters whose indices are in @vselection, a selection of
+        [0, len(self)), in a single pass. """
+        self.src.restrict(vselection)
+        self._derive_dst_selection()
+
+    def reveal_many(self, intervals):
+        """ Reveals every [a, b) for each pair (a, b) in @intervals in a single pass. """
+        length = len(self.src)
+        self.src.reveal_many(intervals)
+        if len(self.src) != length:
+            self._derive_dst_selection()
 
     def character_diffusion(self, charindex):
         """ Returns the set or slice of indices of the bytes in the ROM affected when altering the ith character in the
@@ -248,10 +275,11 @@ class Hacker(object):
         raise NotImplementedError()
 
     def replace_regex(self, regex: str, replacement: str):
-        m = re.search(regex, self[:])
+        content = self[:]
+        m = re.search(regex, content)
         for groupidx in range(1, len(m.groups()) + 1):
             a, b = m.span(groupidx)
-            substring = self[a:b]
+            substring = content[a:b]
             subreplacement = replacement[a - m.start():b - m.end()]
             assert len(substring) == len(subreplacement)  # TODO Decide what to do with this
             self.set_destination(substring, subreplacement)
@@ -280,46 +308,67 @@ class Hacker(object):
                         icharindex, iatomindex, iatomindexpath, ibyteindex, iatom)
 
     def set_selection(self, selection):
+        if selection.universe == self.src.selection().universe == self.dst.selection().universe:
+            self.src.set_selection(selection)
+            self._derive_dst_selection()
+            return
         self.coverup(None, None)
-        for revealed_start, revealed_stop in selection:
-            self.reveal(revealed_start, revealed_stop)
+        self.reveal_many(selection)
 
     def dump(self, path):
         self.dst.dump(path)
 
-    def dump_selection(self, json_path=None):
-        """ Dump a list of interval lists [a, b] describing the revealed intervals to the JSON file with path
-        @json_path. """
-        if json_path is None:
-            json_path = self.last_selection_path
-        with open(json_path, 'w') as f:
-            json.dump(list(self.dst.selection()), f, sort_keys=True, indent=4, separators=(',', ': '))
-        self.last_selection_path = json_path
-
-    def load_selection(self, json_path=None):
-        """ Reveal only the sections of the ROM specified in the JSON file with path @json_path. """
-        if json_path is None:
-            json_path = self.last_selection_path
-        with open(json_path, 'r') as f:
+    def dump_selection(self, path=None, fmt=None):
+        """ Dump the revealed intervals to the file with path @path, by default the last selection file dumped or
+        loaded. If @fmt is 'json', the file holds a JSON list of interval lists [a, b]; if it is 'binary', the file is
+        in the compact format of gslice.storage. If @fmt is None, the format is that of the last selection file if
+        @path is None, and JSON otherwise. """
+        if path is None:
+            path = self.last_selection_path
+            fmt = self.last_selection_format if fmt is None else fmt
+        fmt = 'json' if fmt is None else fmt
+        if fmt not in ('json', 'binary'):
+            raise ValueError("Expected format 'json' or 'binary', got: {}".format(fmt))
+        if fmt == 'binary':
+            storage.dump(self.dst.selection(), path)
+        else:
+            with open(path, 'w') as f:
+                json.dump(list(self.dst.selection()), f, sort_keys=True, indent=4, separators=(',', ': '))
+        self.last_selection_path = path
+        self.last_selection_format = fmt
+
+    def load_selection(self, path=None):
+        """ Reveal only the sections of the ROM specified in the selection file with path @path, by default the last
+        selection file dumped or loaded. The file is either a JSON list of interval lists [a, b] or a selection in the
+        compact binary format of gslice.storage, which is told apart by its header. """
+        if path is None:
+            path = self.last_selection_path
+        if storage.is_binary(path):
+            self.set_selection(storage.load(path))
+            self.last_selection_path = path
+            self.last_selection_format = 'binary'
+            return
+        with open(path, 'r') as f:
             loaded = json.load(f)
             assert isinstance(loaded, list)
             self.coverup(None, None)
+            intervals = []
             for element in loaded:
                 assert isinstance(element, list)
                 a, b = element
                 assert isinstance(a, int)
                 assert isinstance(b, int)
-                self.reveal(a, b)
-        self.last_selection_path = json_path
+                intervals.append((a, b))
+            self.reveal_many(intervals)
+        self.last_selection_path = path
+        self.last_selection_format = 'json'
 
     def load_selection_from_copy(self, path):
         """ File @path contains a string identical to the IROM except that zero or more substrings have been removed.
         The selections of the IROM and ROM is adjusted so that the substrings not present in @path become hidden.
         """
         self.dst.load_selection_from_copy(path)
-        self.src.coverup(None, None)
-        for a, b in self.dst.selection():
-            self.src.reveal(a, b)
+        self.src.set_selection(self.dst.selection())
 
     def dump_codec(self, json_path=None):
         if json_path is None:
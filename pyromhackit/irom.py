@@ -1,6 +1,5 @@
 import difflib
 from collections import namedtuple
-from copy import deepcopy
 
 from math import ceil
 
@@ -25,7 +24,7 @@ class IROM(object):
         self.memory = SelectiveBytestringSourcedStringMmap(rom, codec)
 
     def selection(self):
-        return deepcopy(self.memory.selection)
+        return self.memory.selection.snapshot()
 
     def coverup(self, from_index, to_index, virtual=True):  # Mutability
         if virtual:
@@ -39,6 +38,31 @@ class IROM(object):
         else:
             self.memory.uncover(from_index, to_index)
 
+    def set_selection(self, selection):  # Mutability
+        """ Reveals exactly what @selection reveals. Its universe must match that of self.selection(). """
+        self.memory.reset_selection(selection)
+
+    def add_selection_listener(self, listener):
+        """ Registers @listener to be called with a SelectionDelta of the atoms that became revealed and covered
+        whenever the selection changes. """
+        self.memory.add_listener(listener)
+
+    def remove_selection_listener(self, listener):
+        self.memory.remove_listener(listener)
+
+    def restrict(self, vselection):  # Mutability
+        """ Hides every revealed atom except those whose virtual indices are in @vselection, a selection of
+        [0, len(self)). """
+        self.memory.restrict(vselection)
+
+    def coverup_many(self, intervals):  # Mutability
+        """ Hides every [a, b) for each pair (a, b) of physical indices in @intervals in a single pass. """
+        self.memory.coverup_many(intervals)
+
+    def reveal_many(self, intervals):  # Mutability
+        """ Reveals every [a, b) for each pair (a, b) of physical indices in @intervals in a single pass. """
+        self.memory.uncover_many(intervals)
+
     def tree(self):
         t = self.structure.structure(self[:])
         return Tree(t)
@@ -54,12 +78,17 @@ class IROM(object):
             raise IndexError("IROM index out of range: {}".format(idx))
         modidx = idx % len(self)
         if self.text_encoding == 'utf-32':
-            return slice(4 + 4 * modidx, 4 + 4 * (modidx + 1))
+            chars = self.memory.visible_chars(modidx)
+            return slice(4 + 4 * chars.start, 4 + 4 * chars.stop)
         raise NotImplementedError()
 
     def __getitem__(self, val):
         return self.memory[val]
 
+    def __iter__(self):
+        """ :return A generator for every visible atom in the IROM. """
+        return iter(self.memory)
+
     def getatom(self, atomindex):  # TODO duplicate of getitem at this point
         """ :return The @atomindex'th atom in this memory. """
         return str(self.structure.getleaf(atomindex, self))
@@ -215,18 +244,20 @@ class IROM(object):
         """ :return A collection of intervals that specify the sections of the edited IROM copy pointed out by @path
         that have been removed. """
         chunks = cls.diff_chunks_from_copy(original_content, edited_content)
-        removals = Selection(universe=slice(0, len(original_content)), revealed=[])
+        removed_intervals = []
         for chunk in chunks:
             removed_lines, matched_line_pairs = cls._organize_chunk(chunk)
             for prefix, offset, line in removed_lines:
-                removals.include(offset, offset + len(line) + 1)
+                removed_intervals.append((offset, offset + len(line) + 1))
             for rline, aline in matched_line_pairs:
                 _, offset1, string1 = rline
                 _, offset2, string2 = aline
                 seqm = difflib.SequenceMatcher(None, string1, string2)
                 for opcode, i1, i2, _, _ in seqm.get_opcodes():
                     if opcode == 'delete':
-                        removals.include(offset1 + i1, offset1 + i2)
+                        removed_intervals.append((offset1 + i1, offset1 + i2))
+        removals = Selection(universe=slice(0, len(original_content)), revealed=[])
+        removals.include_many(removed_intervals)
         return removals
 
     def load_selection_from_copy(self, path):
@@ -235,8 +266,5 @@ class IROM(object):
         """
         with open(path, 'r') as f:
             edited_content = f.read()
-        removed_count = 0
         removals = self.removals_from_copy(str(self), edited_content)
-        for a, b in removals:
-            self.coverup(a - removed_count, b - removed_count, virtual=True)
-            removed_count += b - a
+        self.coverup_many(self.memory.selection.virtualselection2physical(removals))
@@ -0,0 +1,74 @@
+""" Encoders for the IPS and BPS patch formats, which both describe a patch as the extents (offset, bytestring) written
+over a source file. """
+
+import zlib
+from struct import pack
+from typing import Iterable, Tuple
+
+IPS_MAX_OFFSET = 2 ** 24  # Offsets are stored in 3 bytes
+IPS_MAX_RECORD_SIZE = 2 ** 16 - 1  # Sizes are stored in 2 bytes
+IPS_EOF_OFFSET = 0x454F46  # The offset b'EOF', which reads as the footer instead
+
+BPS_SOURCE_READ = 0
+BPS_TARGET_READ = 1
+
+
+def ips(extents: Iterable[Tuple[int, bytes]], source=None) -> bytes:
+    """ :return The IPS patch writing every bytestring of the ascending extents (offset, bytestring) @extents at its
+    offset. An extent starting at IPS_EOF_OFFSET is moved back by a byte, which is taken from the buffer @source.
+    :raise ValueError if an extent reaches beyond IPS_MAX_OFFSET, which IPS cannot address, or if an extent starts at
+    IPS_EOF_OFFSET and no @source is given. """
+    records = []
+    for offset, data in extents:
+        if offset == IPS_EOF_OFFSET:
+            if source is None:
+                raise ValueError("An IPS record cannot start at offset {:#x} without the source".format(offset))
+            offset, data = offset - 1, bytes(source[offset - 1:offset]) + data
+        if offset + len(data) > IPS_MAX_OFFSET:
+            raise ValueError("IPS cannot address offset {:#x}; use BPS instead".format(offset + len(data)))
+        start = 0
+        while start < len(data):
+            stop = min(start + IPS_MAX_RECORD_SIZE, len(data))
+            if offset + stop == IPS_EOF_OFFSET and stop < len(data):
+                stop -= 1  # Otherwise the next record would start at IPS_EOF_OFFSET
+            records.append(pack('>I', offset + start)[1:] + pack('>H', stop - start) + data[start:stop])
+            start = stop
+    return b"PATCH" + b"".join(records) + b"EOF"
+
+
+def bps_number(n: int) -> bytes:
+    """ :return The variable-length encoding of the non-negative integer @n used by BPS, in which every byte holds 7
+    bits and the last byte has its high bit set. """
+    encoding = bytearray()
+    while True:
+        x = n & 0x7F
+        n >>= 7
+        if n == 0:
+            encoding.append(0x80 | x)
+            return bytes(encoding)
+        encoding.append(x)
+        n -= 1
+
+
+def bps(source, extents: Iterable[Tuple[int, bytes]], metadata: bytes = b"") -> bytes:
+    """ :return The BPS patch turning the buffer @source into @source with every bytestring of the ascending extents
+    (offset, bytestring) @extents written at its offset. Unlike IPS, BPS can address any offset, and the patch holds
+    checksums of both the source and the target. The unpatched ranges are copied from the source with SourceRead
+    actions, so the patch is no larger than the extents. """
+    view = memoryview(source)
+    actions = bytearray()
+    target_crc = 0
+    position = 0
+    for offset, data in extents:
+        if offset > position:
+            actions += bps_number((offset - position - 1) << 2 | BPS_SOURCE_READ)
+            target_crc = zlib.crc32(view[position:offset], target_crc)
+        actions += bps_number((len(data) - 1) << 2 | BPS_TARGET_READ) + data
+        target_crc = zlib.crc32(data, target_crc)
+        position = offset + len(data)
+    if position < len(view):
+        actions += bps_number((len(view) - position - 1) << 2 | BPS_SOURCE_READ)
+        target_crc = zlib.crc32(view[position:], target_crc)
+    patch = b"BPS1" + bps_number(len(view)) + bps_number(max(position, len(view))) + bps_number(len(metadata)) + \
+        metadata + actions + pack('<I', zlib.crc32(view)) + pack('<I', target_crc)
+    return patch + pack('<I', zlib.crc32(patch))
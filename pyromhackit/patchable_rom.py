@@ -0,0 +1,45 @@
+from typing import List, Tuple
+
+from pyromhackit.gmmap.selective_patched_bytes_mmap import SelectivePatchedBytesMmap
+from pyromhackit.patch_formats import bps, ips
+from pyromhackit.rom import ROM
+
+
+class PatchableROM(ROM):
+    """ A ROM whose atoms can be overwritten. The file stays mapped read-only and the written bytes are kept apart from
+    it as a sorted list of extents (offset, bytestring), through which every read goes. So editing a few kilobytes of a
+    large image never copies the image, and the extents are exactly the patch, which is either committed to the file or
+    exported as an IPS or BPS patch. """
+
+    _memory_class = SelectivePatchedBytesMmap
+
+    def __setitem__(self, location, value: bytes):  # Mutability
+        """ Sets the @location'th visible atom to @value, if @location is an integer; or the visible atoms in the
+        slice @location to @value, which must be as long as them, if @location is a slice. """
+        self.memory[location] = value
+
+    def patch(self, offset: int, bytestring: bytes):  # Mutability
+        """ Overwrites the bytes of the ROM from the physical byte offset @offset with @bytestring, whether or not they
+        are visible. """
+        self.memory.patch(offset, bytestring)
+
+    def patches(self) -> List[Tuple[int, bytes]]:
+        """ :return The ascending list of extents (offset, bytestring) written since the last commit. """
+        return self.memory.patches()
+
+    def revert(self):  # Mutability
+        """ Discards every write since the last commit. """
+        self.memory.revert()
+
+    def commit(self):  # Mutability
+        """ Writes every write since the last commit through to the file, or to the memory if the ROM was not read from
+        a file. """
+        self.memory.commit()
+
+    def ips(self) -> bytes:
+        """ :return The IPS patch of the writes since the last commit. """
+        return ips(self.patches(), self.memory.base())
+
+    def bps(self) -> bytes:
+        """ :return The BPS patch of the writes since the last commit. """
+        return bps(self.memory.base(), self.patches())
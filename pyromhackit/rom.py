@@ -1,11 +1,11 @@
 from collections import namedtuple
-from copy import deepcopy
 
 import re
 from ast import literal_eval
 import os
 from prettytable import PrettyTable
 
+from pyromhackit.gmmap.physically_indexed_gmmap import DEFAULT_CHUNK_SIZE
 from pyromhackit.gmmap.selective_fixed_width_bytes_mmap import SelectiveFixedWidthBytesMmap
 from pyromhackit.reader import write
 from pyromhackit.thousandcurses import codec
@@ -22,15 +22,19 @@ class ROM(object):
     interested in reading the whole file, you may optionally select the portions of the file that should be revealed.
     By default, the whole file is revealed. """
 
+    _memory_class = SelectiveFixedWidthBytesMmap
+
     def __init__(self, rom_specifier, structure=SimpleTopology(1)):
         """ Constructs a ROM object from a path to a file to be read. You may define a hierarchical structure on the
         ROM by passing a Topology instance. """
         # TODO ...or a BNF grammar
         self.structure = structure
+        width = 2 if str(structure) == "SimpleTopology(2)" else 1
         if isinstance(rom_specifier, str):
-            path = rom_specifier
-            filesize = os.path.getsize(path)
-            source = open(path, 'r')
+            if os.path.getsize(rom_specifier) == 0:  # mmaps cannot have zero length
+                raise NotImplementedError("The file cannot be empty.")
+            with open(rom_specifier, 'rb') as source:  # The file is memory-mapped, not read
+                self.memory = self._memory_class(width, source)
         else:
             try:
                 bytestr = bytes(rom_specifier)
@@ -39,16 +43,11 @@ class ROM(object):
                     type(rom_specifier)))
             if not bytestr:  # mmaps cannot have zero length
                 raise NotImplementedError("The bytestring's length cannot be zero.")
-            size = len(bytestr)
-            source = self.structure.structure(bytestr)
-        if str(structure) == "SimpleTopology(2)":
-            self.memory = SelectiveFixedWidthBytesMmap(2, source)
-        else:
-            # self.memory = SingletonBytesMmap(bytestr)
-            self.memory = SelectiveFixedWidthBytesMmap(1, source)
+            # The atoms are located by index arithmetic on the width, so the bytestring need not be split into them
+            self.memory = self._memory_class(width, bytestr)
 
     def selection(self):
-        return deepcopy(self.memory.selection)
+        return self.memory.selection.snapshot()
 
     def coverup(self, from_index, to_index, virtual=True):  # Mutability
         if virtual:
@@ -62,6 +61,31 @@ class ROM(object):
         else:
             self.memory.uncover(from_index, to_index)
 
+    def set_selection(self, selection):  # Mutability
+        """ Reveals exactly what @selection reveals. Its universe must match that of self.selection(). """
+        self.memory.reset_selection(selection)
+
+    def add_selection_listener(self, listener):
+        """ Registers @listener to be called with a SelectionDelta of the atoms that became revealed and covered
+        whenever the selection changes. """
+        self.memory.add_listener(listener)
+
+    def remove_selection_listener(self, listener):
+        self.memory.remove_listener(listener)
+
+    def restrict(self, vselection):  # Mutability
+        """ Hides every revealed atom except those whose virtual indices are in @vselection, a selection of
+        [0, len(self)). """
+        self.memory.restrict(vselection)
+
+    def coverup_many(self, intervals):  # Mutability
+        """ Hides every [a, b) for each pair (a, b) of physical indices in @intervals in a single pass. """
+        self.memory.coverup_many(intervals)
+
+    def reveal_many(self, intervals):  # Mutability
+        """ Reveals every [a, b) for each pair (a, b) of physical indices in @intervals in a single pass. """
+        self.memory.uncover_many(intervals)
+
     def tree(self):
         """ Returns a Tree consisting of the revealed portions of the ROM according to the ROM's topology. """
         t = self.structure.structure(self.memory)
@@ -75,13 +99,23 @@ class ROM(object):
     def flatten_without_joining(self):
         return self.content.flatten_without_joining()
 
+    def buffer(self) -> memoryview:
+        """ :return A read-only memoryview of the bytes in the visible atoms of the ROM, which is of the underlying mmap
+        itself when the visible atoms are contiguous. Searching it copies nothing. """
+        return self.memory.buffer()
+
     def index(self, bstring):
-        return bytes(self).index(bstring)
+        """ :return The index of the first occurrence of the bytestring or byte value @bstring in the ROM.
+        :raise ValueError if there is none. """
+        index = self.memory.find(bstring)
+        if index < 0:
+            raise ValueError("Bytestring not found: {}".format(bstring))
+        return index
 
     def index_regex(self, bregex):
         """ Returns a pair (a, b) which are the start and end indices of the first string found when searching the ROM
         using the specified regex, or None if there is none. """
-        match = re.search(bregex, bytes(self))
+        match = re.search(bregex, self.buffer())
         if match:
             return match.span()
 
@@ -103,7 +137,8 @@ class ROM(object):
         """ List of bytestring lines with the specified width """
         if width:
             w = width
-            tbl = [bytes(self)[i * w:(i + 1) * w]
+            content = self.buffer()
+            tbl = [bytes(content[i * w:(i + 1) * w])
                    for i in range(int(len(self) / w) + 1)]
             if tbl[-1] == b'':
                 return tbl[:-1]
@@ -121,7 +156,9 @@ class ROM(object):
 
     def offset(self, n):
         """ :return A ROM where the value of each byte in the ROM is increased by @n modulo 256. """
-        return ROM(bytes((b + n) % 2 ** 8 for b in self.iterbytes()), structure=self.structure)
+        table = bytes((b + n) % 2 ** 8 for b in range(2 ** 8))
+        return ROM(b''.join(bytes(chunk).translate(table) for chunk in self.memory.iterchunks()),
+                   structure=self.structure)
 
     def map(self, mapdata):
         if isinstance(mapdata, dict):
@@ -130,7 +167,7 @@ class ROM(object):
             path = mapdata
             dct = read_yaml(path)
         return "".join(dct[byte] if byte in dct else chr(byte)
-                       for byte in self)
+                       for byte in self.iterbytes())
 
     def table(self, width=0, labeling=False, encoding=codec.HexifySpaces.decode):
         """ (Labeled?) table where each cell corresponds to a byte """
@@ -211,10 +248,19 @@ class ROM(object):
             stream = f(stream)
         return stream
 
-    def iterbytes(self):  # TODO only revealed
-        """ :return A generator for every byte in the ROM. """
+    def iterbytes(self):
+        """ :return A generator for every byte in the visible atoms of the ROM. """
         return self.memory.iterbytes()
 
+    def iterchunks(self, size=DEFAULT_CHUNK_SIZE):
+        """ :return A generator for read-only memoryviews of the bytes in the visible atoms of the ROM, each at most
+        @size bytes long and within one run of visible atoms. """
+        return self.memory.iterchunks(size)
+
+    def __iter__(self):
+        """ :return A generator for every visible atom in the ROM. """
+        return iter(self.memory)
+
     def __len__(self):
         """ :return The number of bytes in this ROM. """
         return self.atomcount()
@@ -231,7 +277,7 @@ class ROM(object):
         """ True of both are ROMs and their byte sequences are the same. """
         # TODO Should the paths also be equal? What about the selections?
         # TODO optimize with iter+zip.
-        return isinstance(other, ROM) and bytes(self) == bytes(other)
+        return isinstance(other, ROM) and self.buffer() == other.buffer()
 
     def __hash__(self):
         return hash(bytes(self))
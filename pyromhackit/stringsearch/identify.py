@@ -3,7 +3,6 @@
 """ Provides algorithms for identifying English text in files that may contain English text mixed with other data. """
 import os
 from abc import ABCMeta, abstractmethod
-from copy import deepcopy
 from io import TextIOBase
 
 import sys
@@ -66,11 +65,10 @@ class EnglishDictionaryBasedIdentifier(DictionaryBasedTextIdentifier):
         return self._wordlist
 
     def str2wordlistselection(self, string: str) -> Selection:
-        textselection = Selection(universe=slice(0, len(string)))
-        textselection.exclude(None, None)
-        for word in iter(self.wordlist()):
-            for startindex in findall(word, string):
-                textselection.include(startindex, startindex + len(word))
+        textselection = Selection(universe=slice(0, len(string)), revealed=[])
+        textselection.include_many((startindex, startindex + len(word))
+                                   for word in iter(self.wordlist())
+                                   for startindex in findall(word, string))
         return textselection
 
     def caseinsensitivestr2wordlistselection(self, string: str) -> Selection:
@@ -81,7 +79,7 @@ class EnglishDictionaryBasedIdentifier(DictionaryBasedTextIdentifier):
 
     def str2selection(self, string: str) -> Selection:
         dictselection = self.caseinsensitivestr2wordlistselection(string)
-        textselection = deepcopy(dictselection)
+        textselection = dictselection.snapshot()
         textselection.include_expand(None, None, self._tolerated_char_count)
         return textselection
 
@@ -95,14 +93,17 @@ if __name__ == '__main__':
     print("Dictionary selection: {}".format(list(dictselection)))
     print("Text selection: {}".format(list(textselection)))
     print()
+    hits = iter(dictselection & textselection)
+    hit = next(hits, None)
     for a, b in textselection:
         print("{:3}...{:3}: \"".format(a, b), end="")
-        subselection = dictselection.subslice(a, b)
         seekindex = a
-        for c, d in subselection:
+        while hit is not None and hit[0] < b:
+            c, d = hit
             gap = content[seekindex:c]
             body = content[c:d]
             seekindex = d
             print(repr(gap)[1:-1] + colored(repr(body)[1:-1], "blue"), end="")
+            hit = next(hits, None)
         endgap = content[seekindex:b]
         print(repr(endgap)[1:-1] + "\"")
@@ -1,11 +1,13 @@
 #!/usr/bin/env python
 
+import json
 import os
 import pytest
 
 from pyromhackit.rom import ROM
 from pyromhackit.hacker import Hacker
 from pyromhackit.topology.simple_topology import SimpleTopology
+from pyromhackit.gslice import storage
 from pyromhackit.gslice.selection import Selection
 
 package_dir = os.path.dirname(os.path.abspath(__file__))
@@ -93,3 +95,81 @@ class TestTinyHacker(object):
         self.hacker.coverup(0, 1)
         self.hacker['H'] = 'C'
         assert len(self.hacker.src) == len(self.hacker.dst)
+
+
+def test_dump_and_load_selection(tmp_path):
+    hacker = Hacker(ROM(b'abcdefgh'))
+    hacker.coverup(2, 5)
+    path = str(tmp_path / "selection.json")
+    hacker.dump_selection(path)
+    hacker.reveal(None, None)
+    hacker.load_selection(path)
+    assert list(hacker.src.selection()) == [(0, 2), (5, 8)]
+    assert list(hacker.dst.selection()) == [(0, 2), (5, 8)]
+    assert bytes(hacker.src) == b'abfgh'
+    assert len(hacker.dst) == 5
+
+
+def test_dst_selection_is_derived_from_src():
+    hacker = Hacker(ROM(b'abcdefgh'))
+    hacker.coverup(2, 5)
+    hacker.coverup(1, 2)
+    assert list(hacker.src.selection()) == [(0, 1), (5, 8)]
+    assert list(hacker.dst.selection()) == [(0, 1), (5, 8)]
+    hacker.src.coverup(0, 1, virtual=False)  # Hidden in src only
+    hacker.coverup(0, 1)  # The visible atom 0 of src is the atom 5
+    assert list(hacker.src.selection()) == [(6, 8)]
+    assert list(hacker.dst.selection()) == [(6, 8)]
+    hacker.reveal(None, None)
+    assert list(hacker.dst.selection()) == [(0, 8)]
+    hacker.coverup(None, None)
+    assert len(hacker.src) == len(hacker.dst) == 0
+
+
+def test_load_selection_from_copy(tmp_path):
+    hacker = Hacker(ROM(b'abcdefgh'))
+    hacker.coverup(0, 1)
+    path = tmp_path / "copy.txt"
+    path.write_text(str(hacker.dst)[:2] + str(hacker.dst)[4:])
+    hacker.load_selection_from_copy(str(path))
+    assert list(hacker.src.selection()) == [(1, 3), (5, 8)]
+    assert list(hacker.dst.selection()) == [(1, 3), (5, 8)]
+
+
+def test_load_selection_from_copy_replaces_src_selection(tmp_path):
+    hacker = Hacker(ROM(b'abcdefgh'))
+    hacker.src.coverup(6, 8, virtual=False)  # Hidden in src only, but revealed in dst
+    path = tmp_path / "copy.txt"
+    path.write_text(str(hacker.dst)[:2] + str(hacker.dst)[4:])
+    hacker.load_selection_from_copy(str(path))
+    assert list(hacker.dst.selection()) == [(0, 2), (4, 8)]
+    assert list(hacker.src.selection()) == [(0, 2), (4, 8)]
+
+
+def test_dump_selection_defaults_to_json(tmp_path):
+    hacker = Hacker(ROM(b'abcdefgh'))
+    hacker.coverup(2, 5)
+    path = tmp_path / "selection.sel"
+    hacker.dump_selection(str(path))
+    assert json.loads(path.read_text()) == [[0, 2], [5, 8]]
+    with pytest.raises(ValueError):
+        hacker.dump_selection(str(path), fmt='yaml')
+
+
+def test_dump_and_load_binary_selection(tmp_path):
+    hacker = Hacker(ROM(b'abcdefgh'))
+    hacker.coverup(2, 5)
+    path = str(tmp_path / "selection.sel")
+    hacker.dump_selection(path, fmt='binary')
+    hacker.reveal(None, None)
+    hacker.load_selection(path)
+    assert list(hacker.src.selection()) == [(0, 2), (5, 8)]
+    assert list(hacker.dst.selection()) == [(0, 2), (5, 8)]
+    assert bytes(hacker.src) == b'abfgh'
+    assert len(hacker.dst) == 5
+    hacker.coverup(0, 1)
+    assert bytes(hacker.src) == b'bfgh'
+    hacker.dump_selection()  # Rewrites the last selection file in its own format
+    assert storage.is_binary(path)
+    hacker.load_selection()
+    assert list(hacker.src.selection()) == [(1, 2), (5, 8)]
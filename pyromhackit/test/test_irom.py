@@ -40,6 +40,105 @@ class TestIROM(object):
         with pytest.raises(IndexError):
             self.irom[3]
 
+
+class TestCharWidth(object):
+    @pytest.mark.parametrize("offset, expected_width", [
+        (ord('A'), 1),
+        (0xC0, 1),
+        (0x3041, 2),
+        (0x1F600, 4),
+    ])
+    def test_width(self, offset, expected_width):
+        rom = ROM(bytes(range(20)))
+        codec = {bytes([b]): chr(offset + b) for b in range(20)}
+        irom = IROM(rom, codec)
+        assert irom.memory.char_width == expected_width
+        assert len(irom.memory._content) == expected_width * 20
+        assert str(irom) == ''.join(chr(offset + b) for b in range(20))
+        assert irom[5] == chr(offset + 5)
+        assert irom[3:7] == ''.join(chr(offset + b) for b in range(3, 7))
+
+    def test_width_with_selection(self):
+        rom = ROM(bytes(range(10)))
+        irom = IROM(rom, {bytes([b]): chr(0x3041 + b) for b in range(10)})
+        irom.coverup(2, 5)
+        assert str(irom) == ''.join(chr(0x3041 + b) for b in [0, 1, 5, 6, 7, 8, 9])
+        assert irom[2] == chr(0x3041 + 5)
+
+
+class TestVariableLengthAtoms(object):
+    def setup(self):
+        rom = ROM(bytes([0, 1, 2, 0, 3]))
+        self.codec = {b'\x00': 'a', b'\x01': '[NAME]', b'\x02': '', b'\x03': '\u3041\u3042'}
+        self.irom = IROM(rom, self.codec)
+
+    def test_str(self):
+        assert len(self.irom) == 5
+        assert str(self.irom) == 'a[NAME]a\u3041\u3042'
+
+    def test_getitem(self):
+        assert [self.irom[i] for i in range(5)] == ['a', '[NAME]', '', 'a', '\u3041\u3042']
+        assert self.irom[-1] == '\u3041\u3042'
+        assert self.irom[1:4] == '[NAME]a'
+
+    def test_offsets(self):
+        assert self.irom.memory._offsets.tolist() == [0, 1, 7, 7, 8, 10]
+        assert self.irom.memory._offsets.dtype.itemsize == 4
+
+    def test_element2chars(self):
+        assert [self.irom.memory.element2chars(i) for i in range(5)] == \
+               [slice(0, 1), slice(1, 7), slice(7, 7), slice(7, 8), slice(8, 10)]
+
+    def test_char2element(self):
+        assert [self.irom.memory.char2element(c) for c in range(10)] == [0, 1, 1, 1, 1, 1, 1, 3, 4, 4]
+        with pytest.raises(IndexError):
+            self.irom.memory.char2element(10)
+
+    def test_index2slice(self):
+        assert self.irom.index2slice(1) == slice(4 + 4 * 1, 4 + 4 * 7)
+        assert self.irom.index2slice(4) == slice(4 + 4 * 8, 4 + 4 * 10)
+
+    def test_index2slice_with_covered_atoms(self):
+        self.irom.coverup(0, 2, virtual=False)
+        assert str(self.irom) == 'a\u3041\u3042'
+        assert self.irom.index2slice(0) == slice(4, 4)  # The empty atom
+        assert self.irom.index2slice(1) == slice(4, 4 + 4 * 1)
+        assert self.irom.index2slice(2) == slice(4 + 4 * 1, 4 + 4 * 3)
+        self.irom.coverup(1, 3, virtual=True)
+        assert self.irom.index2slice(0) == slice(4, 4)
+
+    def test_coverup(self):
+        self.irom.coverup(1, 3, virtual=False)
+        assert str(self.irom) == 'aa\u3041\u3042'
+        assert self.irom[1] == 'a'
+        assert self.irom[2] == '\u3041\u3042'
+
+    def test_str_cached(self):
+        content = str(self.irom)
+        assert str(self.irom) is content
+        self.irom.coverup(0, 1)
+        assert str(self.irom) == '[NAME]a\u3041\u3042'
+
+    def test_str_follows_selection(self):
+        str(self.irom)
+        self.irom.coverup(1, 3, virtual=False)
+        assert str(self.irom) == 'aa\u3041\u3042'
+        self.irom.reveal(None, None)
+        self.irom.coverup(3, 5, virtual=False)
+        assert str(self.irom) == 'a[NAME]'
+        self.irom.reveal(3, 4, virtual=False)
+        assert str(self.irom) == 'a[NAME]a'
+        assert str(self.irom) == ''.join(self.irom)
+
+    def test_fixed_length_codec_records_no_offsets(self):
+        irom = IROM(ROM(bytes([0, 0])), {b'\x00': 'a'})
+        assert irom.memory._offsets is None
+        assert irom.memory.element2chars(1) == slice(1, 2)
+        assert irom.memory.char2element(1) == 1
+        irom.coverup(0, 1, virtual=False)
+        assert irom.index2slice(0) == slice(4, 8)
+
+
 class Test_removals_from_copy(object):
     @pytest.fixture(scope="function")
     def two_line_content(self):
@@ -108,3 +207,25 @@ World
             (18, 22), # REEE
             (23, 34), # YOOO\nHEY\nAA
         ]
+
+
+class TestLoadSelectionFromCopy(object):
+    def setup(self):
+        rom = ROM(b'abcdefgh')
+        codec = {bytes([c]): chr(c).upper() for c in b'abcdefgh'}
+        self.irom = IROM(rom, codec)
+
+    def test_removed_substrings_become_hidden(self, tmp_path):
+        path = tmp_path / "copy.txt"
+        path.write_text("ADEH")
+        self.irom.load_selection_from_copy(str(path))
+        assert str(self.irom) == 'ADEH'
+        assert list(self.irom.selection()) == [(0, 1), (3, 5), (7, 8)]
+
+    def test_removals_are_relative_to_visible_string(self, tmp_path):
+        self.irom.coverup(1, 3, virtual=False)
+        path = tmp_path / "copy.txt"
+        path.write_text("ADH")
+        self.irom.load_selection_from_copy(str(path))
+        assert str(self.irom) == 'ADH'
+        assert list(self.irom.selection()) == [(0, 1), (3, 4), (7, 8)]
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+
+import mmap
+import tracemalloc
+
+import pytest
+
+from pyromhackit.gmmap.mmap_builder import MmapBuilder
+from pyromhackit.gmmap.bytestring_sourced_string_mmap import BytestringSourcedStringMmap
+
+
+@pytest.mark.parametrize("size_hint", [None, 1, 6, 1000])
+def test_build(size_hint):
+    builder = MmapBuilder(size_hint)
+    for bytestring in [b'ab', b'', b'cde', b'f']:
+        builder.append(bytestring)
+    assert len(builder) == 6
+    m = builder.build()
+    assert m[:] == b'abcdef'
+    m[0:1] = b'A'
+    assert m[:] == b'Abcdef'
+
+
+def test_build_empty():
+    with pytest.raises(ValueError):
+        MmapBuilder().build()
+
+
+def test_build_read_only():
+    builder = MmapBuilder()
+    builder.append(b'abc')
+    m = builder.build(mmap.ACCESS_READ)
+    with pytest.raises(TypeError):
+        m[0] = 0
+
+
+def test_sequence2mmap_does_not_materialize():
+    atoms = (bytes([i % 256]) for i in range(2 ** 18))
+    codec = {bytes([b]): chr(0x10000 + b) for b in range(256)}
+    tracemalloc.start()
+    try:
+        string_mmap = BytestringSourcedStringMmap(atoms, codec)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(string_mmap) == 2 ** 18
+    assert len(string_mmap._content) == 4 * 2 ** 18
+    assert peak < len(string_mmap._content) // 8
@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+
+""" Test suite for PatchableROM and the patch formats it exports. """
+import os
+import tempfile
+import zlib
+from struct import unpack
+
+import pytest
+
+from pyromhackit.gmmap.patch_overlay import PatchOverlay
+from pyromhackit.patch_formats import IPS_EOF_OFFSET, bps_number, ips
+from pyromhackit.patchable_rom import PatchableROM
+from pyromhackit.rom import ROM
+from pyromhackit.topology.simple_topology import SimpleTopology
+
+
+def apply_ips(source: bytes, patch: bytes) -> bytes:
+    assert patch[:5] == b"PATCH" and patch[-3:] == b"EOF"
+    target = bytearray(source)
+    i = 5
+    while i < len(patch) - 3:
+        offset = unpack('>I', b'\x00' + patch[i:i + 3])[0]
+        size = unpack('>H', patch[i + 3:i + 5])[0]
+        assert offset != IPS_EOF_OFFSET and size > 0
+        target[offset:offset + size] = patch[i + 5:i + 5 + size]
+        i += 5 + size
+    return bytes(target)
+
+
+def read_bps_number(patch: bytes, i: int):
+    n, shift = 0, 1
+    while True:
+        x = patch[i]
+        i += 1
+        n += (x & 0x7F) * shift
+        if x & 0x80:
+            return n, i
+        shift <<= 7
+        n += shift
+
+
+def apply_bps(source: bytes, patch: bytes) -> bytes:
+    """ Applies a BPS patch of SourceRead and TargetRead actions, checking every checksum. """
+    assert patch[:4] == b"BPS1"
+    assert unpack('<I', patch[-4:])[0] == zlib.crc32(patch[:-4])
+    source_size, i = read_bps_number(patch, 4)
+    target_size, i = read_bps_number(patch, i)
+    metadata_size, i = read_bps_number(patch, i)
+    i += metadata_size
+    assert source_size == len(source)
+    assert unpack('<I', patch[-12:-8])[0] == zlib.crc32(source)
+    target = bytearray()
+    while i < len(patch) - 12:
+        command, i = read_bps_number(patch, i)
+        action, length = command & 3, (command >> 2) + 1
+        if action == 0:
+            target += source[len(target):len(target) + length]
+        else:
+            assert action == 1
+            target += patch[i:i + length]
+            i += length
+    assert len(target) == target_size
+    assert unpack('<I', patch[-8:-4])[0] == zlib.crc32(target)
+    return bytes(target)
+
+
+class TestPatchOverlay(object):
+    def test_merges_overlapping_and_touching_writes(self):
+        overlay = PatchOverlay()
+        overlay.write(10, b'abc')
+        overlay.write(20, b'xy')
+        overlay.write(13, b'de')  # Touches the first extent
+        overlay.write(11, b'Z')
+        assert overlay.extents() == [(10, b'aZcde'), (20, b'xy')]
+        overlay.write(14, b'123456')  # Touches the second extent
+        assert overlay.extents() == [(10, b'aZcd123456xy')]
+        overlay.write(21, b'!!')  # Overlaps the end
+        assert overlay.extents() == [(10, b'aZcd123456x!!')]
+
+    def test_patched(self):
+        overlay = PatchOverlay()
+        overlay.write(2, b'XY')
+        assert overlay.patched(b'abcdef', 0, 6) == b'abXYef'
+        assert overlay.patched(b'abcdef', 3, 5) == b'Ye'
+        assert overlay.patched(b'abcdef', 4, 6) == b'ef'
+
+
+def test_bps_number():
+    assert [bps_number(n) for n in [0, 1, 127, 128, 300]] == [b'\x80', b'\x81', b'\xff', b'\x00\x80', b'\x2c\x81']
+    for n in [0, 1, 127, 128, 16511, 16512, 2 ** 40]:
+        assert read_bps_number(bps_number(n), 0) == (n, len(bps_number(n)))
+
+
+class TestIPS(object):
+    def test_records(self):
+        patch = ips([(0x2F02B2, b'\x00\x1d')])
+        assert patch == b'PATCH' + b'\x2f\x02\xb2' + b'\x00\x02' + b'\x00\x1d' + b'EOF'
+
+    def test_long_extent_is_split(self):
+        source = bytes(2 ** 17)
+        patch = ips([(1, b'\x01' * 70000)], source)
+        assert apply_ips(source, patch) == b'\x00' + b'\x01' * 70000 + bytes(2 ** 17 - 70001)
+
+    def test_eof_offset(self):
+        source = bytes(range(256)) * (IPS_EOF_OFFSET // 256 + 2)
+        patch = ips([(IPS_EOF_OFFSET, b'!')], source)
+        expected = bytearray(source)
+        expected[IPS_EOF_OFFSET] = ord('!')
+        assert apply_ips(source, patch) == bytes(expected)
+        with pytest.raises(ValueError):
+            ips([(IPS_EOF_OFFSET, b'!')])
+
+    def test_offset_out_of_range(self):
+        with pytest.raises(ValueError):
+            ips([(2 ** 24 - 1, b'ab')])
+
+
+class TestPatchableROM(object):
+    def setup(self):
+        self.rom = PatchableROM(b'abcdefghij')
+
+    def test_setitem(self):
+        self.rom[2] = b'C'
+        self.rom[5:7] = b'FG'
+        assert bytes(self.rom) == b'abCdeFGhij'
+        assert self.rom.patches() == [(2, b'C'), (5, b'FG')]
+        assert self.rom.memory.base().tobytes() == b'abcdefghij'
+
+    def test_setitem_length_mismatch(self):
+        with pytest.raises(ValueError):
+            self.rom[5:7] = b'F'
+
+    def test_setitem_with_selection(self):
+        self.rom.coverup(2, 4, virtual=False)
+        self.rom[1:3] = b'BE'  # The visible atoms 1 and 4
+        assert bytes(self.rom) == b'aBEfghij'
+        assert self.rom.patches() == [(1, b'B'), (4, b'E')]
+        self.rom.reveal(None, None)
+        assert bytes(self.rom) == b'aBcdEfghij'
+
+    def test_read_paths_merge_overlay(self):
+        self.rom.coverup(8, 10, virtual=False)
+        assert bytes(self.rom) == b'abcdefgh'  # Fills the cache
+        self.rom.patch(3, b'DEF')
+        self.rom.patch(8, b'I')  # Hidden, so the cache stays valid
+        assert bytes(self.rom) == b'abcDEFgh'
+        assert self.rom[4] == b'E'
+        assert list(self.rom) == [bytes([b]) for b in b'abcDEFgh']
+        assert [bytes(chunk) for chunk in self.rom.iterchunks(4)] == [b'abcD', b'EFgh']
+        assert bytes(self.rom.buffer()) == b'abcDEFgh'
+        assert self.rom.index(b'DEF') == 3
+
+    def test_read_paths_merge_overlay_fragmented(self):
+        self.rom.coverup(1, 2, virtual=False)
+        self.rom.coverup(5, 6, virtual=False)
+        self.rom.patch(0, b'ABCDEFGHIJ')
+        assert bytes(self.rom) == b'ACDEGHIJ'
+        assert bytes(self.rom.buffer()) == b'ACDEGHIJ'
+        assert self.rom[2:5] == b'DEG'
+
+    def test_patch_out_of_range(self):
+        with pytest.raises(IndexError):
+            self.rom.patch(9, b'JK')
+
+    def test_revert(self):
+        self.rom.patch(0, b'A')
+        assert bytes(self.rom) == b'Abcdefghij'
+        self.rom.revert()
+        assert bytes(self.rom) == b'abcdefghij'
+        assert self.rom.patches() == []
+
+    def test_commit_to_memory(self):
+        self.rom.patch(0, b'A')
+        self.rom.commit()
+        assert self.rom.patches() == []
+        assert bytes(self.rom) == b'Abcdefghij'
+        assert self.rom.memory.base().tobytes() == b'Abcdefghij'
+
+    def test_ips(self):
+        self.rom.patch(2, b'CD')
+        self.rom.patch(7, b'H')
+        assert apply_ips(b'abcdefghij', self.rom.ips()) == b'abCDefgHij'
+
+    def test_bps(self):
+        self.rom.patch(0, b'AB')
+        self.rom.patch(7, b'H')
+        self.rom.patch(9, b'J')
+        assert apply_bps(b'abcdefghij', self.rom.bps()) == b'ABcdefgHiJ'
+
+    def test_bps_unpatched(self):
+        assert apply_bps(b'abcdefghij', self.rom.bps()) == b'abcdefghij'
+
+    def test_wide_atoms(self):
+        rom = PatchableROM(b'1h0o0w', SimpleTopology(2))
+        rom[1] = b'0O'
+        assert list(rom) == [b'1h', b'0O', b'0w']
+
+
+def test_commit_to_file():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'image.bin')
+        with open(path, 'wb') as f:
+            f.write(b'abcdefghij')
+        rom = PatchableROM(path)
+        rom.patch(4, b'EF')
+        with open(path, 'rb') as f:
+            assert f.read() == b'abcdefghij'  # The file is untouched until the writes are committed
+        rom.commit()
+        with open(path, 'rb') as f:
+            assert f.read() == b'abcdEFghij'
+        assert bytes(rom) == b'abcdEFghij'
+        assert ROM(path) == rom
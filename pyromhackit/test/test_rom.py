@@ -1,12 +1,17 @@
 #!/usr/bin/env python
 
 """ Test suite for ROM class. """
+import mmap
 import os
+import random
 import tempfile
 from os.path import isfile
 import re
+import numpy
 import pytest
 
+from pyromhackit.gslice.delta import SelectionDelta
+from pyromhackit.gslice.selection import Selection
 from pyromhackit.rom import ROM
 from pyromhackit.topology.simple_topology import SimpleTopology
 
@@ -33,6 +38,52 @@ def test_init_path():
     ROM(ROMPATH)
 
 
+def test_init_path_maps_file_read_only():
+    rom = ROM(ROMPATH)
+    with open(ROMPATH, 'rb') as f:
+        assert bytes(rom) == f.read()
+    assert rom.memory.path == ROMPATH
+    with pytest.raises(TypeError):
+        rom.memory._content[0] = 0
+
+
+@pytest.mark.slow
+def test_init_large_sparse_file():
+    """ Opening a file maps it without reading it """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "large.iso")
+        try:
+            with open(path, 'wb') as f:
+                f.truncate(2 ** 32)
+                f.seek(-1, os.SEEK_END)
+                f.write(b'\xff')
+        except OSError as e:
+            pytest.skip("Cannot create a 4 GiB file: {}".format(e))
+        if getattr(os.stat(path), 'st_blocks', 0) * 512 >= 2 ** 32:
+            pytest.skip("The file system does not support sparse files")
+        rom = ROM(path)
+        assert len(rom) == 2 ** 32
+        assert rom[-1] == b'\xff'
+        del rom
+
+
+@pytest.mark.parametrize("bytestring, expected_atoms", [
+    (b'abcd', [b'ab', b'cd']),
+    (b'abcde', [b'ab', b'cd', b'e']),
+])
+def test_init_bytestring_wide_atoms(bytestring, expected_atoms):
+    rom = ROM(bytestring, structure=SimpleTopology(2))
+    assert rom.atomcount() == len(expected_atoms)
+    assert [rom.getatom(i) for i in range(rom.atomcount())] == expected_atoms
+
+
+def test_iter_wide_atoms():
+    rom = ROM(b'1h0o0w', SimpleTopology(2))
+    rom.coverup(1, 2, virtual=False)
+    assert list(rom) == [b'1h', b'0w']
+    assert [bytes(chunk) for chunk in rom.iterchunks()] == [b'1h', b'0w']
+
+
 def test_init_intlist():
     """ Call constructor with list of byte values """
     ROM([0, 97, 98, 99, 255])
@@ -103,6 +154,9 @@ class TestTinyROM:
     def test_index(self, tinyrom):
         """ Find bytestring in ROM """
         assert tinyrom.index(b'\xff') == 1
+        assert tinyrom.index(0xff) == 1
+        with pytest.raises(ValueError):
+            tinyrom.index(ord('b'))
 
     @pytest.mark.parametrize("bregex, expected", [
         (b'a', (0, 1)),
@@ -239,6 +293,146 @@ class TestCoveredROM(object):
         with pytest.raises(IndexError):
             self.rom[index]
 
+    def test_selection_is_independent_snapshot(self):
+        selection = self.rom.selection()
+        selection.include(None, None)
+        assert list(self.rom.selection()) == [(1, 4), (6, 8)]
+        self.rom.coverup(1, 2, virtual=False)
+        assert len(selection) == 10
+
+    def test_restrict(self):
+        self.rom.restrict(Selection(slice(0, 5), revealed=[(1, 4)]))
+        assert bytes(self.rom) == b'cdg'
+        assert list(self.rom.selection()) == [(2, 4), (6, 7)]
+
+    def test_selection_listener(self):
+        deltas = []
+        self.rom.add_selection_listener(deltas.append)
+        self.rom.reveal(4, 6, virtual=False)
+        self.rom.set_selection(Selection(slice(0, 10), revealed=[(0, 10)]))
+        self.rom.coverup(0, 2, virtual=False)
+        assert deltas == [SelectionDelta(revealed=[(4, 6)], covered=[]),
+                          SelectionDelta(revealed=[(0, 1), (8, 10)], covered=[]),
+                          SelectionDelta(revealed=[], covered=[(0, 2)])]
+
+    def test_restrict_universe_mismatch(self):
+        with pytest.raises(ValueError):
+            self.rom.restrict(Selection(slice(0, 10)))
+
+    def test_iter(self):
+        assert list(self.rom) == [b'b', b'c', b'd', b'g', b'h']
+
+    def test_iterbytes(self):
+        assert list(self.rom.iterbytes()) == list(b'bcdgh')
+
+    @pytest.mark.parametrize("size, expected", [
+        (1, [b'b', b'c', b'd', b'g', b'h']),
+        (2, [b'bc', b'd', b'gh']),
+        (8, [b'bcd', b'gh']),
+    ])
+    def test_iterchunks(self, size, expected):
+        chunks = list(self.rom.iterchunks(size))
+        assert all(isinstance(chunk, memoryview) and chunk.readonly for chunk in chunks)
+        assert [bytes(chunk) for chunk in chunks] == expected
+
+    def test_iterchunks_nonpositive_size(self):
+        with pytest.raises(ValueError):
+            list(self.rom.iterchunks(0))
+
+    def test_offset(self):
+        assert self.rom.offset(1) == ROM(b'cdehi')
+
+    def test_buffer(self):
+        buffer = self.rom.buffer()
+        assert buffer.readonly
+        assert bytes(buffer) == b'bcdgh'
+        assert self.rom.buffer().obj is buffer.obj  # Gathered once
+        self.rom.coverup(6, 7, virtual=False)
+        assert bytes(self.rom.buffer()) == b'bcdh'
+
+    def test_getitem_all_cached(self):
+        content = self.rom[:]
+        assert self.rom[:] is content
+        assert self.rom[0:5] is content
+        self.rom.coverup(4, 6, virtual=False)  # Already hidden
+        assert self.rom[:] is content
+        self.rom.reveal(4, 5, virtual=False)
+        assert self.rom[:] == b'bcdegh'
+
+    def test_getitem_all_shares_gathered_buffer(self):
+        content = self.rom[:]
+        assert self.rom.buffer().obj is content  # A single cache holds the visible bytes
+        assert self.rom.memory._revealed is None
+
+    def test_cache_follows_selection(self):
+        content = self.rom[:]
+        read = []
+        physical2bytes = self.rom.memory._physical2bytes
+        self.rom.memory._physical2bytes = lambda location, mmap: read.append(location) or physical2bytes(location, mmap)
+        self.rom.reveal(4, 6, virtual=False)
+        self.rom.coverup(2, 3, virtual=False)
+        self.rom.memory.coverup_many([(0, 2), (8, 9)])
+        assert self.rom[:] == b'defgh'
+        assert read == [slice(4, 6)]  # Only the revealed elements were read
+        self.rom.set_selection(Selection(slice(0, 10), revealed=[(7, 10)]))
+        assert self.rom[:] == b'hij'
+        assert content == b'bcdgh'
+
+    def test_cache_listens_only_while_held(self):
+        listeners = self.rom.memory.selection.listeners
+        content = self.rom[:]
+        assert len(self.rom.memory.selection.listeners) == len(listeners) + 1
+        self.rom.memory._invalidate()
+        assert self.rom.memory.selection.listeners == listeners
+        assert self.rom[:] == content
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_cache_follows_random_selections(self, seed):
+        rng = random.Random(seed)
+        rom = ROM(b'abcdefghijk', structure=SimpleTopology(2))
+        for _ in range(10):
+            a = rng.randrange(0, 6)
+            b = rng.randrange(a, 7)
+            assert rom[:] == b''.join(rom)  # Fills the cache before every change
+            getattr(rom, rng.choice(['coverup', 'reveal']))(a, b, virtual=False)
+            assert rom[:] == b''.join(rom)
+            assert bytes(rom.buffer()) == rom[:]
+
+    def test_write_invalidates_visible_elements_only(self):
+        content = self.rom[:]
+        self.rom.memory._invalidate_elements(4, 6)
+        assert self.rom[:] is content
+        self.rom.memory._invalidate_elements(5, 7)
+        assert self.rom[:] is not content
+
+    def test_buffer_contiguous(self):
+        self.rom.coverup(6, 8, virtual=False)
+        buffer = self.rom.buffer()
+        assert isinstance(buffer.obj, mmap.mmap)
+        assert bytes(buffer) == b'bcd'
+
+    def test_buffer_numpy(self):
+        assert numpy.frombuffer(self.rom.buffer(), dtype=numpy.uint8).tolist() == list(b'bcdgh')
+
+    def test_index(self):
+        assert self.rom.index(b'dg') == 2
+        with pytest.raises(ValueError):
+            self.rom.index(b'ef')
+
+    def test_index_byte_value(self):
+        assert self.rom.index(ord('g')) == 3
+        with pytest.raises(ValueError):
+            self.rom.index(ord('e'))
+        self.rom.coverup(6, 8, virtual=False)  # The search runs on the mmap in place
+        assert self.rom.index(ord('d')) == 2
+        assert self.rom.index(memoryview(b'cd')) == 1
+        with pytest.raises(ValueError):
+            self.rom.index(ord('g'))
+
+    def test_index_regex(self):
+        assert self.rom.index_regex(b'c.g') == (1, 4)
+        assert self.rom.index_regex(b'e') is None
+
     @pytest.mark.parametrize("aindex, bindex, expected", [
         (0, 1, b'b'),
         (1, 2, b'c'),